@@ -0,0 +1,87 @@
+"""
+CACHES configuration for the shared cache tier.
+
+Cross-request state lives in the default Django cache: the JWT denylist (jwt:bl:<jti>), the
+shared tier of the auth user cache, presence buckets, count estimates, import job progress and
+the users-table version. Without CACHES Django uses a per-process LocMemCache, so a token
+revoked in one worker would stay valid in the others. CACHE_BACKEND selects the tier:
+
+  - locmem: per-process LocMemCache (default); atomic, but only right for a single worker process
+  - db:     DatabaseCache in the CACHE_LOCATION table (run manage.py createcachetable),
+            shared by every host using the database
+  - redis:  Redis-compatible server at CACHE_LOCATION (needs the optional redis package)
+  - file:   FileBasedCache in CACHE_LOCATION, for development only: its incr/add are not atomic
+            across processes and culling lists the whole directory
+
+Deployments with several worker processes set db or redis.
+
+This module is imported by core.settings and must not access Django settings.
+"""
+
+from __future__ import annotations
+import importlib.util
+import os
+import tempfile
+from typing import Any, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+CACHE_BACKENDS = {
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "db": "django.core.cache.backends.db.DatabaseCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+}
+SHARED_CACHE_BACKENDS = frozenset({"file", "db", "redis"})
+# Backends whose entries live in the memory of one process
+PER_PROCESS_CACHE_BACKENDS = frozenset({
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+})
+
+_DEFAULT_LOCATIONS = {
+    "file": os.path.join(tempfile.gettempdir(), "user_hub_cache"),
+    "db": "django_cache",
+    "redis": "redis://localhost:6379/0",
+    "locmem": "user_hub",
+}
+
+
+def cache_settings(backend: str, location: Optional[str] = None, timeout: int = 300,
+                   key_prefix: str = "user_hub") -> dict[str, dict[str, Any]]:
+    """
+    CACHES setting for one of CACHE_BACKENDS.
+
+    Args:
+        backend (str): file, db, redis or locmem
+        location (str): directory, table name or server URL; the backend's default when empty
+        timeout (int): default entry lifetime in seconds
+        key_prefix (str): prepended to every key, so several apps can share a server
+
+    Raises:
+        ImproperlyConfigured, for an unknown backend or redis without the redis package
+    """
+    name = (backend or "").strip().lower()
+    if name not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}; got {backend!r}")
+    if name == "redis" and importlib.util.find_spec("redis") is None:
+        raise ImproperlyConfigured("CACHE_BACKEND=redis needs the redis package (pip install redis)")
+    config: dict[str, Any] = {
+        "BACKEND": CACHE_BACKENDS[name],
+        "LOCATION": location or _DEFAULT_LOCATIONS[name],
+        "TIMEOUT": timeout,
+        "KEY_PREFIX": key_prefix,
+    }
+    if name in ("file", "db"):
+        # Culling scans the directory/table; keep it rare
+        config["OPTIONS"] = {"MAX_ENTRIES": 100_000, "CULL_FREQUENCY": 4}
+    return {"default": config}
+
+
+def is_shared_cache(caches: dict[str, dict[str, Any]]) -> bool:
+    """
+    Whether the default cache of a CACHES setting is read by every worker process, so an entry
+    written or deleted by one worker is seen by the others
+    """
+    return caches.get("default", {}).get("BACKEND") not in PER_PROCESS_CACHE_BACKENDS
@@ -1,26 +1,51 @@
 """
 DRF authentication class that:
   - Extracts access token only from the Authorization: Bearer header
+  - Validates it once per request (the outcome is shared with BootIdEnforcerMiddleware)
   - Sets request.user / request.auth when valid
+  - Rejects tokens issued before the user's current session epoch (see core.session_epochs)
+  - With JWT_STATELESS_AUTH, builds the user from the token's authorization claims without a query
 """
 
 from __future__ import annotations
+from dataclasses import dataclass
 from types import SimpleNamespace
-from typing import Optional
+from typing import Any, Optional
 import logging
+import time
 from datetime import datetime, timezone
 
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import DatabaseError
 from rest_framework.authentication import BaseAuthentication, get_authorization_header
 from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 
+from .revoked_jti_filter import get_revoked_jti_filter, is_revoked_jti_filter_enabled
+from .session_epochs import (has_authorization_claims, is_session_revoked, is_stateless_auth_enabled,
+                             user_from_claims)
+from .user_cache import get_user_cache, is_user_cache_enabled
+
 
 logger = logging.getLogger(__name__)
 BLACKLIST_PREFIX = "jwt:bl:"
+# Attribute of the Django HttpRequest holding the request-scoped ValidatedBearer
+VALIDATED_BEARER_ATTR = "_validated_bearer"
+
+
+@dataclass(frozen=True)
+class ValidatedBearer:
+    """
+    Outcome of validating the request's bearer token, computed once per request.
+    Exactly one of token/error is set.
+    """
+    raw: str
+    validated_by: type
+    token: Optional[AccessToken] = None
+    error: Optional[AuthenticationFailed] = None
 
 
 class JWTAuthentication(BaseAuthentication):
@@ -53,19 +78,20 @@ class JWTAuthentication(BaseAuthentication):
         request.new_refresh_token: Optional[str] = None
         request.jwt_auth_failed: bool = False
 
-        raw_access = self._get_access_from_request(request)
-        if not raw_access:
-            # No credentials supplied -> let DRF treat as unauthenticated
-            return None
-
         try:
-            access_token = self.get_validated_token(raw_access)
-            user = self._user_from_token(access_token)
-            iat = int(access_token.get("iat", 0))
-            if user.last_login:
-                last_login_ts = int(user.last_login.timestamp())
-                if iat + 5 < last_login_ts:
-                    raise AuthenticationFailed("Logged in from another device.", code="token_not_valid")
+            access_token = self.validate_request_token(request)
+            if access_token is None:
+                # No credentials supplied -> let DRF treat as unauthenticated
+                return None
+            user_id = self._user_id_from_token(access_token)
+            if is_session_revoked(access_token, user_id):
+                raise AuthenticationFailed("Logged in from another device.", code="token_not_valid")
+            if is_stateless_auth_enabled() and has_authorization_claims(access_token):
+                if not access_token["is_active"]:
+                    raise AuthenticationFailed("User is inactive", code="user_inactive")
+                user = user_from_claims(user_id, access_token)
+            else:
+                user = self._user_from_token(user_id)
 
             # Flag near-expiry (no auto-renew)
             seconds_left = self._seconds_to_expiry(access_token)
@@ -89,6 +115,41 @@ class JWTAuthentication(BaseAuthentication):
         # Controls the WWW-Authenticate header on 401s
         return f'Bearer realm="{self.www_authenticate_realm}"'
 
+    def validate_request_token(self, request) -> Optional[AccessToken]:
+        """
+        Validate the request's bearer token at most once per request.
+
+        The first caller (normally BootIdEnforcerMiddleware) decodes, signature-checks and
+        denylist-checks the token; later callers on the same request reuse that outcome,
+        including a failure. An outcome is reused only if it was produced by this class or
+        a subclass of it, so a weaker validator never vouches for a stricter one.
+
+        Returns:
+            AccessToken, or None when the request carries no bearer token
+
+        Raises:
+            AuthenticationFailed, when the token is invalid
+        """
+        raw_access = self._get_access_from_request(request)
+        if not raw_access:
+            return None
+
+        # DRF's Request wraps the Django HttpRequest; keep the outcome on the latter
+        http_request = getattr(request, "_request", request)
+        cached: Optional[ValidatedBearer] = getattr(http_request, VALIDATED_BEARER_ATTR, None)
+        if (cached is None or cached.raw != raw_access
+                or not issubclass(cached.validated_by, type(self))):
+            try:
+                cached = ValidatedBearer(raw=raw_access, validated_by=type(self),
+                                         token=self.get_validated_token(raw_access))
+            except AuthenticationFailed as exc:
+                cached = ValidatedBearer(raw=raw_access, validated_by=type(self), error=exc)
+            setattr(http_request, VALIDATED_BEARER_ATTR, cached)
+
+        if cached.error is not None:
+            raise cached.error
+        return cached.token
+
     def _get_access_from_request(self, request) -> Optional[str]:
         """
         Read Authorization: Bearer <access> from headers. No cookies.
@@ -111,12 +172,18 @@ class JWTAuthentication(BaseAuthentication):
         except UnicodeDecodeError:
             return token if isinstance(token, str) else None
 
-    def _user_from_token(self, token: AccessToken) -> "User":
+    @staticmethod
+    def _user_id_from_token(token: AccessToken) -> Any:
         user_id = token.get("user_id") or token.get("sub")
         if not user_id:
             raise ValidationError(
                 {"non_field_errors": ["user_id claim missing"]}
             )
+        return user_id
+
+    def _user_from_token(self, user_id: Any) -> "User":
+        if is_user_cache_enabled():
+            return get_user_cache().get_user(user_id)
         return self.user_model.objects.get(pk=user_id)
 
     def _seconds_to_expiry(self, token: AccessToken) -> Optional[int]:
@@ -138,27 +205,47 @@ class JWTAuthentication(BaseAuthentication):
 
 
 
+def denylist_jti(jti: str, exp: int) -> None:
+    """
+    Mark a token as revoked in the shared cache until it expires (exp: epoch seconds)
+    """
+    cache.set(f"{BLACKLIST_PREFIX}{jti}", 1, timeout=max(0, int(exp) - int(time.time())))
+
+
+def is_jti_denylisted(jti: str) -> bool:
+    """
+    Whether the shared cache holds a revocation of the token
+    """
+    return bool(cache.get(f"{BLACKLIST_PREFIX}{jti}"))
+
+
 class JWTAuthenticationWithDenylist(JWTAuthentication):
     """
     Blacklisting tokens
     """
     def get_validated_token(self, raw_token) -> AccessToken:
         """
-        Get valid token and raise error if it's blacklisted
+        Get valid token and raise error if it's blacklisted.
+        The in-process revoked JTI filter answers the common "not revoked" case without I/O;
+        only a filter hit is checked against the cache and the database.
         """
         token = super().get_validated_token(raw_token)
         jti = token.get("jti") if token else None
         if not jti:
             return token
 
-        if cache.get(f"{BLACKLIST_PREFIX}{jti}"):
+        if is_revoked_jti_filter_enabled() and not get_revoked_jti_filter().might_be_revoked(jti):
+            return token
+
+        if is_jti_denylisted(jti):
             raise AuthenticationFailed("Token is blacklisted", code="token_not_valid")
 
         try:
-            if BlacklistedToken.objects.filter(token__jti=jti).exists():
-                raise AuthenticationFailed("Token is blacklisted", code="token_not_valid")
-        except Exception:  # pylint: disable=broad-exception-caught
-            # ignore DB errors; cache still enforces invalidation
-            pass
-
+            blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        except DatabaseError:
+            # The cache check above still enforces revocations it holds
+            logger.warning("Could not check the token blacklist", exc_info=True)
+            blacklisted = False
+        if blacklisted:
+            raise AuthenticationFailed("Token is blacklisted", code="token_not_valid")
         return token
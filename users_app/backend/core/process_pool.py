@@ -0,0 +1,19 @@
+"""
+Initializer of worker processes that run application code.
+
+Pool workers are started with the "spawn" method: a forked child would share the parent's
+database sockets and the locks held by its other threads. A spawned child imports the task's
+module itself, so Django is set up first; any database connection it inherited or opened while
+setting up is closed, the workers never use one.
+"""
+
+import django
+from django.db import connections
+
+
+def init_worker() -> None:
+    """
+    Set up Django in a new pool worker and drop its database connections
+    """
+    django.setup()
+    connections.close_all()
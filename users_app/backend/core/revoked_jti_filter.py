@@ -0,0 +1,213 @@
+"""
+In-process Bloom filter of revoked (blacklisted) token JTIs.
+
+Almost no token is ever revoked, so asking the cache and the database on every request
+is wasted I/O. The filter answers "definitely not revoked" without any I/O; only a
+filter hit falls through to the authoritative cache/DB check.
+
+  - Loaded lazily from BlacklistedToken on first use, rebuilt periodically to drop expired JTIs
+  - Updated locally by LogoutView and by the BlacklistedToken post_save signal
+    (which also covers refresh-token rotation)
+  - Rows written by other workers are picked up by an incremental sync at most every
+    JTI_FILTER_SYNC_SECONDS seconds; that interval bounds cross-worker staleness
+  - If the filter cannot be loaded or synced, every lookup answers "maybe" (fail closed)
+"""
+
+from __future__ import annotations
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings (bytearray bitmap, double hashing on blake2b)
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(1, int(capacity))
+        error_rate = min(max(float(error_rate), 1e-9), 0.5)
+        self.capacity = capacity
+        self.size_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size_bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size_bits
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Memory used by the bitmap
+        """
+        return len(self._bits)
+
+    def add(self, item: str) -> None:
+        """
+        Add an item
+        """
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevokedJtiFilter:
+    """
+    Process-wide, self-syncing Bloom filter of revoked JTIs
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter: Optional[BloomFilter] = None
+        self._healthy = False
+        # Highest BlacklistedToken id seen and the monotonic deadlines of the next sync and rebuild
+        self._sync_state = {"high_water_id": 0, "next_sync": 0.0, "next_rebuild": 0.0}
+        self._lock = threading.Lock()
+        self._counters = {"negatives": 0, "positives": 0, "unavailable": 0, "syncs": 0, "rebuilds": 0}
+
+    @staticmethod
+    def _setting(name: str, default: Any) -> Any:
+        return getattr(settings, name, default)
+
+    def _rebuild(self) -> None:
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        high_water = 0
+        rows = (BlacklistedToken.objects  # pylint: disable=no-member
+                .filter(token__expires_at__gt=timezone.now())
+                .values_list("id", "token__jti"))
+        for row_id, jti in rows.iterator(chunk_size=2000):
+            bloom.add(jti)
+            high_water = max(high_water, row_id)
+        if bloom.count > self.capacity:
+            logger.warning("Revoked JTI filter holds %s entries (capacity %s); raise JTI_FILTER_CAPACITY",
+                           bloom.count, self.capacity)
+        self._filter = bloom
+        self._sync_state["high_water_id"] = high_water
+        self._counters["rebuilds"] += 1
+        self._sync_state["next_rebuild"] = time.monotonic() + int(self._setting("JTI_FILTER_REBUILD_SECONDS", 3600))
+
+    def _sync_increment(self) -> None:
+        # Re-read a window below the high-water mark: concurrent transactions may commit
+        # lower ids after a higher one was already seen. Adding a JTI twice is harmless.
+        overlap = int(self._setting("JTI_FILTER_SYNC_ID_OVERLAP", 256))
+        rows = (BlacklistedToken.objects  # pylint: disable=no-member
+                .filter(id__gt=max(0, self._sync_state["high_water_id"] - overlap))
+                .values_list("id", "token__jti"))
+        for row_id, jti in rows:
+            self._filter.add(jti)
+            self._sync_state["high_water_id"] = max(self._sync_state["high_water_id"], row_id)
+        self._counters["syncs"] += 1
+
+    def _sync_if_due(self) -> None:
+        now = time.monotonic()
+        if now < self._sync_state["next_sync"]:
+            return
+        if not self._lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return  # another thread is syncing; keep answering from the current state
+        try:
+            if self._filter is None or now >= self._sync_state["next_rebuild"]:
+                self._rebuild()
+            else:
+                self._sync_increment()
+            self._healthy = True
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self._healthy = False
+            logger.warning("Revoked JTI filter sync failed; falling back to cache/DB checks: %s", exc)
+        finally:
+            self._sync_state["next_sync"] = now + float(self._setting("JTI_FILTER_SYNC_SECONDS", 2))
+            self._lock.release()
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """
+        False means the JTI is definitely not revoked; True means "ask the cache/DB".
+        """
+        self._sync_if_due()
+        bloom = self._filter
+        if bloom is None or not self._healthy:
+            self._counters["unavailable"] += 1
+            return True
+        if jti in bloom:
+            self._counters["positives"] += 1
+            return True
+        self._counters["negatives"] += 1
+        return False
+
+    def add(self, jti: str) -> None:
+        """
+        Record a JTI revoked by this process
+        """
+        bloom = self._filter
+        if bloom is not None and jti:
+            bloom.add(jti)
+
+    def reset(self) -> None:
+        """
+        Drop the filter; it is reloaded on next use
+        """
+        with self._lock:
+            self._filter = None
+            self._healthy = False
+            self._sync_state.update(high_water_id=0, next_sync=0.0)
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Counters of this process
+        """
+        bloom = self._filter
+        data: dict[str, Any] = dict(self._counters)
+        data.update({
+            "enabled": is_revoked_jti_filter_enabled(),
+            "loaded": bloom is not None,
+            "healthy": self._healthy,
+            "entries": bloom.count if bloom else 0,
+            "size_bytes": bloom.size_bytes if bloom else 0,
+            "hash_count": bloom.hash_count if bloom else 0,
+        })
+        return data
+
+
+_FILTER: Optional[RevokedJtiFilter] = None
+_FILTER_LOCK = threading.Lock()
+
+
+def is_revoked_jti_filter_enabled() -> bool:
+    """
+    Whether the denylist check should consult the in-process filter first
+    """
+    return bool(getattr(settings, "JTI_FILTER_ENABLED", True))
+
+
+def get_revoked_jti_filter() -> RevokedJtiFilter:
+    """
+    Process-wide filter instance, created on first use from Django settings
+    """
+    global _FILTER  # pylint: disable=global-statement
+    if _FILTER is None:
+        with _FILTER_LOCK:
+            if _FILTER is None:
+                _FILTER = RevokedJtiFilter(
+                    capacity=int(getattr(settings, "JTI_FILTER_CAPACITY", 100_000)),
+                    error_rate=float(getattr(settings, "JTI_FILTER_ERROR_RATE", 0.001)),
+                )
+    return _FILTER
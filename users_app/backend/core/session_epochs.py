@@ -0,0 +1,223 @@
+"""
+Per-user session epoch: revocation of a user's tokens by an integer compare.
+
+Every token carries the session epoch of its user at issue time ("sess"). A token whose epoch
+is lower than the user's current one is revoked, which replaces the comparison of iat with
+last_login. The epoch only grows and is bumped:
+
+  - on login (the new tokens carry the new epoch; the user's other sessions end)
+  - on a password change (Django's set_password), published to the caches after commit
+  - by an admin "log out everywhere" (POST /api/v1/users/<id>/logout-everywhere/)
+  - in stateless mode (JWT_STATELESS_AUTH), after commit of a change of is_active, is_staff or
+    is_superuser, so tokens with stale claims are rejected and the user signs in again
+
+It is stored in Profile.session_epoch and read through a per-process cache (SESSION_EPOCH_LOCAL_TTL
+seconds) in front of the Django cache (SESSION_EPOCH_SHARED_TTL seconds) in front of the database.
+A bump writes the new epoch to the Django cache; when that cache is shared (db, redis), another
+worker sees the bump within SESSION_EPOCH_LOCAL_TTL seconds. A per-process cache (locmem) never
+gets another worker's bumps, so its entries are capped at SESSION_EPOCH_LOCAL_TTL seconds as well
+and the epoch is read from the database again after that: the bound holds for every backend.
+Tokens issued before the claim existed count as epoch 0, so they stay valid until the user's
+first bump.
+
+In stateless mode an access token also carries the user's authorization claims (is_active,
+is_staff, is_superuser), and authentication builds the user from the token without a query.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from .cache_backends import is_shared_cache
+
+
+SESSION_EPOCH_KEY_PREFIX = "auth:epoch:"
+SESSION_EPOCH_CLAIM = "sess"
+# Claims copied from the user into stateless access tokens
+AUTHORIZATION_CLAIMS = ("is_active", "is_staff", "is_superuser")
+# Users remembered by the per-process cache
+LOCAL_MAX_SIZE = 10_000
+
+_LOCAL: OrderedDict[str, tuple[float, int]] = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def is_stateless_auth_enabled() -> bool:
+    """
+    Whether access tokens carry authorization claims and authentication skips the user query
+    """
+    return bool(getattr(settings, "JWT_STATELESS_AUTH", False))
+
+
+def _key(user_id: Any) -> str:
+    return f"{SESSION_EPOCH_KEY_PREFIX}{user_id}"
+
+
+def _local_ttl() -> float:
+    return float(getattr(settings, "SESSION_EPOCH_LOCAL_TTL", 2))
+
+
+def _shared_timeout() -> float:
+    """
+    Lifetime of a Django cache entry: SESSION_EPOCH_SHARED_TTL, at most SESSION_EPOCH_LOCAL_TTL
+    when the cache is per process
+    """
+    ttl = float(getattr(settings, "SESSION_EPOCH_SHARED_TTL", 300))
+    return ttl if is_shared_cache(settings.CACHES) else min(ttl, _local_ttl())
+
+
+def _remember(user_id: Any, epoch: int) -> None:
+    ttl = _local_ttl()
+    key = str(user_id)
+    with _LOCK:
+        _LOCAL[key] = (time.monotonic() + ttl, epoch)
+        _LOCAL.move_to_end(key)
+        while len(_LOCAL) > LOCAL_MAX_SIZE:
+            _LOCAL.popitem(last=False)
+
+
+def load_session_epoch(user_id: Any) -> int:
+    """
+    Stored session epoch of a user (0 without a profile)
+    """
+    profile_model = apps.get_model("profiles", "Profile")
+    epoch = profile_model.objects.filter(user_id=user_id).values_list("session_epoch", flat=True).first()
+    return int(epoch or 0)
+
+
+def get_session_epoch(user_id: Any) -> int:
+    """
+    Current session epoch of a user
+    """
+    with _LOCK:
+        entry = _LOCAL.get(str(user_id))
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    epoch = cache.get(_key(user_id))
+    if epoch is None:
+        epoch = load_session_epoch(user_id)
+        if not cache.add(_key(user_id), epoch, timeout=_shared_timeout()):
+            # Another request cached it meanwhile (possibly a newer bump)
+            epoch = cache.get(_key(user_id), epoch)
+    _remember(user_id, int(epoch))
+    return int(epoch)
+
+
+def store_session_epochs(user_ids: Iterable[Any]) -> dict[Any, int]:
+    """
+    Bump the stored epochs of the users with one UPDATE of their profiles (users without a
+    profile are left out); the caches are not touched, see publish_session_epochs().
+
+    Returns:
+        dict, user id -> new epoch: the current unix time, or the previous epoch + 1 if that is higher
+    """
+    ids = list(user_ids)
+    if not ids:
+        return {}
+    profile_model = apps.get_model("profiles", "Profile")
+    profiles = profile_model.objects.filter(user_id__in=ids)
+    with transaction.atomic(using=router.db_for_write(profile_model), savepoint=False):
+        profiles.update(session_epoch=Greatest(F("session_epoch") + 1, Value(int(time.time()))))
+        return dict(profiles.values_list("user_id", "session_epoch"))
+
+
+def publish_session_epochs(epochs: dict[Any, int]) -> None:
+    """
+    Put stored epochs into the shared and the per-process cache
+    """
+    cache.set_many({_key(user_id): epoch for user_id, epoch in epochs.items()}, timeout=_shared_timeout())
+    for user_id, epoch in epochs.items():
+        _remember(user_id, epoch)
+
+
+def bump_session_epochs(user_ids: Iterable[Any]) -> dict[Any, int]:
+    """
+    Revoke every token issued so far to each of the users, with one UPDATE of their profiles
+    and one write to the shared cache.
+
+    Returns:
+        dict, user id -> new epoch
+    """
+    epochs = store_session_epochs(user_ids)
+    publish_session_epochs(epochs)
+    return epochs
+
+
+def bump_session_epoch(user_id: Any) -> int:
+    """
+    Revoke every token issued to a user so far.
+
+    Returns:
+        int, the new epoch: the current unix time, or the previous epoch + 1 if that is higher
+    """
+    profile_model = apps.get_model("profiles", "Profile")
+    profile_model.objects.get_or_create(user_id=user_id)
+    return next(iter(bump_session_epochs([user_id]).values()))
+
+
+def bump_session_epoch_on_commit(user_id: Any, using: Optional[str] = None) -> None:
+    """
+    Bump the stored epoch of a user in the current transaction and publish it once the
+    transaction commits (right away outside a transaction). A rolled back bump never reaches
+    the caches, and the published value is read after commit, so it is never older than a bump
+    published meanwhile.
+    """
+    profile_model = apps.get_model("profiles", "Profile")
+    profile_model.objects.get_or_create(user_id=user_id)
+    store_session_epochs([user_id])
+    transaction.on_commit(lambda: publish_session_epochs({user_id: load_session_epoch(user_id)}), using=using)
+
+
+def forget_session_epoch(user_id: Any) -> None:
+    """
+    Drop the cached epoch of a user (a new user may reuse the primary key of a deleted one)
+    """
+    cache.delete(_key(user_id))
+    with _LOCK:
+        _LOCAL.pop(str(user_id), None)
+
+
+def is_session_revoked(token: Any, user_id: Any) -> bool:
+    """
+    Whether a token was issued before the user's current session epoch
+    """
+    return int(token.get(SESSION_EPOCH_CLAIM, 0)) < get_session_epoch(user_id)
+
+
+def add_authorization_claims(token: Any, user: Any, epoch: int) -> None:
+    """
+    Embed the user's authorization claims and session epoch into an access token
+    """
+    for claim in AUTHORIZATION_CLAIMS:
+        token[claim] = bool(getattr(user, claim))
+    token[SESSION_EPOCH_CLAIM] = int(epoch)
+
+
+def has_authorization_claims(token: Any) -> bool:
+    """
+    Whether a token was issued in stateless mode
+    """
+    payload = getattr(token, "payload", token)
+    return SESSION_EPOCH_CLAIM in payload and all(claim in payload for claim in AUTHORIZATION_CLAIMS)
+
+
+def user_from_claims(user_id: Any, token: Any) -> "User":
+    """
+    Lightweight user built from the token's claims, as if loaded by .only(<those fields>);
+    any other field loads lazily on first access
+    """
+    user_model = get_user_model()
+    names = [user_model._meta.pk.attname, *AUTHORIZATION_CLAIMS]  # pylint: disable=protected-access
+    values = [user_model._meta.pk.to_python(user_id),  # pylint: disable=protected-access
+              *(bool(token[claim]) for claim in AUTHORIZATION_CLAIMS)]
+    return user_model.from_db(router.db_for_read(user_model), names, values)
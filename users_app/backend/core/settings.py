@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 
 from django.utils import translation
 
+from core.cache_backends import cache_settings
+
 
 def env_tuple(name: str, default=()) -> tuple:
     """
@@ -60,7 +62,15 @@ LOG_PATH = Path(LOG_DIR)
 LOG_TO_DIR = _dir_writable(LOG_PATH)
 
 # Login session properties start
-# Derive a per-boot signing key from your stable secret + BOOT_ID
+# Tokens carry the boot epoch of the deployment (see profiles.boot): stored once per DEPLOYMENT_ID and
+# shared by every worker and node; set a new DEPLOYMENT_ID per release to invalidate older tokens
+DEPLOYMENT_ID = os.getenv("DEPLOYMENT_ID", "").strip() or "default"
+# Per-process boot id, used only while the boot epoch table cannot be read (retried every N seconds)
+BOOT_EPOCH_RETRY_SECONDS = float(os.getenv("BOOT_EPOCH_RETRY_SECONDS", "30"))
+# Rolling deploys: tokens of the previous (and next) deployment stay valid this long after the new epoch
+# was created and are upgraded on their next refresh; 0 accepts the current epoch only
+BOOT_EPOCH_OVERLAP_SECONDS = float(os.getenv("BOOT_EPOCH_OVERLAP_SECONDS", "0"))
+BOOT_EPOCH_RING_REFRESH_SECONDS = float(os.getenv("BOOT_EPOCH_RING_REFRESH_SECONDS", "10"))
 SECRET_KEY = "user_hub_web_app-secret_key"
 BOOT_ID = int(datetime.now(timezone.utc).timestamp())
 SIGNING_KEY = hashlib.sha256(f"{SECRET_KEY}.{BOOT_ID}".encode("utf-8")).hexdigest()
@@ -77,6 +87,69 @@ ALGORITHM = str(os.getenv("ALGORITHM", "HS256"))
 SECRET_KEY = str(os.getenv("SECRET_KEY", "dev-secret"))
 SIGNING_KEY = SECRET_KEY
 AUTH_HEADER_TYPES = env_tuple("AUTH_HEADER_TYPES", ("Bearer",))
+# Cache tier for cross-request state (JWT denylist, presence, ...): locmem (one process), db or redis
+# (shared) or file (development only), see core.cache_backends; CACHE_LOCATION is the table, server URL or directory
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem").strip().lower()
+CACHES = cache_settings(CACHE_BACKEND, os.getenv("CACHE_LOCATION"), int(os.getenv("CACHE_TIMEOUT", "300")))
+# Tokens carry the user's session epoch (bumped on login, password change, logout everywhere), see
+# core.session_epochs; a bump made by another worker is seen within SESSION_EPOCH_LOCAL_TTL seconds.
+# SESSION_EPOCH_SHARED_TTL is the lifetime in the cache tier (capped at the local TTL with locmem)
+SESSION_EPOCH_LOCAL_TTL = int(os.getenv("SESSION_EPOCH_LOCAL_TTL", "2"))
+SESSION_EPOCH_SHARED_TTL = int(os.getenv("SESSION_EPOCH_SHARED_TTL", "300"))
+# Stateless access tokens: authorization claims in the token, no user query per request
+JWT_STATELESS_AUTH = env_bool(os.getenv("JWT_STATELESS_AUTH", "0"))
+# Authenticated user resolution cache (per-process LRU + shared cache), see core.user_cache
+AUTH_USER_CACHE_ENABLED = env_bool(os.getenv("AUTH_USER_CACHE_ENABLED", "1"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+# Bounds how long another worker may serve a user row after it was invalidated; with the
+# per-process locmem tier the shared TTL is capped at it
+AUTH_USER_CACHE_LOCAL_TTL = int(os.getenv("AUTH_USER_CACHE_LOCAL_TTL", "5"))
+AUTH_USER_CACHE_SHARED_TTL = int(os.getenv("AUTH_USER_CACHE_SHARED_TTL", "300"))
+# In-process Bloom filter of revoked JTIs in front of the cache/DB denylist, see core.revoked_jti_filter
+JTI_FILTER_ENABLED = env_bool(os.getenv("JTI_FILTER_ENABLED", "1"))
+JTI_FILTER_CAPACITY = int(os.getenv("JTI_FILTER_CAPACITY", "100000"))
+JTI_FILTER_ERROR_RATE = float(os.getenv("JTI_FILTER_ERROR_RATE", "0.001"))
+# Revocations made by other workers become visible within this many seconds
+JTI_FILTER_SYNC_SECONDS = float(os.getenv("JTI_FILTER_SYNC_SECONDS", "2"))
+JTI_FILTER_REBUILD_SECONDS = int(os.getenv("JTI_FILTER_REBUILD_SECONDS", "3600"))
+# Max age (seconds) of the process-local snapshot of the DB auth setting overrides
+APP_SETTINGS_CACHE_TTL = float(os.getenv("APP_SETTINGS_CACHE_TTL", "30"))
+# How often (seconds) a worker reads the shared settings version to notice changes saved by other workers
+APP_SETTINGS_VERSION_CHECK_SECONDS = float(os.getenv("APP_SETTINGS_VERSION_CHECK_SECONDS", "2"))
+# Profile.last_activity writes: "immediate" (one UPDATE per request) or "coalesce" (buffered, bulk-flushed)
+LAST_ACTIVITY_MODE = os.getenv("LAST_ACTIVITY_MODE", "immediate").strip().lower()
+LAST_ACTIVITY_FLUSH_SECONDS = float(os.getenv("LAST_ACTIVITY_FLUSH_SECONDS", "10"))
+LAST_ACTIVITY_BATCH_SIZE = int(os.getenv("LAST_ACTIVITY_BATCH_SIZE", "500"))
+LAST_ACTIVITY_FLUSH_IN_BACKGROUND = env_bool(os.getenv("LAST_ACTIVITY_FLUSH_IN_BACKGROUND", "1"))
+# Presence store behind the online users list: a user is online for PRESENCE_WINDOW_SECONDS after a request
+PRESENCE_ENABLED = env_bool(os.getenv("PRESENCE_ENABLED", "1"))
+PRESENCE_WINDOW_SECONDS = int(os.getenv("PRESENCE_WINDOW_SECONDS", "300"))
+PRESENCE_BUCKET_SECONDS = int(os.getenv("PRESENCE_BUCKET_SECONDS", "60"))
+PRESENCE_TOUCH_SECONDS = float(os.getenv("PRESENCE_TOUCH_SECONDS", "15"))
+# Total count of paginated lists: "exact" (COUNT(*)), "estimated" (planner estimate) or "none"; ?count= overrides it
+PAGINATION_COUNT_STRATEGY = os.getenv("PAGINATION_COUNT_STRATEGY", "exact").strip().lower()
+PAGINATION_COUNT_CACHE_SECONDS = float(os.getenv("PAGINATION_COUNT_CACHE_SECONDS", "30"))
+PAGINATION_EXACT_COUNT_THRESHOLD = int(os.getenv("PAGINATION_EXACT_COUNT_THRESHOLD", "10000"))
+# Excel import: rows per normalize/lookup/bulk-write step
+EXCEL_IMPORT_CHUNK_SIZE = int(os.getenv("EXCEL_IMPORT_CHUNK_SIZE", "1000"))
+# "orm" (batched bulk writes) or "copy" (COPY into a staging table + set-based merge, PostgreSQL only)
+EXCEL_IMPORT_BACKEND = os.getenv("EXCEL_IMPORT_BACKEND", "orm")
+# Import validation: processes checking chunks ahead of the writes (0 = inline) and rejected rows reported
+EXCEL_IMPORT_VALIDATION_WORKERS = int(os.getenv("EXCEL_IMPORT_VALIDATION_WORKERS", "0"))
+EXCEL_IMPORT_MAX_ERRORS = int(os.getenv("EXCEL_IMPORT_MAX_ERRORS", "100"))
+# Background imports (?async=1): worker threads per process; EXCEL_IMPORT_ASYNC makes it the default
+EXCEL_IMPORT_ASYNC = env_bool(os.getenv("EXCEL_IMPORT_ASYNC", "0"))
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "2"))
+IMPORT_JOBS_EAGER = env_bool(os.getenv("IMPORT_JOBS_EAGER", "0"))
+# Excel export: rows fetched per database round trip while streaming the workbook
+EXCEL_EXPORT_CHUNK_SIZE = int(os.getenv("EXCEL_EXPORT_CHUNK_SIZE", "2000"))
+# Generated exports are cached on disk per users-table version; evicted by age and total size
+EXPORT_CACHE_ENABLED = env_bool(os.getenv("EXPORT_CACHE_ENABLED", "1"))
+EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "user_exports"))
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+EXPORT_CACHE_MAX_AGE_SECONDS = float(os.getenv("EXPORT_CACHE_MAX_AGE_SECONDS", "3600"))
+# The users-table version is stored in the database; readers cache it in the shared cache this long
+USERS_VERSION_CACHE_SECONDS = float(os.getenv("USERS_VERSION_CACHE_SECONDS", "30"))
 # Login session properties end
 ALLOWED_HOSTS = ["*"]
 
@@ -267,7 +340,6 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": AUTH_HEADER_TYPES,
     "RENEW_AT_SECONDS": JWT_RENEW_AT_SECONDS if ROTATE_REFRESH_TOKENS else 0,
     "UPDATE_LAST_LOGIN": True,
-    "BOOT_ID": BOOT_ID,
     "TOKEN_OBTAIN_SERIALIZER":
         "profiles.serializers.email_or_user_token_create_serializer.EmailOrUsernameTokenCreateSerializer",
     "TOKEN_REFRESH_SERIALIZER": "profiles.serializers.jwt_refresh_serializer.CustomTokenRefreshSerializer",
@@ -0,0 +1,165 @@
+"""
+Two-tier cache for resolving the authenticated user from a JWT.
+
+  - Tier 1: small per-process LRU (no I/O at all on a hit)
+  - Tier 2: the Django cache, shared between workers when a shared backend is configured
+
+Only the concrete user columns (minus the password hash) are stored. The user instance
+is rebuilt with Model.from_db(), so any field that was not cached still loads lazily.
+
+Local entries expire after AUTH_USER_CACHE_LOCAL_TTL seconds and shared ones after
+AUTH_USER_CACHE_SHARED_TTL seconds. invalidate() deletes the shared entry, so with a shared
+backend (db, redis) AUTH_USER_CACHE_LOCAL_TTL bounds how long a sibling worker may keep serving
+a user row that was invalidated in another process. A per-process backend (locmem) is never
+told about another worker's invalidations, so there the shared TTL is capped at the local TTL
+and the same bound holds.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+
+from .cache_backends import is_shared_cache
+
+
+SHARED_KEY_PREFIX = "auth:user:"
+
+
+class UserResolutionCache:
+    """
+    Per-process LRU in front of the shared cache in front of the database.
+    """
+
+    def __init__(self, max_size: int, local_ttl: int, shared_ttl: int) -> None:
+        self.max_size = max(1, int(max_size))
+        self.local_ttl = max(0, int(local_ttl))
+        self.shared_ttl = max(1, int(shared_ttl))
+        self._local: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"local_hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0}
+
+    @staticmethod
+    def _field_names() -> list[str]:
+        user_model = get_user_model()
+        return [f.attname for f in user_model._meta.concrete_fields  # pylint: disable=protected-access
+                if f.name != "password"]
+
+    @staticmethod
+    def _build(values: dict[str, Any]) -> "User":
+        """
+        Rebuild a user instance as if it had been loaded by .only(<cached fields>)
+        """
+        user_model = get_user_model()
+        names = list(values.keys())
+        return user_model.from_db(router.db_for_read(user_model), names, [values[n] for n in names])
+
+    def _shared_timeout(self) -> int:
+        """
+        Lifetime of a shared entry: at most local_ttl when the cache is per process
+        """
+        return self.shared_ttl if is_shared_cache(settings.CACHES) else min(self.shared_ttl, self.local_ttl)
+
+    def _remember(self, key: str, values: dict[str, Any]) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, values)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    def get_user(self, user_id: Any) -> "User":
+        """
+        Resolve a user by primary key.
+
+        Raises:
+            User.DoesNotExist, when the user is gone
+        """
+        key = str(user_id)
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._local.move_to_end(key)
+                    self._counters["local_hits"] += 1
+                    return self._build(entry[1])
+                del self._local[key]
+
+        values: Optional[dict[str, Any]] = cache.get(f"{SHARED_KEY_PREFIX}{key}")
+        if values is not None:
+            with self._lock:
+                self._counters["shared_hits"] += 1
+            self._remember(key, values)
+            return self._build(values)
+
+        with self._lock:
+            self._counters["misses"] += 1
+        names = self._field_names()
+        user = get_user_model().objects.only(*names).get(pk=user_id)
+        values = {name: getattr(user, name) for name in names}
+        cache.set(f"{SHARED_KEY_PREFIX}{key}", values, timeout=self._shared_timeout())
+        self._remember(key, values)
+        return user
+
+    def invalidate(self, user_id: Any) -> None:
+        """
+        Drop a user from both tiers (called from model/login signals)
+        """
+        key = str(user_id)
+        with self._lock:
+            self._local.pop(key, None)
+            self._counters["invalidations"] += 1
+        cache.delete(f"{SHARED_KEY_PREFIX}{key}")
+
+    def clear(self) -> None:
+        """
+        Forget every locally cached user and reset the counters
+        """
+        with self._lock:
+            self._local.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Hit/miss counters of this process
+        """
+        with self._lock:
+            data: dict[str, Any] = dict(self._counters)
+            data["local_size"] = len(self._local)
+        lookups = data["local_hits"] + data["shared_hits"] + data["misses"]
+        data["hit_ratio"] = round((data["local_hits"] + data["shared_hits"]) / lookups, 4) if lookups else None
+        data["enabled"] = is_user_cache_enabled()
+        return data
+
+
+_USER_CACHE: Optional[UserResolutionCache] = None
+_USER_CACHE_LOCK = threading.Lock()
+
+
+def is_user_cache_enabled() -> bool:
+    """
+    Whether authentication should go through the user cache
+    """
+    return bool(getattr(settings, "AUTH_USER_CACHE_ENABLED", True))
+
+
+def get_user_cache() -> UserResolutionCache:
+    """
+    Process-wide cache instance, created on first use from Django settings
+    """
+    global _USER_CACHE  # pylint: disable=global-statement
+    if _USER_CACHE is None:
+        with _USER_CACHE_LOCK:
+            if _USER_CACHE is None:
+                _USER_CACHE = UserResolutionCache(
+                    max_size=getattr(settings, "AUTH_USER_CACHE_SIZE", 1024),
+                    local_ttl=getattr(settings, "AUTH_USER_CACHE_LOCAL_TTL", 5),
+                    shared_ttl=getattr(settings, "AUTH_USER_CACHE_SHARED_TTL", 300),
+                )
+    return _USER_CACHE
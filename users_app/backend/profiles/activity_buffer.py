@@ -0,0 +1,142 @@
+"""
+Write-coalescing buffer for Profile.last_activity.
+
+In "coalesce" mode LastActivityMiddleware only records user_id -> timestamp in memory.
+A background flusher persists the pending timestamps every LAST_ACTIVITY_FLUSH_SECONDS
+with one bulk UPDATE per LAST_ACTIVITY_BATCH_SIZE users, so each user is written at
+most once per interval no matter how many parallel requests the SPA fires.
+
+The buffer is per process; on a crash at most one interval of activity is lost.
+"""
+
+from __future__ import annotations
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, DateTimeField, Value, When
+
+from .models.profile import Profile
+
+
+logger = logging.getLogger(__name__)
+
+
+class LastActivityBuffer:
+    """
+    Pending last-activity timestamps of this process and their background flusher
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._counters = {"recorded": 0, "flushes": 0, "rows_written": 0}
+
+    @staticmethod
+    def interval() -> float:
+        """
+        Seconds between two flushes
+        """
+        return max(0.1, float(getattr(settings, "LAST_ACTIVITY_FLUSH_SECONDS", 10)))
+
+    def record(self, user_id: int, when: datetime) -> None:
+        """
+        Remember the latest activity of a user; nothing is written here
+        """
+        with self._lock:
+            previous = self._pending.get(user_id)
+            if previous is None or previous < when:
+                self._pending[user_id] = when
+            self._counters["recorded"] += 1
+        if getattr(settings, "LAST_ACTIVITY_FLUSH_IN_BACKGROUND", True):
+            self._ensure_flusher()
+
+    def flush(self) -> int:
+        """
+        Persist every pending timestamp.
+
+        Returns:
+            int, number of users written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        batch_size = max(1, int(getattr(settings, "LAST_ACTIVITY_BATCH_SIZE", 500)))
+        items = sorted(pending.items())  # stable lock order between concurrent flushers
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            try:
+                Profile.objects.filter(user_id__in=[user_id for user_id, _ in batch]).update(
+                    last_activity=Case(
+                        *[When(user_id=user_id, then=Value(ts)) for user_id, ts in batch],
+                        output_field=DateTimeField(),
+                    )
+                )
+            except Exception:
+                # Put the unwritten timestamps back unless newer ones arrived meanwhile
+                with self._lock:
+                    for user_id, ts in items[start:]:
+                        if user_id not in self._pending:
+                            self._pending[user_id] = ts
+                raise
+        with self._lock:
+            self._counters["flushes"] += 1
+            self._counters["rows_written"] += len(items)
+        return len(items)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval()):
+            try:
+                self.flush()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning("Flushing last activity timestamps failed: %s", exc)
+            finally:
+                close_old_connections()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._run, name="last-activity-flusher", daemon=True)
+            self._flusher.start()
+
+    def stop(self) -> None:
+        """
+        Stop the flusher and write what is still pending
+        """
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Final flush of last activity timestamps failed: %s", exc)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Counters of this process
+        """
+        with self._lock:
+            data = dict(self._counters)
+            data["pending"] = len(self._pending)
+        return data
+
+
+_BUFFER = LastActivityBuffer()
+atexit.register(_BUFFER.stop)
+
+
+def get_last_activity_buffer() -> LastActivityBuffer:
+    """
+    Process-wide buffer
+    """
+    return _BUFFER
@@ -3,7 +3,8 @@ App configuration
 """
 from django.apps import AppConfig, apps
 from django.conf import settings
-from django.db.models.signals import post_save, post_migrate
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save, post_migrate, pre_save
 
 
 class ProfilesConfig(AppConfig):
@@ -31,6 +32,45 @@ class ProfilesConfig(AppConfig):
             dispatch_uid="profiles.create_profile_on_user_create",
         )
 
+        # Keep the authentication user cache in sync with the user table
+        post_save.connect(
+            signals.invalidate_cached_user,
+            sender=user_model,
+            dispatch_uid="profiles.invalidate_cached_user.save",
+        )
+        post_delete.connect(
+            signals.invalidate_cached_user,
+            sender=user_model,
+            dispatch_uid="profiles.invalidate_cached_user.delete",
+        )
+        user_logged_in.connect(
+            signals.invalidate_cached_user,
+            dispatch_uid="profiles.invalidate_cached_user.login",
+        )
+
+        # Password changes (and, for stateless tokens, claim changes) revoke the user's tokens
+        pre_save.connect(
+            signals.revoke_sessions_on_credential_change,
+            sender=user_model,
+            dispatch_uid="profiles.revoke_sessions_on_credential_change",
+        )
+
+        # Exports of the users table are cached per users-table version
+        for model in (user_model, apps.get_model("profiles", "Profile")):
+            for signal, kind in ((post_save, "save"), (post_delete, "delete")):
+                signal.connect(
+                    signals.bump_users_version,
+                    sender=model,
+                    dispatch_uid=f"profiles.bump_users_version.{model.__name__.lower()}.{kind}",
+                )
+
+        # Blacklisted tokens (logout, refresh rotation) feed the in-process revoked JTI filter
+        post_save.connect(
+            signals.remember_revoked_jti,
+            sender=apps.get_model("token_blacklist", "BlacklistedToken"),
+            dispatch_uid="profiles.remember_revoked_jti",
+        )
+
         # Scope post_migrate to this app only
         post_migrate.connect(
             signals.backfill_profiles,
@@ -0,0 +1,112 @@
+"""
+Small measuring helpers shared by the benchmark management commands.
+
+A measurement records wall time, the number of SQL queries and, optionally,
+the peak Python heap allocation (tracemalloc) of running a callable N times.
+"""
+
+from __future__ import annotations
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@dataclass
+class Measurement:
+    """
+    Result of running one benchmark scenario
+    """
+    label: str
+    iterations: int
+    wall_seconds: float
+    queries: int
+    peak_memory_bytes: Optional[int] = None
+
+    @property
+    def per_iteration_us(self) -> float:
+        """
+        Average wall time of one iteration, in microseconds
+        """
+        return self.wall_seconds * 1_000_000 / max(1, self.iterations)
+
+    @property
+    def queries_per_iteration(self) -> float:
+        """
+        Average number of SQL queries of one iteration
+        """
+        return self.queries / max(1, self.iterations)
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        JSON-friendly representation
+        """
+        data = asdict(self)
+        data["per_iteration_us"] = round(self.per_iteration_us, 2)
+        data["queries_per_iteration"] = round(self.queries_per_iteration, 3)
+        return data
+
+
+def measure(label: str, func: Callable[[], Any], iterations: int = 1, trace_memory: bool = False) -> Measurement:
+    """
+    Run func() `iterations` times and measure it.
+
+    Args:
+        label (str): scenario name
+        func (Callable): the unit of work
+        iterations (int): how many times to run it
+        trace_memory (bool): also record the tracemalloc peak (slows the run down)
+    """
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            elapsed = time.perf_counter() - started
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return Measurement(label=label, iterations=iterations, wall_seconds=elapsed,
+                       queries=len(ctx.captured_queries), peak_memory_bytes=peak)
+
+
+# Metrics compared against a baseline; higher is worse for all of them
+BASELINE_METRICS = ("wall_seconds", "queries", "peak_memory_bytes")
+
+
+def compare_to_baseline(results: list[dict[str, Any]], baseline: list[dict[str, Any]],
+                        threshold: float) -> list[str]:
+    """
+    Regressions of results against a baseline, matched by label.
+
+    Args:
+        results (list): Measurement.as_dict() entries of this run
+        baseline (list): the same entries of a stored run
+        threshold (float): allowed relative growth, 0.2 = 20 %
+
+    Returns:
+        list[str], one message per metric that grew beyond the threshold (empty when none did)
+    """
+    stored = {entry["label"]: entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        previous = stored.get(entry["label"])
+        if previous is None:
+            continue
+        for metric in BASELINE_METRICS:
+            old, new = previous.get(metric), entry.get(metric)
+            if old is None or new is None:
+                continue
+            # Query counts are exact, so any growth beyond the threshold (even from 0) is reported
+            if new > old * (1 + threshold) and (metric == "queries" or old > 0):
+                regressions.append(f"{entry['label']}: {metric} {old} -> {new} "
+                                   f"(+{(new - old) / old * 100 if old else float('inf'):.0f}%)")
+    return regressions
@@ -1,23 +1,78 @@
 """
 Boot epoch utilities.
 
-Priority for the epoch source:
-1) Django setting `BOOT_ID`
-2) Fallback: per-process timestamp captured at import time
+The boot id embedded in tokens (and compared by BootIdEnforcerMiddleware) is the epoch of the
+current deployment, stored once in the BootEpoch table under DEPLOYMENT_ID:
+
+1) The first process of a deployment creates the row (a race between workers is settled by the
+   unique deployment_id); every other worker and node reads the same value
+2) A process reads it once and keeps it; a new DEPLOYMENT_ID starts a new epoch, which
+   invalidates tokens of the previous deployment
+3) Fallback, while the table cannot be read (e.g. before migrate): the per-process
+   settings.BOOT_ID, retried every BOOT_EPOCH_RETRY_SECONDS seconds
+
+Key ring for rolling deploys (BOOT_EPOCH_OVERLAP_SECONDS > 0): besides its own epoch, a process
+accepts the epochs of newer deployments (nodes already rolled) and of older ones until
+BOOT_EPOCH_OVERLAP_SECONDS after their successor was created (nodes not rolled yet, tokens
+minted before the deploy). Such tokens are upgraded to the current epoch on their next refresh,
+so clients re-authenticate on their own schedule instead of all at once. The ring is only read
+for tokens that do not carry the current epoch and is reloaded at most every
+BOOT_EPOCH_RING_REFRESH_SECONDS seconds.
 """
 
 from __future__ import annotations
+import logging
+import threading
+import time
 from datetime import datetime, timezone
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from .models.boot_epoch import BootEpoch
+
+
+logger = logging.getLogger(__name__)
+
+# Used only while the BootEpoch table cannot be read
+_FALLBACK_BOOT_ID: int = int(datetime.now(timezone.utc).timestamp())
+_BOOT_EPOCH: Optional[int] = None
+_RETRY_AT: float = 0.0
+_LOCK = threading.Lock()
+# (reload at, {epoch: accepted until (unix time) or None while current/newer})
+_RING: Optional[tuple[float, dict[int, Optional[float]]]] = None
+# Deployments looked at when building the ring; older ones are long out of any overlap window
+_RING_ROWS = 20
+
 
-try:
-    from django.conf import settings as DJANGO_SETTINGS
-except Exception:  # pylint: disable=broad-exception-caught
-    DJANGO_SETTINGS = None
+def get_deployment_id() -> str:
+    """
+    Identifier of the running deployment (DEPLOYMENT_ID)
+    """
+    return str(getattr(settings, "DEPLOYMENT_ID", "") or "default")[:64]
+
+
+def load_boot_epoch(deployment_id: str) -> int:
+    """
+    Epoch of a deployment, created on first use.
+
+    Raises:
+        DatabaseError, when the table cannot be read or written
+    """
+    with transaction.atomic():  # a failure must not break the caller's transaction
+        row, created = BootEpoch.objects.get_or_create(  # pylint: disable=no-member
+            deployment_id=deployment_id, defaults={"epoch": int(time.time())})
+    if created:
+        logger.info("New boot epoch %s for deployment %r", row.epoch, deployment_id)
+    return int(row.epoch)
 
 
-# Capture a per-process fallback at import time.
-# This ensures a changed value on every server restart when no shared value is provided.
-_FALLBACK_BOOT_ID: int = datetime.now(timezone.utc).timestamp()
+def _fallback_boot_id() -> int:
+    try:
+        return int(getattr(settings, "BOOT_ID", _FALLBACK_BOOT_ID))
+    except (TypeError, ValueError):
+        return _FALLBACK_BOOT_ID
 
 
 def get_boot_id() -> int:
@@ -27,12 +82,80 @@ def get_boot_id() -> int:
     Returns
         int, The boot id to embed in tokens and compare in middleware.
     """
-    if DJANGO_SETTINGS is not None:
-        # Prefer top-level BOOT_ID from core.settings
-        boot_id = getattr(DJANGO_SETTINGS, "BOOT_ID", None)
-        if boot_id is not None:
+    global _BOOT_EPOCH, _RETRY_AT  # pylint: disable=global-statement
+    if _BOOT_EPOCH is not None:
+        return _BOOT_EPOCH
+    with _LOCK:
+        if _BOOT_EPOCH is None and time.monotonic() >= _RETRY_AT:
             try:
-                return int(boot_id)
-            except (TypeError, ValueError):
-                pass
-    return int(_FALLBACK_BOOT_ID)
+                _BOOT_EPOCH = load_boot_epoch(get_deployment_id())
+            except DatabaseError as exc:
+                logger.warning("Boot epoch unavailable, using the per-process boot id: %s", exc)
+                _RETRY_AT = time.monotonic() + float(getattr(settings, "BOOT_EPOCH_RETRY_SECONDS", 30))
+    return _BOOT_EPOCH if _BOOT_EPOCH is not None else _fallback_boot_id()
+
+
+def load_key_ring(deployment_id: str, overlap_seconds: float) -> dict[int, Optional[float]]:
+    """
+    Accepted epochs around a deployment's own one.
+
+    Returns:
+        dict, epoch -> unix time until which it is accepted (None: no limit)
+    """
+    rows = list(BootEpoch.objects.order_by("-created_at", "-id")  # pylint: disable=no-member
+                .values_list("deployment_id", "epoch", "created_at")[:_RING_ROWS])
+    rows.reverse()
+    own = next((index for index, row in enumerate(rows) if row[0] == deployment_id), None)
+    if own is None:
+        return {}
+    ring: dict[int, Optional[float]] = {int(rows[own][1]): None}
+    for _, epoch, _ in rows[own + 1:]:
+        ring.setdefault(int(epoch), None)
+    for index in range(own - 1, -1, -1):
+        until = rows[index + 1][2].timestamp() + overlap_seconds
+        ring.setdefault(int(rows[index][1]), until)
+    return ring
+
+
+def _get_key_ring(overlap_seconds: float) -> dict[int, Optional[float]]:
+    global _RING  # pylint: disable=global-statement
+    ring = _RING
+    if ring is not None and ring[0] > time.monotonic():
+        return ring[1]
+    try:
+        epochs = load_key_ring(get_deployment_id(), overlap_seconds)
+    except DatabaseError as exc:
+        logger.warning("Boot epoch key ring unavailable: %s", exc)
+        epochs = {}
+    refresh = float(getattr(settings, "BOOT_EPOCH_RING_REFRESH_SECONDS", 10))
+    with _LOCK:
+        _RING = (time.monotonic() + refresh, epochs)
+    return epochs
+
+
+def is_boot_id_accepted(boot_id: Any) -> bool:
+    """
+    Whether a token's boot_id is the current epoch or, within the overlap window, one of the key ring
+    """
+    current = get_boot_id()
+    if boot_id == current:
+        return True
+    overlap = float(getattr(settings, "BOOT_EPOCH_OVERLAP_SECONDS", 0))
+    if overlap <= 0 or not isinstance(boot_id, int):
+        return False
+    epochs = _get_key_ring(overlap)
+    if boot_id not in epochs:
+        return False
+    until = epochs[boot_id]
+    return until is None or time.time() < until
+
+
+def reset_boot_id() -> None:
+    """
+    Forget the epoch and key ring read by this process (tests, deployment id changes)
+    """
+    global _BOOT_EPOCH, _RETRY_AT, _RING  # pylint: disable=global-statement
+    with _LOCK:
+        _BOOT_EPOCH = None
+        _RETRY_AT = 0.0
+        _RING = None
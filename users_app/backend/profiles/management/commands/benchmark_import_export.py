@@ -0,0 +1,185 @@
+"""
+Benchmark the Excel import/export endpoint on the workbooks shipped in users_app/test_data.
+
+For every workbook three scenarios go through ExcelUploadView (authenticated as a throwaway admin):
+
+  import:   the workbook into a database without its users
+  reimport: the same workbook again (every row already present)
+  export:   the xlsx export of all users
+
+The export cache (EXPORT_CACHE_ENABLED) is turned off for the run, so every export scenario
+measures generating the file rather than reading an earlier copy from disk.
+
+Each scenario runs in a transaction that is rolled back, so every repetition starts from the same
+state. The best of --repeat timed runs is kept; a separate run under tracemalloc records the peak
+memory. By default the command works in a throwaway test database (in-memory SQLite, or
+test_<name> on PostgreSQL) created like the test runner does; --current-db uses the configured one.
+
+Usage:
+    python manage.py benchmark_import_export [--workbook NAME ...] [--repeat 3]
+        [--output results.json] [--baseline baseline.json --threshold 0.2]
+
+With --baseline the results are compared to a previous --output file and the command fails when
+wall time, query count or peak memory of a scenario grew by more than the threshold.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished
+from django.db import close_old_connections, connection, transaction
+from django.test import override_settings
+from django.test.utils import setup_databases, teardown_databases
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ...benchmarking import Measurement, compare_to_baseline, measure
+from ...user_io import XlsxChunkReader
+from ...views.excel_upload_view import ExcelUploadView
+
+
+TEST_DATA_DIR = Path(settings.BASE_DIR).parent / "test_data"
+DEFAULT_WORKBOOKS = ("import_template_multi_column_sort_16_users.xlsx",
+                     "import_template_with_realistic_names_134_users.xlsx",
+                     "import_template_10_000_users.xlsx")
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the Excel import/export endpoint on the workbooks shipped in users_app/test_data.
+    """
+    help = "Measure import, re-import and export of the test_data workbooks; optionally compare to a baseline."
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.admin: Any = None
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--workbook", action="append", dest="workbooks", default=None,
+                            help="workbook in test_data (or a path); repeatable, default: the 16/134/10k templates")
+        parser.add_argument("--repeat", type=int, default=1, help="timed runs per scenario, the best is kept")
+        parser.add_argument("--current-db", action="store_true",
+                            help="use the configured database instead of a throwaway test database")
+        parser.add_argument("--output", default=None, help="write the results as JSON to this path")
+        parser.add_argument("--baseline", default=None, help="JSON results of a previous run to compare with")
+        parser.add_argument("--threshold", type=float, default=0.2,
+                            help="allowed relative growth against the baseline (default 0.2 = 20%%)")
+
+    @staticmethod
+    def _resolve(name: str) -> Path:
+        path = Path(name)
+        if not path.is_file():
+            path = TEST_DATA_DIR / name
+        if not path.is_file():
+            raise CommandError(f"Workbook not found: {name}")
+        return path
+
+    @staticmethod
+    def _count_rows(path: Path) -> int:
+        with open(path, "rb") as fh:
+            reader = XlsxChunkReader(fh)
+            for _ in reader:
+                pass
+        return reader.rows
+
+    def _scenarios(self, path: Path) -> list[tuple[str, Callable[[], Any], Callable[[], Any]]]:
+        """
+        (name, setup, run) per scenario; both run inside the scenario's rolled-back transaction
+        """
+        factory = APIRequestFactory()
+        view = ExcelUploadView.as_view()
+
+        def admin() -> Any:
+            suffix = uuid4().hex[:12]
+            return get_user_model().objects.create_user(username=f"bench_{suffix}", email=f"bench_{suffix}@example.com",
+                                                        is_staff=True)
+
+        def upload() -> None:
+            with open(path, "rb") as fh:
+                request = factory.post("/api/v1/import-excel/?async=0", {"file": fh}, format="multipart")
+                force_authenticate(request, user=self.admin)
+                response = view(request)
+            if response.status_code != 200:
+                raise CommandError(f"Import of {path.name} failed: {response.status_code} {response.data}")
+
+        def export() -> None:
+            request = factory.get("/api/v1/import-excel/")
+            force_authenticate(request, user=self.admin)
+            response = view(request)
+            for _ in response.streaming_content:
+                pass
+            # Closing a response sends request_finished, whose close_old_connections() would drop the
+            # connection of the open scenario transaction; the test client holds it back the same way
+            request_finished.disconnect(close_old_connections)
+            try:
+                response.close()
+            finally:
+                request_finished.connect(close_old_connections)
+
+        def fresh() -> None:
+            self.admin = admin()
+
+        def imported() -> None:
+            fresh()
+            upload()
+
+        return [("import", fresh, upload), ("reimport", imported, upload), ("export", imported, export)]
+
+    def _measure(self, label: str, setup: Callable[[], Any], func: Callable[[], Any],
+                 trace_memory: bool) -> Measurement:
+        with transaction.atomic():
+            setup()
+            result = measure(label, func, trace_memory=trace_memory)
+            transaction.set_rollback(True)
+        return result
+
+    @override_settings(EXPORT_CACHE_ENABLED=False)
+    def _run(self, workbooks: list[Path], repeat: int) -> list[dict[str, Any]]:
+        results = []
+        for path in workbooks:
+            rows = self._count_rows(path)
+            for scenario, setup, func in self._scenarios(path):
+                label = f"{path.stem}:{scenario}"
+                timed = min((self._measure(label, setup, func, False) for _ in range(repeat)),
+                            key=lambda m: m.wall_seconds)
+                timed.peak_memory_bytes = self._measure(label, setup, func, True).peak_memory_bytes
+                entry = timed.as_dict()
+                entry.update(workbook=path.name, scenario=scenario, rows=rows,
+                             rows_per_second=round(rows / timed.wall_seconds, 1) if timed.wall_seconds else 0.0)
+                results.append(entry)
+                self.stdout.write(f"{label:<60}{timed.wall_seconds:>9.3f}s{entry['rows_per_second']:>11.0f} rows/s"
+                                  f"{timed.queries:>7} queries{(timed.peak_memory_bytes or 0) / 2 ** 20:>8.1f} MiB")
+        return results
+
+    def handle(self, *args, **options) -> None:
+        workbooks = [self._resolve(name) for name in options["workbooks"] or DEFAULT_WORKBOOKS]
+        repeat = max(1, options["repeat"])
+
+        if options["current_db"]:
+            results = self._run(workbooks, repeat)
+        else:
+            old_config = setup_databases(verbosity=0, interactive=False, aliases={"default"}, serialized_aliases=set())
+            try:
+                results = self._run(workbooks, repeat)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump({"benchmark": "import_export", "database": connection.vendor, "results": results},
+                          fh, indent=2)
+
+        if options["baseline"]:
+            try:
+                with open(options["baseline"], encoding="utf-8") as fh:
+                    baseline = json.load(fh)["results"]
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Cannot read baseline {options['baseline']}: {exc}") from exc
+            regressions = compare_to_baseline(results, baseline, options["threshold"])
+            if regressions:
+                raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS(f"No regressions beyond {options['threshold']:.0%} of the baseline"))
@@ -0,0 +1,124 @@
+"""
+Benchmark the user import/export file formats (xlsx, CSV, NDJSON) on the same data.
+
+For each format three scenarios are measured:
+
+  decode: read the file into DataFrame chunks, normalize and validate them (no database)
+  import: the full UserImporter run, inside a transaction that is rolled back afterwards
+  encode: write the rows in the format (xlsx into a temporary file, text formats as a byte stream)
+
+The input is the 10k-user template (test_data/import_template_10_000_users.xlsx) unless --source
+is given; it is converted to CSV/NDJSON in memory first, so every format carries the same rows.
+
+Usage:
+    python manage.py benchmark_user_io [--source users.xlsx] [--no-import] [--output results.json]
+"""
+
+import io
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...benchmarking import Measurement, measure
+from ...user_io import FILE_FORMATS, EXPORT_COLUMNS, UserImporter, XlsxChunkReader, prepare_chunk, write_xlsx
+
+
+DEFAULT_SOURCE = Path(settings.BASE_DIR).parent / "test_data" / "import_template_10_000_users.xlsx"
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the user import/export file formats (xlsx, CSV, NDJSON) on the same data.
+    """
+    help = "Compare throughput and peak memory of xlsx, CSV and NDJSON user import/export."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--source", default=str(DEFAULT_SOURCE), help="xlsx file in the import template layout")
+        parser.add_argument("--no-import", action="store_true", help="skip the database import scenario")
+        parser.add_argument("--output", default=None, help="write the results as JSON to this path")
+
+    @staticmethod
+    def _load_rows(path: str) -> list[tuple[Any, ...]]:
+        """
+        Rows of the source file in EXPORT_COLUMNS order, as the export would produce them
+        """
+        rows: list[tuple[Any, ...]] = []
+        with open(path, "rb") as fh:
+            for frame in XlsxChunkReader(fh):
+                frame = frame.rename(columns=lambda c: str(c).strip().lower())
+                frame = frame.reindex(columns=list(EXPORT_COLUMNS))
+                frame["is_active"] = frame["is_active"].fillna(True).astype(bool)
+                frame = frame.astype(object).where(frame.notna(), "")
+                rows.extend(frame.itertuples(index=False, name=None))
+        return rows
+
+    @staticmethod
+    def _encode(name: str, rows: list[tuple[Any, ...]]) -> bytes:
+        if FILE_FORMATS[name].encoder is None:
+            buf = io.BytesIO()
+            write_xlsx(iter(rows), buf)
+            return buf.getvalue()
+        return b"".join(FILE_FORMATS[name].encoder(iter(rows)))
+
+    def _scenarios(self, name: str, payload: bytes, rows: list[tuple[Any, ...]],
+                   with_import: bool) -> list[tuple[str, Callable[[], Any]]]:
+        file_format = FILE_FORMATS[name]
+
+        def decode() -> None:
+            for frame in file_format.reader(io.BytesIO(payload)):
+                prepare_chunk(frame)
+
+        def run_import() -> None:
+            with transaction.atomic():
+                UserImporter().run(file_format.reader(io.BytesIO(payload)))
+                transaction.set_rollback(True)
+
+        def encode() -> None:
+            if file_format.encoder is None:
+                with tempfile.TemporaryFile() as target:
+                    write_xlsx(iter(rows), target)
+            else:
+                for _ in file_format.encoder(iter(rows)):
+                    pass
+
+        scenarios = [("decode", decode)]
+        if with_import:
+            scenarios.append(("import", run_import))
+        scenarios.append(("encode", encode))
+        return scenarios
+
+    def handle(self, *args, **options) -> None:
+        if not Path(options["source"]).is_file():
+            raise CommandError(f"Source file not found: {options['source']}")
+        rows = self._load_rows(options["source"])
+        payloads = {name: self._encode(name, rows) for name in FILE_FORMATS}
+
+        results: list[tuple[str, str, Measurement]] = []
+        for name, payload in payloads.items():
+            for scenario, func in self._scenarios(name, payload, rows, not options["no_import"]):
+                # Timed run first, then a traced run for the memory peak (tracemalloc slows the code down)
+                timed = measure(f"{name}:{scenario}", func)
+                timed.peak_memory_bytes = measure(f"{name}:{scenario}", func, trace_memory=True).peak_memory_bytes
+                results.append((name, scenario, timed))
+
+        self.stdout.write(f"{len(rows)} rows; file sizes: "
+                          + ", ".join(f"{name} {len(payload) / 1024:.0f} KiB" for name, payload in payloads.items()))
+        self.stdout.write(f"{'format':<8}{'scenario':<10}{'seconds':>10}{'rows/s':>12}{'peak MiB':>11}")
+        for name, scenario, result in results:
+            rate = len(rows) / result.wall_seconds if result.wall_seconds else 0.0
+            self.stdout.write(f"{name:<8}{scenario:<10}{result.wall_seconds:>10.3f}{rate:>12.0f}"
+                              f"{(result.peak_memory_bytes or 0) / 2 ** 20:>11.1f}")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump({"benchmark": "user_io", "rows": len(rows),
+                           "file_sizes": {name: len(payload) for name, payload in payloads.items()},
+                           "results": [dict(result.as_dict(), format=name, scenario=scenario,
+                                            rows_per_second=round(len(rows) / result.wall_seconds, 1)
+                                            if result.wall_seconds else 0.0)
+                                       for name, scenario, result in results]}, fh, indent=2)
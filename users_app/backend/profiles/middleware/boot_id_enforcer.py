@@ -1,18 +1,23 @@
 """
 On each request, it compares the boot_id value embedded in the validated JWT
 with the server's current boot ID.
-If they differ, e.g., after a deploy or restart—the middleware returns a 401
-so the client can refresh credentials.
+If they differ, e.g., after a new deployment, and the token's boot_id is not in the
+key ring of accepted epochs either (see profiles.boot), the token's validation outcome
+becomes an AuthenticationFailed, so DRF answers 401 and the client can refresh credentials.
+
+The validated token is kept on the request, so DRF's authentication class does not
+decode and denylist-check the same token a second time.
 """
 
+from dataclasses import replace
 from typing import Callable
 
 from django.http import HttpRequest, HttpResponse
-from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.exceptions import InvalidToken
 
-from core.jwt_authentication import JWTAuthenticationWithDenylist
-from ..boot import get_boot_id
+from core.jwt_authentication import VALIDATED_BEARER_ATTR, JWTAuthenticationWithDenylist
+from ..boot import get_boot_id, is_boot_id_accepted
 
 
 def boot_header(get_response) -> Callable[[HttpRequest], HttpResponse]:
@@ -42,23 +47,20 @@ class BootIdEnforcerMiddleware:
         self.jwt_auth = JWTAuthenticationWithDenylist()
 
     def __call__(self, request) -> HttpResponse:
-        # Pull raw Bearer token (if any)
-        auth_header = request.META.get("HTTP_AUTHORIZATION", "")
-        if auth_header.lower().startswith("bearer "):
-            raw = auth_header.split(None, 1)[1]
-
-            # Validate token and compare boot ids
-            try:
-                token = self.jwt_auth.get_validated_token(raw)
-                curr = get_boot_id()
-                if token.payload.get("boot_id") != curr:
-                    raise ValidationError(
-                        {"non_field_errors": ["Session expired due to server restart."]}
-                    )
-                request.auth = token
-            except (InvalidToken, AuthenticationFailed):
-                # Let the normal auth/permission handling reject it.
-                pass
+        # Validate the Bearer token (if any) once for the whole request and compare boot ids
+        try:
+            token = self.jwt_auth.validate_request_token(request)
+            if token is not None:
+                if not is_boot_id_accepted(token.payload.get("boot_id")):
+                    # Reused by DRF's authentication class, which then fails the request with 401
+                    bearer = getattr(request, VALIDATED_BEARER_ATTR)
+                    setattr(request, VALIDATED_BEARER_ATTR, replace(bearer, token=None, error=AuthenticationFailed(
+                        "Session expired due to server restart.", code="token_not_valid")))
+                else:
+                    request.auth = token
+        except (InvalidToken, AuthenticationFailed):
+            # Let the normal auth/permission handling reject it.
+            pass
 
         # Anonymous or no/bad token - proceed (views/DRF will handle)
         return self.get_response(request)
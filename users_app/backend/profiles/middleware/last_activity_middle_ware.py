@@ -1,11 +1,21 @@
 """
 This is a Django middleware that records the user's last activity timestamp on every request.
+
+LAST_ACTIVITY_MODE:
+  - "immediate" (default): one UPDATE per authenticated request
+  - "coalesce": the timestamp is buffered in memory and written in bulk by a background
+    flusher at most once per LAST_ACTIVITY_FLUSH_SECONDS per user (see profiles.activity_buffer)
+
+The user is also marked in the presence store that serves the online users list (see profiles.presence).
 """
 
+from django.conf import settings
 from django.utils import timezone
 from django.http import HttpResponse
 
+from ..activity_buffer import get_last_activity_buffer
 from ..models.profile import Profile
+from ..presence import get_presence_store, is_presence_enabled
 
 
 class LastActivityMiddleware:
@@ -31,5 +41,10 @@ class LastActivityMiddleware:
         response = self.get_response(request)
         user = getattr(request, "user", None)
         if user and user.is_authenticated:
-            Profile.objects.filter(user=user).update(last_activity=timezone.now())
+            if getattr(settings, "LAST_ACTIVITY_MODE", "immediate") == "coalesce":
+                get_last_activity_buffer().record(user.pk, timezone.now())
+            else:
+                Profile.objects.filter(user=user).update(last_activity=timezone.now())
+            if is_presence_enabled():
+                get_presence_store().touch(user.pk)
         return response
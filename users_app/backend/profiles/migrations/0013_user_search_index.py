@@ -0,0 +1,95 @@
+"""
+Migration module for the user search index
+
+  - PostgreSQL: pg_trgm GIN indexes on UPPER(column), which serve the icontains lookups of user search
+  - SQLite: an FTS5 trigram table over the same columns, kept in sync by triggers
+  - Other databases: nothing (search falls back to plain icontains)
+"""
+
+from django.conf import settings
+from django.db import migrations
+
+
+SEARCH_COLUMNS = ["username", "email", "first_name", "last_name"]
+SQLITE_SEARCH_TABLE = "profiles_user_search"
+
+
+def _user_table(apps) -> str:
+    model = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    return model._meta.db_table  # pylint: disable=protected-access
+
+
+def _postgres_statements(table: str) -> list[str]:
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    for column in SEARCH_COLUMNS:
+        statements.append(f'CREATE INDEX IF NOT EXISTS "{table}_{column}_trgm" '
+                          f'ON "{table}" USING gin (UPPER("{column}"::text) gin_trgm_ops)')
+    return statements
+
+
+def _sqlite_statements(table: str) -> list[str]:
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+    fts = SQLITE_SEARCH_TABLE
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, "
+        f"content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_search_index(apps, schema_editor) -> None:
+    """
+    Create the vendor-specific search index
+    """
+    table = _user_table(apps)
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        statements = _postgres_statements(table)
+    elif vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                return  # no FTS5 in this SQLite build; search keeps using icontains
+        statements = _sqlite_statements(table)
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor) -> None:
+    """
+    Drop the vendor-specific search index
+    """
+    table = _user_table(apps)
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for column in SEARCH_COLUMNS:
+            schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_{column}_trgm"')
+    elif vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+    """
+    Migration class
+    """
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("profiles", "0012_app_settings"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
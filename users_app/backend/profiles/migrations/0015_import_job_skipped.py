@@ -0,0 +1,22 @@
+"""
+Migration module for the skipped counter of Import Jobs
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration class
+    """
+    dependencies = [
+        ("profiles", "0014_import_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="skipped",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,22 @@
+"""
+Migration module for the rejected counter of Import Jobs
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration class
+    """
+    dependencies = [
+        ("profiles", "0015_import_job_skipped"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="rejected",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
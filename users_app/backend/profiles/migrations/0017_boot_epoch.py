@@ -0,0 +1,29 @@
+"""
+Migration module for Boot Epochs
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration class
+    """
+    dependencies = [
+        ("profiles", "0016_import_job_rejected"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BootEpoch",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("deployment_id", models.CharField(max_length=64, unique=True)),
+                ("epoch", models.BigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "boot_epoch",
+            },
+        ),
+    ]
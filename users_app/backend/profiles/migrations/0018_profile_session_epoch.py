@@ -0,0 +1,22 @@
+"""
+Migration module for the per-user session epoch
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration class
+    """
+    dependencies = [
+        ("profiles", "0017_boot_epoch"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="session_epoch",
+            field=models.BigIntegerField(default=0, db_default=0),
+        ),
+    ]
@@ -0,0 +1,28 @@
+"""
+Migration module for the data version counters
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration class
+    """
+    dependencies = [
+        ("profiles", "0018_profile_session_epoch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=64, unique=True)),
+                ("version", models.BigIntegerField()),
+            ],
+            options={
+                "db_table": "data_version",
+            },
+        ),
+    ]
@@ -3,7 +3,10 @@ Model init file
 """
 
 from .app_settings import AppSetting
+from .boot_epoch import BootEpoch
+from .data_version import DataVersion
+from .import_job import ImportJob
 from .user import User
 from .profile import Profile
 
-__all__ = ["AppSetting", "User", "Profile"]
+__all__ = ["AppSetting", "BootEpoch", "DataVersion", "ImportJob", "User", "Profile"]
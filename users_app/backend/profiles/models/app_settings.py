@@ -1,12 +1,22 @@
 """
 Dynamic App settings which can be set via web site UI
+
+The effective auth settings are read on every authenticated request, so they are loaded
+with a single query and kept in a process-local snapshot. The snapshot is dropped when
+the shared version key changes (SettingsSerializer.update bumps it) or after
+APP_SETTINGS_CACHE_TTL seconds, which bounds staleness when the cache is not shared.
+The version key itself is read at most once per APP_SETTINGS_VERSION_CHECK_SECONDS,
+so a change saved in another worker is seen here within that many seconds.
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Any
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Any, Optional
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 
 
@@ -14,6 +24,13 @@ JWT_RENEW_AT_SECONDS_KEY = "JWT_RENEW_AT_SECONDS"
 IDLE_TIMEOUT_SECONDS_KEY = "IDLE_TIMEOUT_SECONDS"
 ACCESS_TOKEN_LIFETIME_KEY = "ACCESS_TOKEN_LIFETIME"
 ROTATE_REFRESH_TOKENS_KEY = "ROTATE_REFRESH_TOKENS"
+AUTH_SETTING_KEYS = (
+    JWT_RENEW_AT_SECONDS_KEY,
+    IDLE_TIMEOUT_SECONDS_KEY,
+    ACCESS_TOKEN_LIFETIME_KEY,
+    ROTATE_REFRESH_TOKENS_KEY,
+)
+SETTINGS_VERSION_CACHE_KEY = "app_settings:version"
 
 
 class AppSetting(models.Model):
@@ -26,6 +43,9 @@ class AppSetting(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        """
+        Model options
+        """
         db_table = "app_setting"
 
     def __str__(self) -> str:
@@ -64,12 +84,78 @@ class EffectiveAuthSettings:
         }
 
 
+@dataclass(frozen=True)
+class _Snapshot:
+    """
+    Effective settings as loaded for a given settings version
+    """
+    value: EffectiveAuthSettings
+    version: int
+    expires_at: float
+    recheck_at: float
+
+
+_SNAPSHOT: Optional[_Snapshot] = None
+_SNAPSHOT_LOCK = threading.Lock()
+
+
+def _current_settings_version() -> int:
+    return int(cache.get(SETTINGS_VERSION_CACHE_KEY, 0))
+
+
+def bump_auth_settings_version() -> int:
+    """
+    Invalidate every process-local snapshot of the effective auth settings.
+
+    Returns:
+        int, the new version
+    """
+    global _SNAPSHOT  # pylint: disable=global-statement
+    cache.add(SETTINGS_VERSION_CACHE_KEY, 0, timeout=None)
+    try:
+        version = cache.incr(SETTINGS_VERSION_CACHE_KEY)
+    except ValueError:
+        # Evicted between add() and incr(); any new value invalidates old snapshots
+        version = int(time.time())
+        cache.set(SETTINGS_VERSION_CACHE_KEY, version, timeout=None)
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT = None
+    return version
+
+
 def get_effective_auth_settings() -> EffectiveAuthSettings:
     """
-    Returns effective values:
+    Returns effective values (served from the process-local snapshot when it is current):
       - DB override if present
       - otherwise fall back to core.settings.py defaults / env
     """
+    global _SNAPSHOT  # pylint: disable=global-statement
+    now = time.monotonic()
+    check_interval = float(getattr(settings, "APP_SETTINGS_VERSION_CHECK_SECONDS", 2))
+    snapshot = _SNAPSHOT
+    if snapshot is not None and snapshot.expires_at > now:
+        if snapshot.recheck_at > now:
+            return snapshot.value
+        version = _current_settings_version()
+        if snapshot.version == version:
+            with _SNAPSHOT_LOCK:
+                if _SNAPSHOT is snapshot:
+                    _SNAPSHOT = replace(snapshot, recheck_at=now + check_interval)
+            return snapshot.value
+    else:
+        version = _current_settings_version()
+
+    value = _load_effective_auth_settings()
+    ttl = float(getattr(settings, "APP_SETTINGS_CACHE_TTL", 30))
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT = _Snapshot(value=value, version=version, expires_at=now + ttl, recheck_at=now + check_interval)
+    return value
+
+
+def _load_effective_auth_settings() -> EffectiveAuthSettings:
+    """
+    Read all overrides with one query and merge them with core.settings defaults
+    """
     def _int_or(default: int, maybe: str | None) -> int:
         try:
             return int(maybe) if maybe is not None else default
@@ -98,10 +184,11 @@ def get_effective_auth_settings() -> EffectiveAuthSettings:
     default_access = int(default_access_td.total_seconds() if default_access_td else 1800)
     default_is_token_rotate = bool(getattr(settings, ROTATE_REFRESH_TOKENS_KEY))
 
-    renew = _int_or(default_renew, AppSetting.get_value(JWT_RENEW_AT_SECONDS_KEY))
-    idle  = _int_or(default_idle,  AppSetting.get_value(IDLE_TIMEOUT_SECONDS_KEY))
-    access = _int_or(default_access, AppSetting.get_value(ACCESS_TOKEN_LIFETIME_KEY))
-    rotate = _bool_or(default_is_token_rotate, AppSetting.get_value(ROTATE_REFRESH_TOKENS_KEY))
+    overrides = dict(AppSetting.objects.filter(key__in=AUTH_SETTING_KEYS).values_list("key", "value"))
+    renew = _int_or(default_renew, overrides.get(JWT_RENEW_AT_SECONDS_KEY))
+    idle  = _int_or(default_idle,  overrides.get(IDLE_TIMEOUT_SECONDS_KEY))
+    access = _int_or(default_access, overrides.get(ACCESS_TOKEN_LIFETIME_KEY))
+    rotate = _bool_or(default_is_token_rotate, overrides.get(ROTATE_REFRESH_TOKENS_KEY))
 
     return EffectiveAuthSettings(
         jwt_renew_at_seconds=max(0, renew),
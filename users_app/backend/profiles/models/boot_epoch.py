@@ -0,0 +1,25 @@
+"""
+Boot epoch of a deployment: the boot_id carried by tokens, shared by every worker and node
+(see profiles.boot).
+"""
+
+from django.db import models
+
+
+class BootEpoch(models.Model):
+    """
+    Boot epoch of a deployment: the boot_id carried by tokens, shared by every worker and node.
+    The first process of a deployment creates the row; all others read it.
+    """
+    deployment_id = models.CharField(max_length=64, unique=True)
+    epoch = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """
+        Model options
+        """
+        db_table = "boot_epoch"
+
+    def __str__(self) -> str:
+        return f"BootEpoch({self.deployment_id}, {self.epoch})"
@@ -0,0 +1,23 @@
+"""
+Version counters of derived data, bumped with an atomic UPDATE (see profiles.users_version).
+"""
+
+from django.db import models
+
+
+class DataVersion(models.Model):
+    """
+    Version counters of derived data, bumped with an atomic UPDATE.
+    One row per counter; the users-table version is the row named "users".
+    """
+    name = models.CharField(max_length=64, unique=True)
+    version = models.BigIntegerField()
+
+    class Meta:
+        """
+        Model options
+        """
+        db_table = "data_version"
+
+    def __str__(self) -> str:
+        return f"DataVersion({self.name}, {self.version})"
@@ -31,6 +31,8 @@ class Profile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_activity = models.DateTimeField(null=True, blank=True)
+    # Tokens issued with a lower session epoch are revoked (see core.session_epochs)
+    session_epoch = models.BigIntegerField(default=0, db_default=0)
 
     def __str__(self) -> str:
         return f"Profile({self.user.user_id})"
@@ -0,0 +1,161 @@
+"""
+Cache-backed presence store: user -> last seen, kept in time buckets.
+
+Each bucket covers PRESENCE_BUCKET_SECONDS. A user seen in a bucket has their own key,
+presence:<bucket>:<user_id>, holding the last-seen time, so a touch never rewrites data of
+other users. The bucket also keeps a directory of its members: a member counter and one
+slot key per member, claimed with cache.add() the first time the user shows up in the bucket.
+All keys expire on their own once they fall out of the online window, so there is nothing
+to clean up. Reading "who is online" is three get_many() calls over the buckets of the window
+(counters, slots, last-seen keys).
+
+  - touch() is throttled per process (PRESENCE_TOUCH_SECONDS), so a burst of requests
+    costs one cache write per user; later touches in the same bucket are a single set()
+  - Slots are claimed with add(), so two workers never take the same slot even when the
+    backend's incr() is not atomic
+"""
+
+from __future__ import annotations
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+KEY_PREFIX = "presence:"
+_MAX_THROTTLE_ENTRIES = 50_000
+# Attempts to claim a directory slot before the touch gives up (only under heavy races)
+_MAX_SLOT_ATTEMPTS = 8
+
+
+class PresenceStore:
+    """
+    Time-bucketed user -> last-seen map in the shared cache
+    """
+
+    def __init__(self) -> None:
+        self._last_touch: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket_seconds() -> int:
+        """
+        Length of one bucket
+        """
+        return max(1, int(getattr(settings, "PRESENCE_BUCKET_SECONDS", 60)))
+
+    @staticmethod
+    def window_seconds() -> int:
+        """
+        How long a user counts as online after their last request
+        """
+        return max(1, int(getattr(settings, "PRESENCE_WINDOW_SECONDS", 300)))
+
+    def _timeout(self) -> int:
+        return self.window_seconds() + 2 * self.bucket_seconds()
+
+    @staticmethod
+    def _user_key(bucket: int, user_id: int) -> str:
+        return f"{KEY_PREFIX}{bucket}:{user_id}"
+
+    @staticmethod
+    def _counter_key(bucket: int) -> str:
+        return f"{KEY_PREFIX}{bucket}:n"
+
+    @staticmethod
+    def _slot_key(bucket: int, slot: int) -> str:
+        return f"{KEY_PREFIX}{bucket}:slot:{slot}"
+
+    def _claim_slot(self, bucket: int, user_id: int) -> None:
+        timeout = self._timeout()
+        counter = self._counter_key(bucket)
+        cache.add(counter, 0, timeout=timeout)
+        for _ in range(_MAX_SLOT_ATTEMPTS):
+            try:
+                slot = cache.incr(counter)
+            except ValueError:  # the counter was evicted
+                cache.add(counter, 0, timeout=timeout)
+                continue
+            if cache.add(self._slot_key(bucket, slot), user_id, timeout=timeout):
+                return
+
+    def touch(self, user_id: int, now: Optional[float] = None) -> bool:
+        """
+        Mark a user as seen.
+
+        Returns:
+            bool, False when skipped because the user was marked moments ago
+        """
+        now = time.time() if now is None else now
+        throttle = float(getattr(settings, "PRESENCE_TOUCH_SECONDS", 15))
+        with self._lock:
+            last = self._last_touch.get(user_id)
+            if last is not None and now - last < throttle:
+                return False
+            if len(self._last_touch) >= _MAX_THROTTLE_ENTRIES:
+                self._last_touch.clear()
+            self._last_touch[user_id] = now
+
+        bucket = int(now // self.bucket_seconds())
+        key = self._user_key(bucket, user_id)
+        if cache.add(key, now, timeout=self._timeout()):
+            self._claim_slot(bucket, user_id)
+        else:
+            cache.set(key, now, timeout=self._timeout())
+        return True
+
+    def online(self, now: Optional[float] = None) -> list[tuple[int, float]]:
+        """
+        Users seen within the window, most recent first.
+
+        Returns:
+            list of (user_id, last_seen_epoch)
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.window_seconds()
+        size = self.bucket_seconds()
+        buckets = range(int(cutoff // size), int(now // size) + 1)
+        counters = cache.get_many([self._counter_key(bucket) for bucket in buckets])
+        slot_keys = {self._slot_key(bucket, slot): bucket
+                     for bucket in buckets
+                     for slot in range(1, int(counters.get(self._counter_key(bucket), 0)) + 1)}
+        members = cache.get_many(list(slot_keys))
+        user_keys = {self._user_key(slot_keys[slot_key], user_id): user_id for slot_key, user_id in members.items()}
+        last_seen: dict[int, float] = {}
+        for key, ts in cache.get_many(list(user_keys)).items():
+            user_id = user_keys[key]
+            if ts >= cutoff and ts > last_seen.get(user_id, 0.0):
+                last_seen[user_id] = ts
+        return sorted(last_seen.items(), key=lambda item: (-item[1], item[0]))
+
+    def count(self, now: Optional[float] = None) -> int:
+        """
+        Number of users seen within the window
+        """
+        return len(self.online(now))
+
+    def forget_throttle(self) -> None:
+        """
+        Drop the per-process touch throttle (the cached buckets are kept)
+        """
+        with self._lock:
+            self._last_touch.clear()
+
+
+_STORE = PresenceStore()
+
+
+def is_presence_enabled() -> bool:
+    """
+    Whether online users are tracked in (and served from) the presence store
+    """
+    return bool(getattr(settings, "PRESENCE_ENABLED", True))
+
+
+def get_presence_store() -> PresenceStore:
+    """
+    Process-wide presence store
+    """
+    return _STORE
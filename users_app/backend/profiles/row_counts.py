@@ -0,0 +1,87 @@
+"""
+Cheap row counts for paginated lists.
+
+estimate_count() answers "about how many rows" without a full COUNT(*) where the database
+can tell:
+
+  - PostgreSQL, unfiltered query: pg_class.reltuples of the table (kept fresh by autovacuum/ANALYZE)
+  - PostgreSQL, filtered query: the planner's row estimate (EXPLAIN)
+  - Small estimates (below PAGINATION_EXACT_COUNT_THRESHOLD), tables never analyzed and every
+    other database (SQLite) fall back to an exact COUNT(*)
+
+Results are cached for PAGINATION_COUNT_CACHE_SECONDS per SQL + parameters, so repeated
+page requests with the same filters do not pay for the count again.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import logging
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "rowcount:"
+
+
+def _signature(queryset: QuerySet) -> str:
+    sql, params = queryset.query.sql_with_params()
+    raw = f"{queryset.db}|{sql}|{params!r}"
+    return CACHE_KEY_PREFIX + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _postgres_estimate(queryset: QuerySet) -> Optional[int]:
+    """
+    Planner estimate of the number of rows, None when the planner has no statistics
+    """
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                           [queryset.model._meta.db_table])  # pylint: disable=protected-access
+            row = cursor.fetchone()
+            # reltuples is -1 (PostgreSQL 14+) or 0 until the table has been analyzed
+            return int(row[0]) if row and row[0] and row[0] > 0 else None
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(object_list: Any) -> tuple[int, bool]:
+    """
+    Approximate number of rows of a queryset (or exact length of a list).
+
+    Returns:
+        tuple, (count, is_estimate)
+    """
+    if not isinstance(object_list, QuerySet):
+        return len(object_list), False
+
+    queryset = object_list.order_by()
+    key = _signature(queryset)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached[0], cached[1]
+
+    estimate: Optional[int] = None
+    if connections[queryset.db].vendor == "postgresql":
+        try:
+            estimate = _postgres_estimate(queryset)
+        except (DatabaseError, KeyError, IndexError, TypeError, ValueError) as exc:
+            logger.warning("Row estimate failed, counting exactly: %s", exc)
+    threshold = int(getattr(settings, "PAGINATION_EXACT_COUNT_THRESHOLD", 10_000))
+    if estimate is None or estimate < threshold:
+        result = (queryset.count(), False)
+    else:
+        result = (estimate, True)
+    cache.set(key, result, timeout=float(getattr(settings, "PAGINATION_COUNT_CACHE_SECONDS", 30)))
+    return result
@@ -11,8 +11,9 @@ from .profile_serializer import ProfileSerializer
 from .profile_update_serializer import ProfileUpdateSerializer
 from .settings_serializer import SettingsSerializer
 from .password_reset_serializer import CustomPasswordResetSerializer
+from .import_job_serializer import ImportJobSerializer
 
 
 __all__ = ["ChangePasswordSerializer", "CustomTokenRefreshSerializer", "CustomPasswordResetSerializer",
            "UserCreateSerializer", "EmailOrUsernameTokenCreateSerializer", "UserSerializer",
-           "ProfileSerializer", "ProfileUpdateSerializer", "SettingsSerializer"]
+           "ProfileSerializer", "ProfileUpdateSerializer", "SettingsSerializer", "ImportJobSerializer"]
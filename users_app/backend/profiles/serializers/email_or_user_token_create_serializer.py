@@ -14,6 +14,8 @@ from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from core.session_epochs import (SESSION_EPOCH_CLAIM, add_authorization_claims, bump_session_epoch,
+                                 is_stateless_auth_enabled)
 from ..boot import get_boot_id
 from ..models.app_settings import get_effective_auth_settings
 
@@ -90,14 +92,26 @@ class EmailOrUsernameTokenCreateSerializer(TokenObtainPairSerializer):
             if k != login_field:
                 attrs.pop(k, None)
 
-        # Delegate auth to the base class (sets self.user if OK)
-        _ = super().validate(attrs)
+        # Delegate auth to the base class (sets self.user if OK); skip the pair serializer's
+        # token, which would be discarded (and stamp last_login a second time)
+        _ = super(TokenObtainPairSerializer, self).validate(attrs)  # pylint: disable=bad-super-call
+        return self.issue_tokens(self.user)
 
-        # Rebuild tokens so we can enforce DB-driven expiries and add claims
+    @classmethod
+    def issue_tokens(cls, user) -> Dict[str, str]:
+        """
+        Start a new session: bump the user's session epoch, which ends their other sessions,
+        and build tokens carrying it, with the DB-driven expiries and claims.
+
+        Returns:
+            dict, the "refresh" and "access" tokens
+        """
         eff = get_effective_auth_settings()
         now = timezone.now()
 
-        refresh = self.get_token(self.user)
+        epoch = bump_session_epoch(user.pk)
+        refresh = cls.get_token(user)
+        refresh[SESSION_EPOCH_CLAIM] = epoch
         refresh.set_exp(from_time=now, lifetime=timedelta(seconds=eff.idle_timeout_seconds))
 
         access: AccessToken = refresh.access_token
@@ -109,6 +123,9 @@ class EmailOrUsernameTokenCreateSerializer(TokenObtainPairSerializer):
             refresh["boot_id"] = boot_id
             access["boot_id"] = boot_id
 
+        if is_stateless_auth_enabled():
+            add_authorization_claims(access, user, epoch)
+
         return {
             "refresh": str(refresh),
             "access": str(access),
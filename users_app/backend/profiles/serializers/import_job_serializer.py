@@ -0,0 +1,43 @@
+"""
+Django REST Framework serializer for background import jobs.
+While a job runs, the counters come from its live progress instead of the job row.
+"""
+
+from typing import Any
+
+from rest_framework import serializers
+
+from ..models.import_job import ImportJob
+from ..user_io.jobs import get_job_progress
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """
+    Django REST Framework serializer for background import jobs.
+    While a job runs, the counters come from its live progress instead of the job row.
+    """
+    processed = serializers.SerializerMethodField()
+
+    class Meta:
+        """
+        Configuration for the ImportJobSerializer.
+        """
+        model = ImportJob
+        fields = ["id", "status", "filename", "rows_processed", "created", "updated", "skipped", "rejected",
+                  "processed", "rows_per_second", "errors", "created_at", "started_at", "finished_at"]
+        read_only_fields = fields
+
+    def get_processed(self, obj: ImportJob) -> int:
+        """
+        Users created or changed, as in the synchronous import response
+        """
+        return obj.created + obj.updated
+
+    def to_representation(self, instance: ImportJob) -> dict[str, Any]:
+        data = super().to_representation(instance)
+        if instance.status == ImportJob.STATUS_RUNNING:
+            progress = get_job_progress(instance.pk)
+            if progress:
+                data.update(progress)
+                data["processed"] = progress["created"] + progress["updated"]
+        return data
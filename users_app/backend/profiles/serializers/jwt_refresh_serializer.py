@@ -2,7 +2,9 @@
 Ensures that:
   - The returned access token always carries the CURRENT boot_id
   - If ROTATE_REFRESH_TOKENS is enabled, the rotated refresh also carries the CURRENT boot_id
-This allows clients to recover after a server restart without forcing a full re-login.
+  - Refresh tokens issued before the user's current session epoch are rejected
+This allows clients to recover after a server restart without forcing a full re-login, and
+upgrades tokens of a previous epoch (accepted during the key ring overlap) lazily.
 """
 
 from typing import Any, Dict
@@ -14,6 +16,9 @@ from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken, Token
 
+from core.session_epochs import (add_authorization_claims, get_session_epoch, is_session_revoked,
+                                 is_stateless_auth_enabled)
+from ..boot import get_boot_id
 from ..models.app_settings import get_effective_auth_settings
 
 
@@ -22,7 +27,9 @@ class CustomTokenRefreshSerializer(TokenRefreshSerializer):
     Ensures that:
       - The returned access token always carries the CURRENT boot_id
       - If ROTATE_REFRESH_TOKENS is enabled, the rotated refresh also carries the CURRENT boot_id
-    This allows clients to recover after a server restart without forcing a full re-login.
+      - Refresh tokens issued before the user's current session epoch are rejected
+    This allows clients to recover after a server restart without forcing a full re-login, and
+    upgrades tokens of a previous epoch (accepted during the key ring overlap) lazily.
     """
 
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
@@ -32,12 +39,9 @@ class CustomTokenRefreshSerializer(TokenRefreshSerializer):
         eff = get_effective_auth_settings()  # pulls DB overrides live
         raw = attrs.get("refresh")
         rt = RefreshToken(raw)
-        user = self._user_from_token(rt)
-        iat = int(rt.get("iat", 0))
-        if user.last_login:
-            last_login_ts = int(user.last_login.timestamp())
-            if iat + 5 < last_login_ts:
-                raise ValidationError("Logged in from another device.")
+        user_id = rt.get(settings.SIMPLE_JWT.get("USER_ID_CLAIM", "user_id"))
+        if is_session_revoked(rt, user_id):
+            raise ValidationError("Logged in from another device.")
 
         # Enforce idle on refresh even if token's original exp is longer
         iat = datetime.fromtimestamp(int(rt["iat"]), tz=timezone.utc)
@@ -47,12 +51,25 @@ class CustomTokenRefreshSerializer(TokenRefreshSerializer):
 
         data = super().validate(attrs)
 
-        # Ensure new access token carries current BOOT_ID etc.
-        boot_id = settings.SIMPLE_JWT.get("BOOT_ID")
-        if boot_id:
+        # Ensure new access token carries the current boot epoch (shared by all workers)
+        # and, in stateless mode, the user's current authorization claims
+        boot_id = get_boot_id()
+        stateless = is_stateless_auth_enabled()
+        if boot_id or stateless:
             at = AccessToken(data["access"])
-            at["boot_id"] = boot_id
+            if boot_id:
+                at["boot_id"] = boot_id
+            if stateless:
+                user = self._user_from_token(rt)
+                add_authorization_claims(at, user, get_session_epoch(user.pk))
             data["access"] = str(at)
+        if boot_id:
+            if "refresh" in data:
+                # Rotated refresh token: its claims were copied from the presented one
+                rotated = RefreshToken(data["refresh"], verify=False)
+                if rotated.get("boot_id") != boot_id:
+                    rotated["boot_id"] = boot_id
+                    data["refresh"] = str(rotated)
 
         return data
 
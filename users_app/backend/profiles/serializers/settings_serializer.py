@@ -7,6 +7,7 @@ from typing import Any
 from rest_framework import serializers
 from ..models.app_settings import (
     AppSetting,
+    bump_auth_settings_version,
     get_effective_auth_settings,
     JWT_RENEW_AT_SECONDS_KEY,
     IDLE_TIMEOUT_SECONDS_KEY,
@@ -41,6 +42,8 @@ class SettingsSerializer(serializers.Serializer):
             AppSetting.objects.update_or_create(
                 key=db_key, defaults={"value": str(validated_data[key])}
             )
+        # Every worker drops its cached snapshot on its next read
+        bump_auth_settings_version()
         return validated_data
 
     def create(self, validated_data) -> dict[str, Any]:
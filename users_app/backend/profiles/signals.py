@@ -3,8 +3,13 @@ Profiles app signals and backfills.
 
 - create_profile_on_user_create: creates a Profile when a new User is created
 - backfill_profiles: bulk-creates missing profiles after migrations
+- invalidate_cached_user: drops a user from the auth user cache on save/delete/login
+- remember_revoked_jti: adds a newly blacklisted JTI to the in-process revoked JTI filter
+- bump_users_version: marks exports of the users table as stale on user/profile save/delete
+- revoke_sessions_on_credential_change: revokes a user's tokens on a password change (and, in
+  stateless mode, when their authorization claims change)
 
-Both functions are idempotent and safe to run multiple times.
+All functions are idempotent and safe to run multiple times.
 """
 
 from __future__ import annotations
@@ -15,6 +20,12 @@ from django.db import connection, router, transaction
 from django.db.models.signals import post_migrate
 from django.dispatch import receiver
 
+from core.revoked_jti_filter import get_revoked_jti_filter
+from core.session_epochs import (AUTHORIZATION_CLAIMS, bump_session_epoch, bump_session_epoch_on_commit,
+                                 forget_session_epoch, is_stateless_auth_enabled)
+from core.user_cache import get_user_cache
+from .users_version import bump_users_version_on_commit
+
 
 def _get_user_and_profile_models() -> tuple[type["User"], type["Profile"]]:
     """
@@ -32,6 +43,8 @@ def create_profile_on_user_create(sender, instance, created, **kwargs) -> None:
     """
     if not created:
         return
+    # The new profile starts at session epoch 0, whatever was cached for a reused primary key
+    forget_session_epoch(instance.pk)
 
     # avoid creating profile within an open transaction; wait until commit
     def _create() -> None:
@@ -41,6 +54,59 @@ def create_profile_on_user_create(sender, instance, created, **kwargs) -> None:
     transaction.on_commit(_create)
 
 
+def invalidate_cached_user(sender, instance=None, user=None, **kwargs) -> None:  # pylint: disable=unused-argument
+    """
+    Post-save/post-delete/user_logged_in hook: the cached auth row is stale now.
+
+    Invalidated again after commit: until then a concurrent request may refill the cache
+    from the previously committed row.
+    """
+    target = instance if instance is not None else user
+    if target is not None and target.pk is not None:
+        pk = target.pk
+        get_user_cache().invalidate(pk)
+        transaction.on_commit(lambda: get_user_cache().invalidate(pk), using=kwargs.get("using"))
+
+
+def remember_revoked_jti(sender, instance, **kwargs) -> None:  # pylint: disable=unused-argument
+    """
+    Post-save hook for BlacklistedToken (logout and refresh rotation both end up here).
+    """
+    get_revoked_jti_filter().add(instance.token.jti)
+
+
+def bump_users_version(sender, update_fields=None, using=None, **kwargs) -> None:  # pylint: disable=unused-argument
+    """
+    Post-save/post-delete hook for users and profiles: cached exports are stale after commit.
+    """
+    bump_users_version_on_commit(update_fields, using)
+
+
+def revoke_sessions_on_credential_change(sender, instance, update_fields=None, using=None,  # pylint: disable=unused-argument
+                                         **kwargs) -> None:
+    """
+    Pre-save hook for users: bumps the session epoch when a password is set with set_password()
+    (the profile row in the same transaction, the caches after commit) and, with
+    JWT_STATELESS_AUTH, after commit of a change of is_active/is_staff/is_superuser, so the next
+    login reads the new claims.
+    """
+    if instance.pk is None:
+        return
+    # set_password() keeps the raw password until save; a rehash on login does not
+    if instance._password is not None:  # pylint: disable=protected-access
+        bump_session_epoch_on_commit(instance.pk, using=using)
+        return
+    if not is_stateless_auth_enabled():
+        return
+    if update_fields is not None and not set(update_fields) & set(AUTHORIZATION_CLAIMS):
+        return
+    stored = sender.objects.using(using).filter(pk=instance.pk).values(*AUTHORIZATION_CLAIMS).first()
+    if stored is None or all(stored[claim] == getattr(instance, claim) for claim in AUTHORIZATION_CLAIMS):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: bump_session_epoch(pk), using=using)
+
+
 def _table_exists(table_name: str) -> bool:
     with connection.cursor() as cursor:
         return table_name in connection.introspection.table_names(cursor)
@@ -0,0 +1,16 @@
+"""
+Bulk user import/export
+"""
+
+from .codecs import (CSV_CONTENT_TYPE, FILE_FORMATS, NDJSON_CONTENT_TYPE, CsvChunkReader, FileFormat,
+                     NdjsonChunkReader, encode_csv, encode_ndjson, get_file_format)
+from .copy_import import CopyImporter, get_importer
+from .export import EXPORT_COLUMNS, XLSX_CONTENT_TYPE, export_rows, write_xlsx
+from .import_engine import ImportResult, UserImporter
+from .readers import XlsxChunkReader
+from .validation import PreparedChunk, ValidationStage, normalize_frame, prepare_chunk
+
+__all__ = ["CSV_CONTENT_TYPE", "EXPORT_COLUMNS", "FILE_FORMATS", "NDJSON_CONTENT_TYPE", "XLSX_CONTENT_TYPE",
+           "CopyImporter", "CsvChunkReader", "FileFormat", "ImportResult", "NdjsonChunkReader", "PreparedChunk",
+           "UserImporter", "ValidationStage", "XlsxChunkReader", "encode_csv", "encode_ndjson", "export_rows",
+           "get_file_format", "get_importer", "normalize_frame", "prepare_chunk", "write_xlsx"]
@@ -0,0 +1,212 @@
+"""
+Plain-text codecs (CSV and NDJSON) for the user import/export endpoint.
+
+They use the column contract of the xlsx template (EXPORT_COLUMNS) and go through the
+stdlib csv/json modules, which costs much less CPU than building or parsing a ZIP of XML.
+
+  - CsvChunkReader / NdjsonChunkReader read a file line by line and yield DataFrames of at most
+    chunk_size rows, like XlsxChunkReader, so they feed UserImporter directly
+  - encode_csv / encode_ndjson turn export rows into an iterator of byte blocks that can be
+    sent with StreamingHttpResponse (no temporary file)
+  - FILE_FORMATS maps the ?file_format= values to these readers/encoders
+"""
+
+from __future__ import annotations
+import csv
+import io
+import json
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.utils import translation
+import pandas as pd
+from rest_framework.exceptions import ValidationError
+
+from .export import EXPORT_COLUMNS, XLSX_CONTENT_TYPE
+from .readers import XlsxChunkReader, chunk_rows
+
+
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+# Rows encoded per yielded block of a streamed export
+_ROWS_PER_BLOCK = 500
+
+
+def _chunk_size(chunk_size: Optional[int]) -> int:
+    return max(1, int(chunk_size or getattr(settings, "EXCEL_IMPORT_CHUNK_SIZE", 1000)))
+
+
+def _text(file: IO[bytes]) -> io.TextIOWrapper:
+    """
+    Decode the upload as UTF-8 (a leading BOM, as written by Excel, is dropped)
+    """
+    return io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+
+class CsvChunkReader:
+    """
+    Iterate over a CSV file (header row first) as DataFrames of at most chunk_size rows.
+
+    Empty cells become None, like empty xlsx cells. Fully empty rows are skipped. Frames are
+    indexed by line number (the last line of a record with quoted line breaks).
+    """
+
+    def __init__(self, file: IO[bytes], chunk_size: Optional[int] = None) -> None:
+        self.file = file
+        self.chunk_size = _chunk_size(chunk_size)
+        self.rows = 0
+
+    def _frame(self, buffer: list[list[Any]], numbers: list[int], columns: list[str]) -> pd.DataFrame:
+        self.rows += len(buffer)
+        return pd.DataFrame(buffer, columns=columns, index=numbers)
+
+    @staticmethod
+    def _records(rows: Any, width: int) -> Iterator[tuple[int, list[Any]]]:
+        """
+        Non-empty rows padded or cut to width cells, with their line numbers
+        """
+        for row in rows:
+            if not any(cell.strip() for cell in row):
+                continue
+            cells = [cell if cell != "" else None for cell in row[:width]]
+            yield rows.line_num, cells + [None] * (width - len(cells))
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        text = _text(self.file)
+        try:
+            rows = csv.reader(text)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [name.strip() or f"Unnamed: {index}" for index, name in enumerate(header)]
+            for buffer, numbers in chunk_rows(self._records(rows, len(columns)), self.chunk_size):
+                yield self._frame(buffer, numbers, columns)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise ValidationError({"file_input": translation.gettext("The file is not a valid CSV file.")}) from exc
+        finally:
+            text.detach()
+
+
+class NdjsonChunkReader:
+    """
+    Iterate over an NDJSON file (one JSON object per line) as DataFrames of at most chunk_size rows.
+
+    Keys outside the column contract are ignored; blank lines are skipped. Frames are indexed by
+    line number.
+    """
+
+    def __init__(self, file: IO[bytes], chunk_size: Optional[int] = None) -> None:
+        self.file = file
+        self.chunk_size = _chunk_size(chunk_size)
+        self.rows = 0
+
+    def _frame(self, buffer: list[dict[str, Any]], numbers: list[int]) -> pd.DataFrame:
+        self.rows += len(buffer)
+        return pd.DataFrame.from_records(buffer, columns=list(EXPORT_COLUMNS), index=numbers)
+
+    @staticmethod
+    def _records(text: Iterable[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        Objects of the non-blank lines, keys normalized, with their line numbers
+        """
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"line {line_number} is not a JSON object")
+            yield line_number, {str(key).strip().lower(): value for key, value in record.items()}
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        text = _text(self.file)
+        try:
+            for buffer, numbers in chunk_rows(self._records(text), self.chunk_size):
+                yield self._frame(buffer, numbers)
+        except (UnicodeDecodeError, ValueError) as exc:
+            raise ValidationError(
+                {"file_input": translation.gettext("The file is not a valid NDJSON file.")}
+            ) from exc
+        finally:
+            text.detach()
+
+
+def _blocks(lines: Iterable[str]) -> Iterator[bytes]:
+    """
+    Group encoded lines into blocks so the response is not sent one row per write
+    """
+    block: list[str] = []
+    for line in lines:
+        block.append(line)
+        if len(block) >= _ROWS_PER_BLOCK:
+            yield "".join(block).encode("utf-8")
+            block = []
+    if block:
+        yield "".join(block).encode("utf-8")
+
+
+def encode_csv(rows: Iterable[tuple[Any, ...]]) -> Iterator[bytes]:
+    """
+    Header plus rows as CSV, in byte blocks
+    """
+    line = io.StringIO()
+    writer = csv.writer(line, lineterminator="\n")
+
+    def lines() -> Iterator[str]:
+        for row in chain([EXPORT_COLUMNS], rows):
+            writer.writerow(row)
+            yield line.getvalue()
+            line.seek(0)
+            line.truncate()
+
+    yield from _blocks(lines())
+
+
+def encode_ndjson(rows: Iterable[tuple[Any, ...]]) -> Iterator[bytes]:
+    """
+    One JSON object per row, keyed by EXPORT_COLUMNS, in byte blocks
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    yield from _blocks(dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows)
+
+
+@dataclass(frozen=True)
+class FileFormat:
+    """
+    A file format of the import/export endpoint
+    """
+    name: str
+    extension: str
+    content_type: str
+    reader: Callable[..., Iterable[pd.DataFrame]]
+    encoder: Optional[Callable[[Iterable[tuple[Any, ...]]], Iterator[bytes]]] = None
+
+
+FILE_FORMATS: dict[str, FileFormat] = {
+    "xlsx": FileFormat("xlsx", ".xlsx", XLSX_CONTENT_TYPE, XlsxChunkReader),
+    "csv": FileFormat("csv", ".csv", CSV_CONTENT_TYPE, CsvChunkReader, encode_csv),
+    "ndjson": FileFormat("ndjson", ".ndjson", NDJSON_CONTENT_TYPE, NdjsonChunkReader, encode_ndjson),
+}
+_EXTENSIONS = {".xlsx": "xlsx", ".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def get_file_format(name: Optional[str] = None, filename: Optional[str] = None) -> FileFormat:
+    """
+    Resolve the format from an explicit name, else from the file extension; xlsx by default.
+
+    Raises:
+        ValidationError, for an unknown format name
+    """
+    if name:
+        try:
+            return FILE_FORMATS[name.strip().lower()]
+        except KeyError as exc:
+            raise ValidationError(
+                {"file_format": translation.gettext("Unsupported file format. Use one of: %(formats)s.")
+                 % {"formats": ", ".join(FILE_FORMATS)}}
+            ) from exc
+    suffix = Path(filename or "").suffix.lower()
+    return FILE_FORMATS[_EXTENSIONS.get(suffix, "xlsx")]
@@ -0,0 +1,137 @@
+"""
+On-disk cache of generated user exports.
+
+A file is stored under the users-table version (see profiles.users_version) and a key of the
+export parameters (format, filters, search, ordering), so a repeated export of an unchanged
+table is served straight from disk. Files of older versions can never be served again and are
+deleted on the next store; the rest are evicted by age (EXPORT_CACHE_MAX_AGE_SECONDS) and,
+oldest first, by total size (EXPORT_CACHE_MAX_BYTES).
+
+Files are written to a temporary name and renamed into place, so concurrent exports of the same
+key never serve a partial file. Several processes may share the directory.
+"""
+
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Callable, Iterable, Optional
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+_TEMP_PREFIX = ".tmp-"
+
+
+def export_cache_key(file_format: str, params: Iterable[tuple[str, str]]) -> str:
+    """
+    Stable key of an export request: its format and its (sorted) query parameters
+    """
+    canonical = "&".join(f"{name}={value}" for name, value in sorted(params))
+    return hashlib.sha1(f"{file_format}?{canonical}".encode("utf-8")).hexdigest()[:20]
+
+
+class ExportCache:
+    """
+    On-disk cache of generated user exports.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_age_seconds: float) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+
+    @classmethod
+    def from_settings(cls) -> Optional["ExportCache"]:
+        """
+        The cache configured by EXPORT_CACHE_*; None when it is disabled
+        """
+        if not getattr(settings, "EXPORT_CACHE_ENABLED", True):
+            return None
+        directory = getattr(settings, "EXPORT_CACHE_DIR", None) or os.path.join(tempfile.gettempdir(), "user_exports")
+        return cls(directory, int(getattr(settings, "EXPORT_CACHE_MAX_BYTES", 200 * 2 ** 20)),
+                   float(getattr(settings, "EXPORT_CACHE_MAX_AGE_SECONDS", 3600)))
+
+    def _path(self, version: int, key: str, extension: str) -> Path:
+        return self.directory / f"{version}-{key}{extension}"
+
+    def get(self, version: int, key: str, extension: str) -> Optional[Path]:
+        """
+        The cached file, if present and not older than max_age_seconds
+        """
+        path = self._path(version, key, extension)
+        try:
+            if time.time() - path.stat().st_mtime <= self.max_age_seconds:
+                return path
+        except OSError:
+            pass
+        return None
+
+    def store(self, version: int, key: str, extension: str, write: Callable[[IO[bytes]], object]) -> Path:
+        """
+        Generate a file with write(target) and store it, then evict.
+
+        Returns:
+            Path of the stored file
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(version, key, extension)
+        fd, temp_name = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as target:
+                write(target)
+            os.replace(temp_name, path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+        self.evict(current_version=version, keep=path)
+        return path
+
+    def evict(self, current_version: Optional[int] = None, keep: Optional[Path] = None) -> None:
+        """
+        Delete files of other versions, files older than max_age_seconds and, oldest first,
+        files beyond max_bytes in total. keep is never deleted.
+        """
+        now = time.time()
+        entries = []
+        for path in self.directory.iterdir():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.name.startswith(_TEMP_PREFIX):
+                # Leftovers of crashed writers; in-flight ones are younger than an hour
+                if now - stat.st_mtime > 3600:
+                    self._unlink(path)
+                continue
+            version = path.name.split("-", 1)[0]
+            stale = current_version is not None and version != str(current_version)
+            if path != keep and (stale or now - stat.st_mtime > self.max_age_seconds):
+                self._unlink(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                self._unlink(path)
+                total -= size
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        else:
+            logger.debug("Evicted cached export %s", path.name)
@@ -0,0 +1,146 @@
+"""
+Background user imports.
+
+The upload endpoint stores the file in a temporary file, creates an ImportJob row and hands
+the job to a per-process thread pool (IMPORT_JOB_WORKERS threads, no external broker), so the
+HTTP worker is free again right away.
+
+  - While a job runs, its progress (rows, created/updated/skipped/rejected, rows/s) is kept in the
+    shared cache; the import itself is one transaction, so the job row is only written at start and end
+  - errors holds {"row", "msg"} entries: the rejected rows of a succeeded job, or the reason of a
+    failed one (row None)
+  - Concurrent imports are serialized by the import lock (see profiles.user_io.locking)
+  - IMPORT_JOBS_EAGER runs jobs inline in the request (tests, debugging)
+  - Jobs live in the process that accepted them; a job whose process died stays "running"
+"""
+
+from __future__ import annotations
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import UploadedFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from ..models.import_job import ImportJob
+from .codecs import FileFormat, get_file_format
+from .copy_import import get_importer
+from .import_engine import ImportResult
+
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY_PREFIX = "import_job:progress:"
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=max(1, int(getattr(settings, "IMPORT_JOB_WORKERS", 2))),
+                                               thread_name_prefix="user-import")
+    return _EXECUTOR
+
+
+def _progress_key(job_id: Any) -> str:
+    return f"{PROGRESS_KEY_PREFIX}{job_id}"
+
+
+def _error_messages(detail: Any) -> list[str]:
+    """
+    Flatten DRF error details into "field: message" strings
+    """
+    if isinstance(detail, dict):
+        return [f"{field}: {message}" for field, value in detail.items() for message in _error_messages(value)]
+    if isinstance(detail, (list, tuple)):
+        return [message for item in detail for message in _error_messages(item)]
+    return [str(detail)]
+
+
+def get_job_progress(job_id: Any) -> Optional[dict[str, Any]]:
+    """
+    Live counters of a running job, None when the job is not running in any worker
+    """
+    return cache.get(_progress_key(job_id))
+
+
+def run_import_job(job_id: UUID, path: str) -> None:
+    """
+    Import the stored file of a job and record the outcome on the job row
+    """
+    key = _progress_key(job_id)
+    ttl = int(getattr(settings, "IMPORT_JOB_PROGRESS_TTL", 86_400))
+
+    def report(result: ImportResult) -> None:
+        cache.set(key, {"rows_processed": result.rows, "created": result.created, "updated": result.updated,
+                        "skipped": result.skipped, "rejected": result.rejected,
+                        "rows_per_second": round(result.rows_per_second, 1)}, timeout=ttl)
+
+    jobs = ImportJob.objects  # pylint: disable=no-member
+    try:
+        jobs.filter(pk=job_id).update(status=ImportJob.STATUS_RUNNING, started_at=timezone.now())
+        with open(path, "rb") as fh:
+            # The stored file carries the extension of its resolved format
+            result = get_importer(progress=report).run(get_file_format(filename=path).reader(fh))
+        jobs.filter(pk=job_id).update(status=ImportJob.STATUS_SUCCEEDED, rows_processed=result.rows,
+                                      created=result.created, updated=result.updated, skipped=result.skipped,
+                                      rejected=result.rejected, errors=result.errors,
+                                      rows_per_second=round(result.rows_per_second, 1), finished_at=timezone.now())
+    except ValidationError as exc:
+        errors = [{"row": None, "msg": message} for message in _error_messages(exc.detail)]
+        jobs.filter(pk=job_id).update(status=ImportJob.STATUS_FAILED, errors=errors, finished_at=timezone.now())
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.exception("Import job %s failed", job_id)
+        jobs.filter(pk=job_id).update(status=ImportJob.STATUS_FAILED, errors=[{"row": None, "msg": str(exc)}],
+                                      finished_at=timezone.now())
+    finally:
+        cache.delete(key)
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _run_in_worker(job_id: UUID, path: str) -> None:
+    try:
+        run_import_job(job_id, path)
+    finally:
+        close_old_connections()
+
+
+def submit_import_job(upload: UploadedFile, user: Any = None, file_format: Optional[FileFormat] = None) -> ImportJob:
+    """
+    Store the upload and queue its import.
+    file_format defaults to the one matching the upload's extension.
+
+    Returns:
+        ImportJob, still queued unless IMPORT_JOBS_EAGER is set
+    """
+    suffix = (file_format or get_file_format(filename=upload.name)).extension
+    with tempfile.NamedTemporaryFile(prefix="user-import-", suffix=suffix, delete=False) as target:
+        for block in upload.chunks():
+            target.write(block)
+        path = target.name
+
+    job = ImportJob.objects.create(  # pylint: disable=no-member
+        filename=(upload.name or "")[:255],
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+    if getattr(settings, "IMPORT_JOBS_EAGER", False):
+        run_import_job(job.pk, path)
+        job.refresh_from_db()
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_worker, job.pk, path))
+    return job
@@ -0,0 +1,38 @@
+"""
+Lock that keeps two user imports from writing the same users at the same time.
+
+  - PostgreSQL: a transaction-scoped advisory lock (pg_advisory_xact_lock), so imports running
+    in different processes or hosts queue up, and the lock is released with the transaction
+  - Other databases: a process-wide threading lock (SQLite serializes writers anyway)
+
+Imports of disjoint user sets are serialized too; per-user locks are not used because a
+large import would exceed the server's lock table and chunks of two imports could deadlock.
+"""
+
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.db import connections
+
+
+# Arbitrary but stable 64-bit key identifying "user import" among advisory locks
+IMPORT_ADVISORY_LOCK_KEY = 0x75736572696D7074  # b"userimpt"
+
+_process_lock = threading.Lock()
+
+
+@contextmanager
+def import_lock(using: str = "default") -> Iterator[None]:
+    """
+    Hold the import lock for the enclosed block; must run inside transaction.atomic()
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [IMPORT_ADVISORY_LOCK_KEY])
+        yield
+        return
+    with _process_lock:
+        yield
@@ -0,0 +1,73 @@
+"""
+Streaming readers that feed the import engine with fixed-size DataFrame chunks.
+
+XlsxChunkReader opens the workbook in openpyxl read_only mode, which parses the sheet XML
+incrementally, so memory stays bounded by one chunk no matter how many rows the sheet has
+(pd.read_excel would build the whole workbook and DataFrame first).
+"""
+
+from __future__ import annotations
+from typing import IO, Any, Iterable, Iterator, Optional, TypeVar
+
+from django.conf import settings
+import openpyxl
+import pandas as pd
+
+
+Row = TypeVar("Row")
+
+
+def chunk_rows(numbered_rows: Iterable[tuple[int, Row]], chunk_size: int) -> Iterator[tuple[list[Row], list[int]]]:
+    """
+    Group (row number, row) pairs into lists of at most chunk_size rows, with their numbers
+    """
+    buffer: list[Row] = []
+    numbers: list[int] = []
+    for number, row in numbered_rows:
+        buffer.append(row)
+        numbers.append(number)
+        if len(buffer) >= chunk_size:
+            yield buffer, numbers
+            buffer, numbers = [], []
+    if buffer:
+        yield buffer, numbers
+
+
+class XlsxChunkReader:
+    """
+    Iterate over the first worksheet of an xlsx file as DataFrames of at most chunk_size rows.
+
+    The first row is the header. Fully empty rows are skipped. Frames are indexed by sheet row
+    number, so validation errors point at the row a user sees in Excel.
+    """
+
+    def __init__(self, file: IO[bytes], chunk_size: Optional[int] = None) -> None:
+        self.file = file
+        self.chunk_size = max(1, int(chunk_size or getattr(settings, "EXCEL_IMPORT_CHUNK_SIZE", 1000)))
+        self.rows = 0
+
+    @staticmethod
+    def _header(row: tuple[Any, ...]) -> list[str]:
+        return [str(value).strip() if value is not None else f"Unnamed: {index}" for index, value in enumerate(row)]
+
+    def _frame(self, buffer: list[tuple[Any, ...]], numbers: list[int], columns: list[str]) -> pd.DataFrame:
+        width = len(columns)
+        rows = [row[:width] + (None,) * (width - len(row)) for row in buffer]
+        self.rows += len(rows)
+        return pd.DataFrame(rows, columns=columns, index=numbers)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        workbook = openpyxl.load_workbook(self.file, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = self._header(header)
+            # C-level emptiness check: sheets with styled rows at the bottom (e.g. down to row
+            # 1048576) make openpyxl pad every missing row in between
+            numbered = ((number, row) for number, row in enumerate(rows, start=2) if row.count(None) != len(row))
+            for buffer, numbers in chunk_rows(numbered, self.chunk_size):
+                yield self._frame(buffer, numbers, columns)
+        finally:
+            workbook.close()
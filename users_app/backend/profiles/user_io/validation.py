@@ -0,0 +1,210 @@
+"""
+Validation stage of the user import.
+
+Normalizing and validating a chunk (email syntax, username characters, field lengths) is pure
+CPU work on a DataFrame, so it runs in a process pool (EXCEL_IMPORT_VALIDATION_WORKERS processes,
+0 = in the calling thread) ahead of persistence: while one chunk is being written, the next ones
+are validated. Invalid rows never reach the database; each becomes an error entry with its
+source row number.
+
+The workers are spawned, not forked (core.process_pool), and hold no database connection:
+prepare_chunk() must stay free of database and settings access; error codes are turned into
+(translated) messages by the caller.
+"""
+
+from __future__ import annotations
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.utils.translation import gettext
+import pandas as pd
+
+from core.process_pool import init_worker
+
+
+logger = logging.getLogger(__name__)
+
+IMPORT_COLUMNS = ("email", "username", "first_name", "last_name", "is_active", "bio")
+EMAIL_MAX_LENGTH = 254
+NAME_MAX_LENGTH = 150
+# Same characters as django.contrib.auth.validators.UnicodeUsernameValidator
+USERNAME_PATTERN = r"[\w.@+-]+"
+
+_TRUE_STRINGS = {"true", "1", "1.0", "yes", "y", "t"}
+_FALSE_STRINGS = {"false", "0", "0.0", "no", "n", "f"}
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+@dataclass
+class PreparedChunk:
+    """
+    A chunk after the validation stage
+    """
+    rows: int
+    valid: pd.DataFrame
+    errors: list[tuple[int, str, str]] = field(default_factory=list)
+
+
+def _text_column(frame: pd.DataFrame, name: str) -> pd.Series:
+    """
+    Column as stripped strings; missing cells stay <NA>
+    """
+    if name not in frame.columns:
+        return pd.Series(pd.NA, index=frame.index, dtype="string")
+    column = frame[name]
+    if pd.api.types.is_float_dtype(column) or pd.api.types.is_object_dtype(column):
+        # Numeric cells such as usernames 123 may arrive as 123.0
+        column = column.map(lambda v: int(v) if isinstance(v, float) and v.is_integer() else v)
+    return column.astype("string").str.strip()
+
+
+def _bool_column(frame: pd.DataFrame, name: str) -> pd.Series:
+    """
+    Column as booleans; missing cells stay <NA>, unknown non-empty text counts as True
+    """
+    text = _text_column(frame, name).str.lower()
+    result = pd.Series(pd.NA, index=frame.index, dtype="boolean")
+    result[text.isin(_TRUE_STRINGS).fillna(False)] = True
+    result[text.isin(_FALSE_STRINGS).fillna(False)] = False
+    result[result.isna() & text.notna() & (text != "")] = True
+    return result
+
+
+def normalize_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean a chunk of rows column by column.
+
+    Returns:
+        DataFrame with IMPORT_COLUMNS (index kept); rows without email or username are dropped
+    """
+    frame = frame.rename(columns=lambda c: str(c).strip().lower())
+    normalized = pd.DataFrame({
+        "email": _text_column(frame, "email").fillna("").str.lower(),
+        "username": _text_column(frame, "username").fillna(""),
+        "first_name": _text_column(frame, "first_name"),
+        "last_name": _text_column(frame, "last_name"),
+        "is_active": _bool_column(frame, "is_active"),
+        "bio": _text_column(frame, "bio"),
+    }, index=frame.index)
+    return normalized[(normalized["email"] != "") & (normalized["username"] != "")]
+
+
+def _is_valid_email(value: str) -> bool:
+    try:
+        validate_email(value)
+    except DjangoValidationError:
+        return False
+    return True
+
+
+def validate_frame(normalized: pd.DataFrame) -> PreparedChunk:
+    """
+    Split a normalized frame into valid rows and (row, field, code) errors, the first error per row
+    """
+    codes = pd.Series(pd.NA, index=normalized.index, dtype="object")
+    fields = pd.Series(pd.NA, index=normalized.index, dtype="object")
+
+    def flag(mask: pd.Series, name: str, code: str) -> None:
+        mask = mask.fillna(False).astype(bool) & codes.isna()
+        codes[mask] = code
+        fields[mask] = name
+
+    emails = normalized["email"]
+    flag(emails.str.len() > EMAIL_MAX_LENGTH, "email", "max_length")
+    flag(~emails.map(_is_valid_email).astype(bool), "email", "invalid")
+    usernames = normalized["username"]
+    flag(usernames.str.len() > NAME_MAX_LENGTH, "username", "max_length")
+    flag(~usernames.str.fullmatch(USERNAME_PATTERN).fillna(False).astype(bool), "username", "invalid")
+    for name in ("first_name", "last_name"):
+        flag(normalized[name].str.len() > NAME_MAX_LENGTH, name, "max_length")
+
+    invalid = codes.notna()
+    errors = [(int(row), str(fields[row]), str(codes[row])) for row in normalized.index[invalid]]
+    return PreparedChunk(rows=len(normalized), valid=normalized[~invalid], errors=errors)
+
+
+def prepare_chunk(frame: pd.DataFrame) -> PreparedChunk:
+    """
+    Normalize and validate one raw chunk (runs in a worker process).
+    rows counts the raw rows, including the incomplete ones normalize_frame drops.
+    """
+    prepared = validate_frame(normalize_frame(frame))
+    prepared.rows = len(frame)
+    return prepared
+
+
+def error_message(field_name: str, code: str) -> str:
+    """
+    Translated message of a validation error code
+    """
+    if code == "max_length":
+        limit = EMAIL_MAX_LENGTH if field_name == "email" else NAME_MAX_LENGTH
+        return gettext("%(field)s: Ensure this value has at most %(limit)d characters.") % {
+            "field": field_name, "limit": limit}
+    if field_name == "email":
+        return gettext("email: Enter a valid email address.")
+    return gettext("username: Enter a valid username. This value may contain only letters, numbers, "
+                   "and @/./+/-/_ characters.")
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        if _POOL is None or _POOL._max_workers != workers:  # pylint: disable=protected-access
+            if _POOL is not None:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=init_worker)
+        return _POOL
+
+
+def _reset_pool() -> None:
+    global _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        _POOL = None
+
+
+class ValidationStage:
+    """
+    Validation stage of the user import.
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        if workers is None:
+            workers = int(getattr(settings, "EXCEL_IMPORT_VALIDATION_WORKERS", 0))
+        self.workers = max(0, workers)
+
+    def run(self, chunks: Iterable[pd.DataFrame]) -> Iterator[PreparedChunk]:
+        """
+        Prepared chunks in input order; at most 2 * workers chunks are in flight
+        """
+        if self.workers == 0:
+            yield from map(prepare_chunk, chunks)
+            return
+        pool = _get_pool(self.workers)
+        window: deque[Future] = deque()
+        try:
+            for chunk in chunks:
+                window.append(pool.submit(prepare_chunk, chunk))
+                if len(window) >= 2 * self.workers:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+        except BrokenProcessPool:
+            logger.exception("Import validation pool broke; it is recreated for the next import")
+            _reset_pool()
+            raise
+        finally:
+            for future in window:
+                future.cancel()
@@ -0,0 +1,87 @@
+"""
+Version counter of the users table (users and their profiles).
+
+Anything derived from the full user list (the cached export files, their ETags) is keyed by this
+version and is stale as soon as it changes. It is bumped after commit:
+
+  - by signals on User/Profile save and delete (saves that only touch last_login/last_activity
+    are ignored, they do not change exported data)
+  - by bulk writers that bypass signals (the user import)
+
+The counter is a DataVersion row, bumped with one UPDATE ... SET version = version + 1, so
+concurrent bumps never collapse into one whatever the cache backend. Readers go through the
+shared cache (USERS_VERSION_CACHE_SECONDS); a bump publishes its new value there, and an
+out-of-order publish of two concurrent bumps is corrected when the entry expires. The row
+starts at a random value, so a fresh database never reuses the version of files left in the
+export cache by an earlier one.
+"""
+
+from __future__ import annotations
+import secrets
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .models.data_version import DataVersion
+
+
+USERS_VERSION_NAME = "users"
+USERS_VERSION_CACHE_KEY = "users:version"
+
+# Fields whose changes do not affect exported user data
+VOLATILE_FIELDS = frozenset({"last_login", "last_activity", "updated_at"})
+
+
+def _cache_timeout() -> float:
+    return float(getattr(settings, "USERS_VERSION_CACHE_SECONDS", 30))
+
+
+def _stored_version() -> int:
+    row, _ = DataVersion.objects.get_or_create(name=USERS_VERSION_NAME,
+                                               defaults={"version": secrets.randbits(48)})
+    return row.version
+
+
+def get_users_version() -> int:
+    """
+    Current version of the users table
+    """
+    version = cache.get(USERS_VERSION_CACHE_KEY)
+    if version is None:
+        version = _stored_version()
+        cache.add(USERS_VERSION_CACHE_KEY, version, timeout=_cache_timeout())
+    return int(version)
+
+
+def bump_users_version() -> int:
+    """
+    Mark everything derived from the users table as stale.
+
+    Returns:
+        int, the new version
+    """
+    rows = DataVersion.objects.filter(name=USERS_VERSION_NAME)
+    with transaction.atomic():
+        if not rows.update(version=F("version") + 1):
+            _stored_version()
+            rows.update(version=F("version") + 1)
+        # The row stays locked until commit, so this reads this bump's value
+        version = rows.values_list("version", flat=True).get()
+    cache.set(USERS_VERSION_CACHE_KEY, version, timeout=_cache_timeout())
+    return version
+
+
+def bump_users_version_on_commit(update_fields: Optional[Iterable[str]] = None, using: Optional[str] = None) -> None:
+    """
+    Bump the version once the current transaction commits (right away outside a transaction).
+
+    Args:
+        update_fields: the saved fields, if known; saves of VOLATILE_FIELDS only are ignored
+        using (str): database alias of the transaction
+    """
+    if update_fields is not None and set(update_fields) <= VOLATILE_FIELDS:
+        return
+    transaction.on_commit(bump_users_version, using=using)
@@ -0,0 +1,22 @@
+"""
+Admin-only endpoint exposing the in-process cache counters of the worker that serves it.
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from core.revoked_jti_filter import get_revoked_jti_filter
+from core.user_cache import get_user_cache
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def cache_stats(_request) -> Response:
+    """
+    Return hit/miss counters of the caches used on the request path.
+    """
+    return Response({
+        "auth_user": get_user_cache().stats(),
+        "revoked_jti_filter": get_revoked_jti_filter().stats(),
+    })
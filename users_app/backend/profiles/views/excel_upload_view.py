@@ -1,26 +1,39 @@
 """
 DRF endpoint that lets an admin upload an Excel file to bulk create/update users (and their profiles).
+GET streams the users (optionally filtered like the users list) back as an xlsx workbook.
+
+Both directions also speak CSV and NDJSON (same columns, see profiles.user_io.codecs):
+?file_format=xlsx|csv|ndjson; an upload without the parameter is recognized by its extension.
+The parameter is not called "format" because DRF reserves that one for renderer selection.
+
+Generated exports are cached on disk per users-table version and export parameters (see
+profiles.user_io.export_cache); the ETag carries both, so unchanged exports answer 304.
 """
 
+import tempfile
 from datetime import datetime
-from io import BytesIO
 
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponseBase, HttpResponseNotModified, StreamingHttpResponse
 from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.urls import reverse
 from django.utils import translation
-import pandas as pd
-from rest_framework import permissions
-from rest_framework.views import APIView
+from django.utils.http import parse_etags
+from rest_framework import generics, permissions, status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 
-from ..models.profile import Profile
 from ..serializers.user_serializer import UserSerializer
-from ..validators import validate_and_normalize_email
+from ..user_io import FileFormat, export_rows, get_file_format, get_importer, write_xlsx
+from ..user_io.export_cache import ExportCache, export_cache_key
+from ..user_io.jobs import submit_import_job
+from ..users_version import get_users_version
+from .users_view_set import UsersViewSet
 
 
-class ExcelUploadView(APIView):
+class ExcelUploadView(generics.GenericAPIView):
     """
     DRF endpoint that lets an admin upload an Excel file to bulk create/update users (and their profiles).
     """
@@ -28,6 +41,17 @@ class ExcelUploadView(APIView):
     parser_classes = [MultiPartParser]
     serializer_class = UserSerializer
     user = get_user_model()
+    # The export accepts the same filter/search/ordering parameters as the users list
+    filter_backends = UsersViewSet.filter_backends
+    filterset_fields = UsersViewSet.filterset_fields
+    search_fields = UsersViewSet.search_fields
+    ordering_fields = UsersViewSet.ordering_fields
+
+    def get_queryset(self) -> QuerySet["User"]:
+        """
+        Users to export, before filtering
+        """
+        return self.user.objects.order_by("id")
 
     def get_permissions(self) -> list[permissions.BasePermission]:
         """
@@ -37,121 +61,111 @@ class ExcelUploadView(APIView):
         #    return [permissions.AllowAny()]
         return [permissions.IsAuthenticated(), permissions.IsAdminUser()]
 
-    def get(self, request, *args, **kwargs) -> HttpResponse:  # pylint: disable=unused-argument
+    @staticmethod
+    def _write_export(file_format: FileFormat, queryset: QuerySet, target) -> None:
         """
-        Ingest an Excel file and create or update users (and their profiles).
+        Write the export of queryset in file_format to a binary file
+        """
+        rows = export_rows(queryset)
+        if file_format.encoder is None:
+            write_xlsx(rows, target)
+        else:
+            for block in file_format.encoder(rows):
+                target.write(block)
 
-        Returns:
-            Response
+    @staticmethod
+    def _cached_export(cache: ExportCache, version: int, key: str, file_format: FileFormat, queryset: QuerySet):
         """
-        user_model = get_user_model()
-        qs = (
-            user_model.objects.all()
-            .select_related()  # will bring one-to-one (like profile) if declared on User
-            .order_by("id")
-        )
-
-        # Build rows with safe profile access
-        rows = []
-        # If Profile is not reachable as user.profile, adjust accessor below.
-        # e.g. if Profile has FK user=OneToOne(User), Django default accessor is user.profile
-        for u in qs:
+        Open the cached export file, generating it first when it is missing
+        """
+        path = cache.get(version, key, file_format.extension)
+        if path is not None:
             try:
-                p: Profile = u.profile  # adjust if related_name is different
-                bio = getattr(p, "bio", "")
-            except Profile.DoesNotExist:
-                bio = ""
-            except AttributeError:
-                bio = ""
-
-            # Also, "is_active": bool(u.is_active),
-            rows.append({
-                "email": (u.email or "").strip().lower(),
-                "username": u.username or "",
-                "first_name": u.first_name or "",
-                "last_name": u.last_name or "",
-                "bio": bio or "",
-            })
-
-        # Create DataFrame and write to in-memory Excel
-        df = pd.DataFrame(rows, columns=[
-            "email", "username", "first_name", "last_name", "bio"
-        ])
-        buf = BytesIO()
-        # Use openpyxl (installed alongside pandas in many stacks)
-        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="users")
-
-        buf.seek(0)
+                return open(path, "rb")  # pylint: disable=consider-using-with
+            except OSError:
+                pass  # evicted meanwhile
+        path = cache.store(version, key, file_format.extension,
+                           lambda target: ExcelUploadView._write_export(file_format, queryset, target))
+        return open(path, "rb")  # pylint: disable=consider-using-with
+
+    def get(self, request, *args, **kwargs) -> HttpResponseBase:  # pylint: disable=unused-argument
+        """
+        Export users (and their profile bio) as an xlsx workbook in the import template layout,
+        or as CSV / NDJSON with ?file_format=.
+
+        Accepts the filter/search/ordering query parameters of the users list. The response has
+        an ETag of the users-table version; If-None-Match with it answers 304.
+
+        Returns:
+            FileResponse, StreamingHttpResponse or HttpResponseNotModified
+        """
+        file_format = get_file_format(request.query_params.get("file_format") or "xlsx")
+        version = get_users_version()
+        key = export_cache_key(file_format.name,
+                               [(name, value) for name, values in request.query_params.lists() for value in values])
+        etag = f'"users-{version}-{key}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        queryset = self.filter_queryset(self.get_queryset())
         ts = datetime.now().strftime("%Y%m%d_%H%M%S.%f")
-        filename = f"users_{ts}.xlsx"
+        filename = f"users_{ts}{file_format.extension}"
+        cache = ExportCache.from_settings()
+        if cache is not None:
+            response = FileResponse(self._cached_export(cache, version, key, file_format, queryset),
+                                    as_attachment=True, filename=filename, content_type=file_format.content_type)
+        elif file_format.encoder is not None:
+            # Text formats are encoded while the rows are streamed; nothing is buffered on disk
+            response = StreamingHttpResponse(file_format.encoder(export_rows(queryset)),
+                                             content_type=file_format.content_type)
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        else:
+            target = tempfile.TemporaryFile()  # pylint: disable=consider-using-with
+            try:
+                self._write_export(file_format, queryset, target)
+            except Exception:
+                target.close()
+                raise
+            target.seek(0)
+            # FileResponse streams the file in blocks and closes it when done
+            response = FileResponse(target, as_attachment=True, filename=filename,
+                                    content_type=file_format.content_type)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
-        resp = HttpResponse(
-            buf.read(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-        )
-        resp["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return resp
+    @staticmethod
+    def _run_in_background(request) -> bool:
+        """
+        Whether the upload should be imported by a background job
+        """
+        requested = request.query_params.get("async")
+        if requested is not None:
+            return requested.lower() in ("1", "true", "yes")
+        return bool(getattr(settings, "EXCEL_IMPORT_ASYNC", False))
 
-    def post(self, request, *args, **kwargs) -> Response:  # pylint: disable=unused-argument,too-many-locals,too-many-branches
+    def post(self, request, *args, **kwargs) -> Response:  # pylint: disable=unused-argument
         """
-        Ingest an Excel file and create or update users (and their profiles).
+        Ingest an Excel (or CSV / NDJSON) file and create or update users (and their profiles).
+
+        With ?async=1 (or EXCEL_IMPORT_ASYNC) the file is imported by a background job:
+        the response is 202 with the job id, progress is at /api/v1/import-jobs/<id>/.
 
         Returns:
             Response
         """
-        user_model = get_user_model()
         file = request.FILES.get("file")
         if not file:
             raise ValidationError(
                 {"file_input": translation.gettext("No file provided")}
             )
-        df = pd.read_excel(file)
-        created, updated, processed = 0, 0, 0
-        for _, row in df.iterrows():
-            # Some fields are located in the User model, and the rest of them in the Profile model
-            user_updated = False
-            profile_changed = False
-            username_cell = row.get("username")
-            email_cell = str(row.get("email", "")).strip().lower()
-            first_name_cell = row.get("first_name")
-            last_name_cell = row.get("last_name")
-            is_active_cell = row.get("is_active")
-            if not email_cell or not username_cell:
-                continue
-            validate_and_normalize_email(email_cell, exists=False)
-            user, was_created = user_model.objects.get_or_create(email=email_cell, defaults={
-                "username": row.get("username") or email_cell.split('@', maxsplit=1)[0],
-                "first_name": row.get("first_name", ""),
-                "last_name": row.get("last_name", ""),
-                "is_active": row.get("is_active", True),
-            })
-            if not was_created:
-                if pd.notna(username_cell) and user.username != username_cell:
-                    user.username = username_cell
-                    user_updated = True
-                if pd.notna(first_name_cell) and user.first_name != first_name_cell:
-                    user.first_name = first_name_cell
-                    user_updated = True
-                if pd.notna(last_name_cell) and user.last_name != last_name_cell:
-                    user.last_name = last_name_cell
-                    user_updated = True
-                if pd.notna(is_active_cell) and user.is_active != is_active_cell:
-                    user.is_active = bool(is_active_cell)
-                    user_updated = True
-                user.save()
-            else:
-                created += 1
-            profile, _ = Profile.objects.get_or_create(user=user)
-            bio_cell = row.get("bio")
-            if pd.notna(bio_cell):
-                if profile.bio != bio_cell:
-                    profile.bio = bio_cell
-                    profile_changed = True
-            if profile_changed:
-                profile.save()
-            if not was_created and (user_updated or profile_changed):
-                updated += 1
-        processed = created + updated
-        return Response({"created": created, "updated": updated, "processed": processed})
+        file_format = get_file_format(request.query_params.get("file_format"), file.name)
+        if self._run_in_background(request):
+            job = submit_import_job(file, request.user, file_format)
+            status_url = request.build_absolute_uri(reverse("import-job-status", args=[job.pk]))
+            return Response({"job_id": str(job.pk), "status": job.status, "status_url": status_url},
+                            status=status.HTTP_202_ACCEPTED)
+        result = get_importer().run(file_format.reader(file))
+        return Response(result.as_response())
@@ -0,0 +1,23 @@
+"""
+Admin-only status endpoint of a background user import job.
+"""
+
+from django.db.models import QuerySet
+from rest_framework import generics, permissions
+
+from ..models.import_job import ImportJob
+from ..serializers.import_job_serializer import ImportJobSerializer
+
+
+class ImportJobStatusView(generics.RetrieveAPIView):
+    """
+    Admin-only status endpoint of a background user import job.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = ImportJobSerializer
+
+    def get_queryset(self) -> QuerySet[ImportJob]:
+        """
+        All import jobs
+        """
+        return ImportJob.objects.all()  # pylint: disable=no-member
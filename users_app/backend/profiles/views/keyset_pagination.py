@@ -0,0 +1,197 @@
+"""
+Keyset (cursor) pagination for list endpoints ordered by OrderingFilter.
+
+Instead of OFFSET + COUNT(*), each page is fetched with a WHERE clause that continues after
+the last row of the previous page, so deep pages cost the same as the first one.
+
+  - Works with any ordering built from concrete, non-null model fields (OrderingFilter output);
+    "id" is always appended as the tiebreaker so the order is total
+  - The cursor is an opaque base64 token holding the boundary row values, the direction and
+    the ordering it was issued for; a cursor used with a different ordering is rejected
+  - Clients opt in with ?pagination=cursor (first page) and then follow next/previous links
+"""
+
+from __future__ import annotations
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Any, Optional
+
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):  # pylint: disable=abstract-method
+    """
+    Keyset (cursor) pagination for list endpoints ordered by OrderingFilter.
+    """
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 2000
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    tiebreaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self) -> None:
+        self.request: Optional[Request] = None
+        self.ordering: list[str] = []
+        self.page: list[Any] = []
+        self.has_next = False
+        self.has_previous = False
+
+    @classmethod
+    def requested(cls, request: Optional[Request]) -> bool:
+        """
+        Whether the client opted in to cursor pagination
+        """
+        if request is None:
+            return False
+        params = request.query_params
+        return cls.cursor_query_param in params or params.get(cls.mode_query_param) == "cursor"
+
+    def get_page_size(self, request: Request) -> int:
+        """
+        Requested page size, clamped to max_page_size
+        """
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return min(max(1, size), self.max_page_size)
+
+    def _ordering(self, queryset: QuerySet) -> list[str]:
+        terms = [term for term in (queryset.query.order_by or queryset.model._meta.ordering)  # pylint: disable=protected-access
+                 if isinstance(term, str)]
+        ordering: list[str] = []
+        for term in terms:
+            name = term.lstrip("-")
+            if name == "pk":
+                term, name = term.replace("pk", self.tiebreaker), self.tiebreaker
+            ordering.append(term)
+            if name == self.tiebreaker:
+                break  # the tiebreaker is unique, later terms never matter
+        else:
+            ordering.append(self.tiebreaker)
+        return ordering
+
+    @staticmethod
+    def _plain(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            # Full precision (DjangoJSONEncoder drops microseconds); the field parses it back in the lookup
+            return value.isoformat()
+        return value
+
+    def _encode(self, values: list[Any], reverse: bool) -> str:
+        payload = json.dumps({"o": self.ordering, "v": [self._plain(v) for v in values], "r": reverse},
+                             separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def _decode(self, raw: Optional[str]) -> Optional[dict[str, Any]]:
+        if not raw:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(raw.encode("ascii")).decode("utf-8"))
+        except (binascii.Error, UnicodeError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        if (not isinstance(data, dict) or data.get("o") != self.ordering
+                or not isinstance(data.get("v"), list) or len(data["v"]) != len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        return data
+
+    def _boundary(self, values: list[Any], reverse: bool) -> Q:
+        """
+        Rows strictly after `values` in the (possibly reversed) ordering:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+        """
+        condition = Q()
+        equal: dict[str, Any] = {}
+        for term, value in zip(self.ordering, values):
+            name = term.lstrip("-")
+            ascending = not term.startswith("-")
+            lookup = "gt" if ascending != reverse else "lt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def _values(self, row: Any) -> list[Any]:
+        return [attrgetter(term.lstrip("-").replace("__", "."))(row) for term in self.ordering]
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> list[Any]:
+        """
+        Return one page after (or before) the cursor position
+        """
+        self.request = request
+        self.ordering = self._ordering(queryset)
+        size = self.get_page_size(request)
+        cursor = self._decode(request.query_params.get(self.cursor_query_param))
+        reverse = bool(cursor and cursor.get("r"))
+
+        if reverse:
+            queryset = queryset.order_by(*[t[1:] if t.startswith("-") else f"-{t}" for t in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self._boundary(cursor["v"], reverse))
+
+        rows = list(queryset[:size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = bool(rows), has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None and bool(rows)
+        self.page = rows
+        return rows
+
+    def _link(self, values: list[Any], reverse: bool) -> str:
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        url = replace_query_param(url, self.mode_query_param, "cursor")
+        return replace_query_param(url, self.cursor_query_param, self._encode(values, reverse))
+
+    def get_next_link(self) -> Optional[str]:
+        """
+        Link to the page after the last row
+        """
+        if not self.has_next:
+            return None
+        return self._link(self._values(self.page[-1]), reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        """
+        Link to the page before the first row
+        """
+        if not self.has_previous:
+            return None
+        return self._link(self._values(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """
+        {"next", "previous", "results"}; there is no count in this mode
+        """
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """
+        OpenAPI schema of the paginated response
+        """
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -3,11 +3,9 @@ JWTs are stateless, so there is no server-side session to destroy.
 We invalidate the current ACCESS token by denylisting its JTI.
 """
 
-import time
 import logging
 from datetime import datetime, timezone as dt_timezone
 
-from django.core.cache import cache
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
@@ -15,9 +13,11 @@ from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
 
+from core.jwt_authentication import denylist_jti
+from core.revoked_jti_filter import get_revoked_jti_filter
+
 
 logger = logging.getLogger(__name__)
-BLACKLIST_PREFIX = "jwt:bl:"
 
 
 class LogoutView(APIView):
@@ -42,9 +42,10 @@ class LogoutView(APIView):
         if not (jti and exp):
             raise ValidationError({"details": "Invalid token"})
 
-        # Always denylist in cache (fast + no DB dependency)
-        ttl = max(0, int(exp) - int(time.time()))
-        cache.set(f"{BLACKLIST_PREFIX}{jti}", 1, timeout=ttl)
+        # Always denylist in the shared cache (fast + no DB dependency), visible to every worker
+        denylist_jti(jti, exp)
+        # Make this worker's revoked JTI filter route the token to the cache/DB check right away
+        get_revoked_jti_filter().add(jti)
 
         # DB blacklist (prevents multi-worker issues, if tables exist)
         try:
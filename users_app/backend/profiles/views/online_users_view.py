@@ -1,13 +1,20 @@
 """
 Shows the list of users who have been active in the last 5 minutes.
+
+The list is served from the cache-backed presence store (profiles.presence); the database
+is only asked for the users of the page being returned.
 """
 
 from django.db.models import QuerySet
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework import permissions, generics
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from ..presence import get_presence_store, is_presence_enabled
 from ..serializers.user_serializer import UserSerializer
+from .optional_page_number_pagination import OptionalPageNumberPagination
 
 
 class OnlineUsersView(generics.ListAPIView):
@@ -16,11 +23,43 @@ class OnlineUsersView(generics.ListAPIView):
     """
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = OptionalPageNumberPagination
     user = get_user_model()
 
     def get_queryset(self) -> QuerySet["User"]:
         """
         Read-only DRF endpoint that returns the list of users who have been active in the last 5 minutes.
+        Used when the presence store is disabled.
         """
         cutoff = timezone.now() - timezone.timedelta(minutes=5)
         return self.user.objects.filter(profile__last_activity__gte=cutoff).order_by("-profile__last_activity")
+
+    def _hydrate(self, user_ids: list[int]) -> list:
+        """
+        Load the given users in one query, keeping the order of user_ids
+        """
+        by_id = self.user.objects.in_bulk(user_ids)
+        return [by_id[user_id] for user_id in user_ids if user_id in by_id]
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Online users, most recently seen first.
+
+        Query params:
+            count_only: return {"count": N} without touching the database
+            page / page_size: return a paginated envelope instead of a plain list
+        """
+        count_only = request.query_params.get("count_only", "").lower() in ("1", "true", "yes")
+        if not is_presence_enabled():
+            if count_only:
+                return Response({"count": self.get_queryset().count()})
+            return super().list(request, *args, **kwargs)
+
+        user_ids = [user_id for user_id, _ in get_presence_store().online()]
+        if count_only:
+            return Response({"count": len(user_ids)})
+
+        page = self.paginate_queryset(user_ids)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(self._hydrate(page), many=True).data)
+        return Response(self.get_serializer(self._hydrate(user_ids), many=True).data)
@@ -0,0 +1,26 @@
+"""
+Page-number pagination that only applies when the client asks for a page.
+"""
+
+from typing import Any, Optional
+
+from rest_framework.request import Request
+
+from .standard_results_set_pagination import StandardResultsSetPagination
+
+
+class OptionalPageNumberPagination(StandardResultsSetPagination):
+    """
+    Page-number pagination that only applies when the client asks for a page.
+
+    Without ?page= or ?page_size= the endpoint keeps returning a plain list.
+    """
+
+    def paginate_queryset(self, queryset, request: Request, view: Any = None) -> Optional[list]:
+        """
+        Paginate only when a page or page size was requested
+        """
+        params = request.query_params
+        if self.page_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
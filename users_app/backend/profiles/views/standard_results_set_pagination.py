@@ -1,8 +1,37 @@
 """
 Django REST Framework pagination class that controls how list endpoints return results.
+
+The total count follows a count strategy (PAGINATION_COUNT_STRATEGY, or ?count= per request):
+  - "exact" (default): COUNT(*) over the filtered queryset, as DRF does
+  - "estimated": a cheap planner estimate (see profiles.row_counts), flagged with "count_is_estimate"
+  - "none": no count at all; the page is fetched with one extra row to know whether a next page exists
 """
 
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from django.conf import settings
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from ..row_counts import estimate_count
+
+
+COUNT_STRATEGIES = ("exact", "estimated", "none")
+
+
+@dataclass(frozen=True)
+class _PageWindow:
+    """
+    Page served without an exact count
+    """
+    number: int
+    has_next: bool
+    count: Optional[int]
+    count_is_estimate: bool
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -11,4 +40,94 @@ class StandardResultsSetPagination(PageNumberPagination):
     """
     page_size = 5
     page_size_query_param = "page_size"
+    count_query_param = "count"
     # max_page_size = 2000
+
+    def __init__(self) -> None:
+        self.request: Optional[Request] = None
+        self.count_strategy = "exact"
+        self.window: Optional[_PageWindow] = None
+
+    def get_count_strategy(self, request: Request) -> str:
+        """
+        Count strategy requested by the client, else the configured default
+        """
+        requested = request.query_params.get(self.count_query_param, "").strip().lower()
+        if requested in COUNT_STRATEGIES:
+            return requested
+        configured = str(getattr(settings, "PAGINATION_COUNT_STRATEGY", "exact")).lower()
+        return configured if configured in COUNT_STRATEGIES else "exact"
+
+    def paginate_queryset(self, queryset, request: Request, view: Any = None) -> Optional[list]:
+        """
+        Paginate with the exact DRF behaviour, or without an exact COUNT(*)
+        """
+        self.count_strategy = self.get_count_strategy(request)
+        self.window = None
+        if self.count_strategy == "exact":
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except (TypeError, ValueError) as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=request.query_params.get(
+                self.page_query_param), message="That page number is not an integer")) from exc
+        if number < 1:
+            raise NotFound(self.invalid_page_message.format(page_number=number,
+                                                            message="That page number is less than 1"))
+
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if number > 1 and not rows:
+            raise NotFound(self.invalid_page_message.format(page_number=number,
+                                                            message="That page contains no results"))
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        count, is_estimate = None, False
+        if self.count_strategy == "estimated":
+            count, is_estimate = estimate_count(queryset)
+            # Never report fewer rows than have demonstrably been seen
+            count = max(count, offset + len(rows) + (1 if has_next else 0))
+        self.window = _PageWindow(number, has_next, count, is_estimate)
+        return rows
+
+    def get_next_link(self) -> Optional[str]:
+        """
+        Link to the next page
+        """
+        if self.window is None:
+            return super().get_next_link()
+        if not self.window.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.window.number + 1)
+
+    def get_previous_link(self) -> Optional[str]:
+        """
+        Link to the previous page
+        """
+        if self.window is None:
+            return super().get_previous_link()
+        if self.window.number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.window.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.window.number - 1)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """
+        count/next/previous/results; "count" is omitted for the "none" strategy
+        """
+        if self.window is None:
+            return super().get_paginated_response(data)
+        body: dict[str, Any] = {}
+        if self.window.count is not None:
+            body["count"] = self.window.count
+            body["count_is_estimate"] = self.window.count_is_estimate
+        body.update({"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data})
+        return Response(body)
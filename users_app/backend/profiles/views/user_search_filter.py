@@ -0,0 +1,97 @@
+"""
+DRF search backend for the users list that uses the database's search index
+(see migration 0013_user_search_index).
+
+  - PostgreSQL: the usual OR'ed icontains clauses, which are now served by the pg_trgm GIN
+    indexes on UPPER(column); results are ranked by trigram word similarity
+  - SQLite: an FTS5 trigram MATCH against profiles_user_search, ranked by bm25
+  - Terms shorter than 3 characters (too short for trigrams) and databases without an index
+    use the stock SearchFilter behaviour
+
+Relevance ordering is applied only when the client did not ask for an ordering and did not
+opt in to keyset pagination (which needs a column ordering).
+"""
+
+from typing import Any
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, QuerySet
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.request import Request
+
+from .keyset_pagination import KeysetPagination
+
+
+SQLITE_SEARCH_TABLE = "profiles_user_search"
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+_sqlite_index_present: dict[str, bool] = {}
+
+
+class UserSearchFilter(SearchFilter):
+    """
+    DRF search backend for the users list that uses the database's search index.
+    """
+
+    @staticmethod
+    def _sqlite_index_available(alias: str) -> bool:
+        """
+        Whether the FTS5 table exists in this database (checked once per process)
+        """
+        if alias not in _sqlite_index_present:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                               [SQLITE_SEARCH_TABLE])
+                _sqlite_index_present[alias] = cursor.fetchone() is not None
+        return _sqlite_index_present[alias]
+
+    @staticmethod
+    def _rank_requested(request: Request, view: Any) -> bool:
+        ordering_param = getattr(view, "ordering_param", None) or OrderingFilter.ordering_param
+        return ordering_param not in request.query_params and not KeysetPagination.requested(request)
+
+    @staticmethod
+    def _fts_match(terms: list[str]) -> str:
+        """
+        Every term must appear (as a substring) in some column: "t1" AND "t2"
+        """
+        phrases = [term.replace('"', '""') for term in terms]
+        return " AND ".join(f'"{phrase}"' for phrase in phrases)
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: Any) -> QuerySet:
+        """
+        Filter (and rank) the queryset by the search terms
+        """
+        terms = self.get_search_terms(request)
+        search_fields = self.get_search_fields(view, request)
+        if not terms or not search_fields:
+            return queryset
+        if any(len(term) < MIN_TRIGRAM_TERM_LENGTH for term in terms):
+            return super().filter_queryset(request, queryset, view)
+
+        vendor = connections[queryset.db].vendor
+        if vendor == "sqlite" and self._sqlite_index_available(queryset.db):
+            return self._filter_sqlite(request, queryset, view, terms)
+
+        queryset = super().filter_queryset(request, queryset, view)
+        if vendor == "postgresql" and self._rank_requested(request, view):
+            fields = [field.lstrip("^=@$") for field in search_fields]
+            rank = sum((Greatest(*[TrigramWordSimilarity(term, F(field)) for field in fields])
+                        for term in terms[1:]),
+                       Greatest(*[TrigramWordSimilarity(terms[0], F(field)) for field in fields]))
+            queryset = queryset.annotate(search_rank=rank).order_by("-search_rank", "id")
+        return queryset
+
+    def _filter_sqlite(self, request: Request, queryset: QuerySet, view: Any, terms: list[str]) -> QuerySet:
+        table = queryset.model._meta.db_table  # pylint: disable=protected-access
+        match = self._fts_match(terms)
+        queryset = queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH %s", [match]))
+        if self._rank_requested(request, view):
+            rank = RawSQL(f"SELECT bm25({SQLITE_SEARCH_TABLE}) FROM {SQLITE_SEARCH_TABLE} "
+                          f"WHERE {SQLITE_SEARCH_TABLE} MATCH %s AND rowid = \"{table}\".\"id\"", [match])
+            queryset = queryset.annotate(search_rank=rank).order_by("search_rank", "id")
+        return queryset
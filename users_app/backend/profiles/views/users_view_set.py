@@ -13,27 +13,45 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 
+from core.session_epochs import bump_session_epoch
+from .keyset_pagination import KeysetPagination
 from .standard_results_set_pagination import StandardResultsSetPagination
+from .user_search_filter import UserSearchFilter
 from ..serializers.user_serializer import UserSerializer
 from ..serializers.change_password_serializer import ChangePasswordSerializer
+from ..serializers.email_or_user_token_create_serializer import EmailOrUsernameTokenCreateSerializer
 
 
 class UsersViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Read-only DRF viewset that lets admins list and view Django users with pagination,
     filtering, sorting, and search.
+
+    Page-number pagination by default; ?pagination=cursor switches to keyset pagination.
     """
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, UserSearchFilter]
     filterset_fields = ["is_active", "date_joined"]
     search_fields = ["username", "email", "first_name", "last_name"]
     ordering_fields = ["id", "username", "email", "first_name", "last_name", "date_joined"]
 
+    @property
+    def paginator(self):
+        """
+        Keyset paginator when the client opted in, the page-number one otherwise
+        """
+        if not hasattr(self, "_paginator"):
+            if KeysetPagination.requested(getattr(self, "request", None)):
+                self._paginator = KeysetPagination()  # pylint: disable=attribute-defined-outside-init
+            else:
+                self._paginator = self.pagination_class()  # pylint: disable=attribute-defined-outside-init
+        return self._paginator
+
     def get_queryset(self) -> QuerySet["User"]:
         """
         Get queryset
@@ -119,6 +137,22 @@ class UsersViewSet(viewsets.ReadOnlyModelViewSet):
                 {"non_field_errors": ["Database error while applying changes."]}
             ) from ex
 
+        # Saving the new password ends every session of the user (see core.session_epochs)
         user.set_password(new_pw)
         user.save(update_fields=["password"])
-        return Response({"detail": translation.gettext("Password updated.")}, status=status.HTTP_200_OK)
+        data = {"detail": translation.gettext("Password updated.")}
+        if request.user.pk == user.pk:
+            # Keep the caller signed in with a new session
+            data.update(EmailOrUsernameTokenCreateSerializer.issue_tokens(user))
+        return Response(data, status=status.HTTP_200_OK)
+
+    # POST /users/<id>/logout-everywhere/
+    @action(detail=True, methods=["post"], url_path="logout-everywhere",
+            permission_classes=[permissions.IsAdminUser])
+    def logout_everywhere(self, request, pk=None) -> Response:  # pylint: disable=unused-argument
+        """
+        Revoke every access and refresh token of a user
+        """
+        user = self.get_object()
+        bump_session_epoch(user.pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,35 @@
+"""
+Query-count guards for tests.
+
+QueryBudgetMixin.assertMaxQueries() fails when a block runs more SQL queries than its budget
+and lists the queries it saw, so N+1 regressions show up as test failures:
+
+    class MyTests(QueryBudgetMixin, APITestCase):
+        def test_list(self):
+            with self.assertMaxQueries(3):
+                self.client.get("/api/v1/users/")
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    Adds assertMaxQueries() to a TestCase
+    """
+
+    @contextmanager
+    def assertMaxQueries(self, budget: int, using: str = "default") -> Iterator[CaptureQueriesContext]:  # pylint: disable=invalid-name
+        """
+        Fail if the block runs more than `budget` queries on the given database
+        """
+        with CaptureQueriesContext(connections[using]) as ctx:
+            yield ctx
+        executed = len(ctx.captured_queries)
+        if executed > budget:
+            listing = "\n".join(f"{i}. {q['sql']}" for i, q in enumerate(ctx.captured_queries, start=1))
+            self.fail(f"{executed} queries executed, budget is {budget}:\n{listing}")  # pylint: disable=no-member
@@ -0,0 +1,93 @@
+"""
+Unit tests
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from profiles.models.app_settings import (
+    AppSetting,
+    IDLE_TIMEOUT_SECONDS_KEY,
+    SETTINGS_VERSION_CACHE_KEY,
+    bump_auth_settings_version,
+    get_effective_auth_settings,
+)
+
+
+class EffectiveAuthSettingsSnapshotTests(TestCase):
+    """
+    Process-local snapshot of the effective auth settings
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        bump_auth_settings_version()
+
+    def tearDown(self) -> None:
+        """
+        Do not leak this test's overrides into other tests through the snapshot
+        """
+        bump_auth_settings_version()
+
+    def test_loaded_with_one_query_then_served_from_snapshot(self) -> None:
+        """
+        One query for all four keys, none while the snapshot is current
+        """
+        with self.assertNumQueries(1):
+            get_effective_auth_settings()
+        with self.assertNumQueries(0):
+            get_effective_auth_settings()
+
+    @override_settings(APP_SETTINGS_CACHE_TTL=0)
+    def test_ttl_bounds_snapshot_age(self) -> None:
+        """
+        An expired snapshot is reloaded even without a version bump
+        """
+        get_effective_auth_settings()
+        AppSetting.objects.create(key=IDLE_TIMEOUT_SECONDS_KEY, value="777")
+        self.assertEqual(get_effective_auth_settings().idle_timeout_seconds, 777)
+
+    def _bump_in_other_worker(self) -> None:
+        AppSetting.objects.create(key=IDLE_TIMEOUT_SECONDS_KEY, value="777")
+        cache.set(SETTINGS_VERSION_CACHE_KEY, cache.get(SETTINGS_VERSION_CACHE_KEY, 0) + 1, timeout=None)
+
+    @override_settings(APP_SETTINGS_VERSION_CHECK_SECONDS=60)
+    def test_version_key_read_at_most_once_per_interval(self) -> None:
+        """
+        Between version checks the snapshot is served without touching the shared cache
+        """
+        before = get_effective_auth_settings().idle_timeout_seconds
+        self._bump_in_other_worker()
+        self.assertEqual(get_effective_auth_settings().idle_timeout_seconds, before)
+
+    @override_settings(APP_SETTINGS_VERSION_CHECK_SECONDS=0)
+    def test_version_change_in_other_worker_is_seen(self) -> None:
+        """
+        Once the check interval has passed, a new version reloads the snapshot
+        """
+        get_effective_auth_settings()
+        self._bump_in_other_worker()
+        self.assertEqual(get_effective_auth_settings().idle_timeout_seconds, 777)
+
+    def test_settings_update_bumps_version(self) -> None:
+        """
+        Saving settings through the API is visible on the next read
+        """
+        admin = get_user_model().objects.create_user(username="admin", email="admin@example.com",
+                                                     password="Passw0rd!123", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        self.assertEqual(get_effective_auth_settings().idle_timeout_seconds,
+                         client.get("/api/v1/system/settings/").json()[IDLE_TIMEOUT_SECONDS_KEY])
+        resp = client.put("/api/v1/system/settings/", {
+            "JWT_RENEW_AT_SECONDS": 100,
+            "IDLE_TIMEOUT_SECONDS": 600,
+            "ACCESS_TOKEN_LIFETIME": 300,
+            "ROTATE_REFRESH_TOKENS": True,
+        }, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        self.assertEqual(get_effective_auth_settings().idle_timeout_seconds, 600)
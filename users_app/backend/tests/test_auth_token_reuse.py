@@ -0,0 +1,54 @@
+"""
+Unit tests
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tests.auth_client import AuthClientMixin
+
+
+
+class TokenValidatedOnceTests(AuthClientMixin, APITestCase):
+    """
+    The bearer token is validated once per request
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.user = self.create_user("once")
+        self.tokens = self.login(self.user)
+
+    def test_single_denylist_lookup_per_request(self) -> None:
+        """
+        Middleware and DRF share one validation, so the denylist is queried once
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/v1/users/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        lookups = [q for q in ctx.captured_queries if "token_blacklist_blacklistedtoken" in q["sql"]]
+        self.assertLessEqual(len(lookups), 1)
+
+    def test_invalid_token_still_rejected(self) -> None:
+        """
+        A failed validation is reused as a failure, not skipped
+        """
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-jwt")
+        resp = self.client.get("/api/v1/users/")
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_benchmark_command_runs(self) -> None:
+        """
+        Smoke test of the auth benchmark
+        """
+        out = StringIO()
+        call_command("benchmark_auth", "--iterations", "3", stdout=out)
+        self.assertIn("before", out.getvalue())
+        self.assertIn("after", out.getvalue())
@@ -0,0 +1,95 @@
+"""
+Unit tests
+"""
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from profiles.benchmarking import compare_to_baseline
+from tests.test_excel_import import make_workbook, template_rows
+
+
+class CompareToBaselineTests(SimpleTestCase):
+    """
+    Regression check against stored benchmark results
+    """
+    baseline = [{"label": "a", "wall_seconds": 1.0, "queries": 5, "peak_memory_bytes": 1000},
+                {"label": "b", "wall_seconds": 1.0, "queries": 0, "peak_memory_bytes": None}]
+
+    def test_within_threshold(self) -> None:
+        """
+        Growth up to the threshold, improvements and unknown labels pass
+        """
+        results = [{"label": "a", "wall_seconds": 1.19, "queries": 5, "peak_memory_bytes": 500},
+                   {"label": "c", "wall_seconds": 99.0, "queries": 99, "peak_memory_bytes": 99}]
+        self.assertEqual(compare_to_baseline(results, self.baseline, 0.2), [])
+
+    def test_reports_each_regressed_metric(self) -> None:
+        """
+        Every metric beyond the threshold is reported, including queries growing from zero
+        """
+        results = [{"label": "a", "wall_seconds": 1.5, "queries": 7, "peak_memory_bytes": 1000},
+                   {"label": "b", "wall_seconds": 1.0, "queries": 1, "peak_memory_bytes": 10}]
+        regressions = compare_to_baseline(results, self.baseline, 0.2)
+        self.assertEqual([message.split(" ")[:2] for message in regressions],
+                         [["a:", "wall_seconds"], ["a:", "queries"], ["b:", "queries"]])
+
+
+class BenchmarkImportExportCommandTests(TestCase):
+    """
+    benchmark_import_export management command
+    """
+    def _run(self, *args: str) -> tuple[dict, str]:
+        # A generated 16-user workbook: the shipped templates carry styled rows down to row 1048576,
+        # which makes every pass (and tracemalloc in particular) slow
+        with tempfile.TemporaryDirectory() as tmp:
+            workbook = Path(tmp) / "users_16.xlsx"
+            workbook.write_bytes(make_workbook(template_rows(16)).getvalue())
+            output = Path(tmp) / "results.json"
+            out = StringIO()
+            call_command("benchmark_import_export", "--current-db", "--workbook", str(workbook),
+                         "--output", str(output), *args, stdout=out)
+            return json.loads(output.read_text(encoding="utf-8")), out.getvalue()
+
+    def test_writes_results_and_leaves_no_data(self) -> None:
+        """
+        Import, re-import and export are measured; every scenario is rolled back
+        """
+        users_before = get_user_model().objects.count()
+        data, _ = self._run()
+        results = {entry["scenario"]: entry for entry in data["results"]}
+        self.assertEqual(set(results), {"import", "reimport", "export"})
+        for entry in results.values():
+            self.assertEqual(entry["rows"], 16)
+            self.assertGreater(entry["rows_per_second"], 0)
+            self.assertGreater(entry["peak_memory_bytes"], 0)
+            self.assertGreater(entry["queries"], 0)
+        self.assertLess(results["reimport"]["queries"], results["import"]["queries"])
+        self.assertEqual(get_user_model().objects.count(), users_before)
+
+    def test_baseline_comparison(self) -> None:
+        """
+        A generous baseline passes, a baseline the run cannot meet fails the command
+        """
+        data, _ = self._run()
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = Path(tmp) / "baseline.json"
+            for entry in data["results"]:
+                entry["wall_seconds"] *= 100
+                entry["peak_memory_bytes"] *= 100
+            baseline.write_text(json.dumps(data), encoding="utf-8")
+            _, out = self._run("--baseline", str(baseline))
+            self.assertIn("No regressions", out)
+
+            for entry in data["results"]:
+                entry["queries"] = 0
+            baseline.write_text(json.dumps(data), encoding="utf-8")
+            with self.assertRaisesMessage(CommandError, "queries"):
+                self._run("--baseline", str(baseline), "--threshold", "0.5")
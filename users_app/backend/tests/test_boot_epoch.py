@@ -0,0 +1,143 @@
+"""
+Unit tests
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from profiles import boot
+from profiles.models.boot_epoch import BootEpoch
+from tests.auth_client import AuthClientMixin
+
+
+class BootEpochTests(TestCase):
+    """
+    Boot epoch shared through the database
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        boot.reset_boot_id()
+        self.addCleanup(boot.reset_boot_id)
+
+    def test_workers_share_the_epoch(self) -> None:
+        """
+        The first worker creates the epoch; another worker (fresh process state) reads the same one
+        """
+        first = boot.get_boot_id()
+        self.assertEqual(BootEpoch.objects.get(deployment_id=boot.get_deployment_id()).epoch, first)
+        boot.reset_boot_id()
+        self.assertEqual(boot.get_boot_id(), first)
+
+    @override_settings(DEPLOYMENT_ID="release-2")
+    def test_epoch_of_another_node_is_adopted(self) -> None:
+        """
+        An epoch written by another node for this deployment is used as is
+        """
+        BootEpoch.objects.create(deployment_id="release-2", epoch=123)
+        self.assertEqual(boot.get_boot_id(), 123)
+
+    @override_settings(BOOT_ID=42, BOOT_EPOCH_RETRY_SECONDS=3600)
+    def test_falls_back_while_the_table_is_unavailable(self) -> None:
+        """
+        Without the table the per-process boot id is used and the read is not retried right away
+        """
+        with mock.patch.object(boot, "load_boot_epoch", side_effect=DatabaseError("no such table")) as load:
+            self.assertEqual(boot.get_boot_id(), 42)
+            self.assertEqual(boot.get_boot_id(), 42)
+        self.assertEqual(load.call_count, 1)
+
+
+class BootIdEnforcementTests(AuthClientMixin, APITestCase):
+    """
+    Tokens carry the deployment's epoch
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        boot.reset_boot_id()
+        self.addCleanup(boot.reset_boot_id)
+        self.user = self.create_user("booted")
+        self.client = self.client_for(self.user)
+
+    def test_token_is_accepted_by_a_sibling_worker(self) -> None:
+        """
+        A worker that did not mint the token accepts it
+        """
+        boot.reset_boot_id()
+        resp = self.client.get("/api/v1/users/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["X-Boot-Id"], str(boot.get_boot_id()))
+
+    def test_new_deployment_rejects_older_tokens(self) -> None:
+        """
+        A new DEPLOYMENT_ID starts a new epoch
+        """
+        BootEpoch.objects.create(deployment_id="release-3", epoch=boot.get_boot_id() + 1)
+        with override_settings(DEPLOYMENT_ID="release-3"):
+            boot.reset_boot_id()
+            self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BootEpochKeyRingTests(AuthClientMixin, APITestCase):
+    """
+    Previous and next epochs accepted during a rolling deploy
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        now = timezone.now()
+        for name, epoch, age in (("v1", 100, 7200), ("v2", 200, 600), ("v3", 300, 60), ("v4", 400, 0)):
+            BootEpoch.objects.create(deployment_id=name, epoch=epoch)
+            BootEpoch.objects.filter(deployment_id=name).update(created_at=now - timedelta(seconds=age))
+        self.user = self.create_user("rolling")
+        self.client = APIClient()
+        self.addCleanup(boot.reset_boot_id)
+
+    def _accepted(self, deployment_id: str, overlap: float) -> list[int]:
+        with override_settings(DEPLOYMENT_ID=deployment_id, BOOT_EPOCH_OVERLAP_SECONDS=overlap):
+            boot.reset_boot_id()
+            return [epoch for epoch in (100, 200, 300, 400, None, "300") if boot.is_boot_id_accepted(epoch)]
+
+    def test_accepted_epochs(self) -> None:
+        """
+        Without overlap only the current epoch; with it, newer epochs and older ones until their
+        successor is older than the overlap
+        """
+        self.assertEqual(self._accepted("v3", 0), [300])
+        self.assertEqual(self._accepted("v3", 1800), [100, 200, 300, 400])
+        self.assertEqual(self._accepted("v3", 300), [200, 300, 400])
+        self.assertEqual(self._accepted("v3", 30), [300, 400])
+        self.assertEqual(self._accepted("v4", 300), [200, 300, 400])
+
+    @override_settings(DEPLOYMENT_ID="v4", BOOT_EPOCH_OVERLAP_SECONDS=300)
+    def test_previous_epoch_token_is_accepted_and_upgraded_on_refresh(self) -> None:
+        """
+        A token of the previous deployment keeps working; its refresh returns current-epoch tokens
+        """
+        boot.reset_boot_id()
+        refresh = RefreshToken.for_user(self.user)
+        refresh["boot_id"] = 300
+        access = refresh.access_token
+        access["boot_id"] = 300
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_200_OK)
+
+        resp = self.client.post("/api/v1/auth/jwt/refresh/", {"refresh": str(refresh)}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(resp.json()["access"])["boot_id"], 400)
+        self.assertEqual(RefreshToken(resp.json()["refresh"])["boot_id"], 400)  # rotated
+
+        access["boot_id"] = 100
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,161 @@
+"""
+Unit tests
+"""
+
+import multiprocessing
+import tempfile
+from unittest import mock, skipIf
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.cache_backends import CACHE_BACKENDS, cache_settings
+from core.jwt_authentication import denylist_jti, is_jti_denylisted
+from tests.auth_client import AuthClientMixin
+
+
+# Database connections a forked child inherited from the test process; kept referenced so they
+# are never closed (that would end the parent's sessions)
+_INHERITED_CONNECTIONS: list = []
+
+
+def _with_own_connections(target, *args) -> None:
+    for conn in connections.all():
+        _INHERITED_CONNECTIONS.append(conn.connection)
+        conn.connection = None  # the child connects anew on first use
+    target(*args)
+
+
+def in_other_process(target, *args) -> int:
+    """
+    Run target in a forked worker process with its own database connections and return its exit code
+    """
+    process = multiprocessing.get_context("fork").Process(target=_with_own_connections, args=(target, *args))
+    process.start()
+    process.join(timeout=30)
+    return process.exitcode
+
+
+def _exit_with_denylist_state(jti: str) -> None:
+    raise SystemExit(0 if is_jti_denylisted(jti) else 1)
+
+
+class CacheSettingsTests(SimpleTestCase):
+    """
+    CACHES built from CACHE_BACKEND
+    """
+    def test_backends(self) -> None:
+        """
+        Each backend gets its Django class and a default location
+        """
+        for name, backend in CACHE_BACKENDS.items():
+            if name == "redis":
+                continue
+            config = cache_settings(name)["default"]
+            self.assertEqual(config["BACKEND"], backend)
+            self.assertTrue(config["LOCATION"])
+        self.assertEqual(cache_settings("DB", "user_cache", timeout=60)["default"]["LOCATION"], "user_cache")
+
+    def test_invalid_configuration(self) -> None:
+        """
+        Unknown backends and redis without its client package fail at startup
+        """
+        with self.assertRaisesMessage(ImproperlyConfigured, "CACHE_BACKEND"):
+            cache_settings("memcached")
+        with mock.patch("importlib.util.find_spec", return_value=None):
+            with self.assertRaisesMessage(ImproperlyConfigured, "redis package"):
+                cache_settings("redis")
+
+
+class SharedDenylistMixin(AuthClientMixin):
+    """
+    A token revoked by one worker process is rejected by the others (the tests run against the
+    tier built by shared_caches())
+    """
+    def setUp(self) -> None:  # pylint: disable=invalid-name
+        """
+        Setup method
+        """
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.location = directory.name
+        self.user = self.create_user("shared_cache")
+        tokens = self.login(self.user)
+        self.client = self.bearer_client(tokens["access"])
+        self.token = AccessToken(tokens["access"])
+
+    def shared_caches(self) -> dict:
+        """
+        CACHES of the shared tier under test
+        """
+        raise NotImplementedError
+
+    def _revoke_in_other_process(self) -> None:
+        self.assertEqual(in_other_process(denylist_jti, self.token["jti"], self.token["exp"]), 0)  # pylint: disable=no-member
+
+    @override_settings(JTI_FILTER_ENABLED=False)
+    def test_revocation_by_another_process_is_seen(self) -> None:
+        """
+        A denylist entry written by another process rejects the token here
+        """
+        with override_settings(CACHES=self.shared_caches()):
+            self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_200_OK)  # pylint: disable=no-member
+            self._revoke_in_other_process()
+            self.assertEqual(self.client.get("/api/v1/users/").status_code,  # pylint: disable=no-member
+                             status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_is_seen_by_another_process(self) -> None:
+        """
+        The denylist entry written by LogoutView is visible to another process
+        """
+        with override_settings(CACHES=self.shared_caches()):
+            self.assertEqual(self.client.post("/api/v1/auth/jwt/logout/").status_code,  # pylint: disable=no-member
+                             status.HTTP_204_NO_CONTENT)
+            self.assertEqual(in_other_process(_exit_with_denylist_state, self.token["jti"]), 0)  # pylint: disable=no-member
+
+
+class FileSharedDenylistTests(SharedDenylistMixin, APITestCase):
+    """
+    Cross-process denylist on the file tier (development only)
+    """
+    def shared_caches(self) -> dict:
+        """
+        FileBasedCache in a temporary directory
+        """
+        return cache_settings("file", self.location)
+
+    @override_settings(JTI_FILTER_ENABLED=False)
+    def test_locmem_is_not_shared(self) -> None:
+        """
+        The per-process cache does not see revocations made elsewhere
+        """
+        with override_settings(CACHES=cache_settings("locmem")):
+            self._revoke_in_other_process()
+            self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_200_OK)
+
+
+@skipIf(connection.vendor == "sqlite", "The in-memory test database is not shared with other processes")
+class DatabaseSharedDenylistTests(SharedDenylistMixin, APITransactionTestCase):
+    """
+    Cross-process denylist on the db tier; rows are committed, so the other process sees them
+    """
+    cache_table = "test_shared_cache"
+
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        with override_settings(CACHES=self.shared_caches()):
+            call_command("createcachetable", verbosity=0)
+        super().setUp()
+
+    def shared_caches(self) -> dict:
+        """
+        DatabaseCache in its own table of the test database
+        """
+        return cache_settings("db", self.cache_table)
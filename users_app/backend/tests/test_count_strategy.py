@@ -0,0 +1,77 @@
+"""
+Unit tests
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tests.auth_client import AuthClientMixin
+
+
+class CountStrategyTests(AuthClientMixin, APITestCase):
+    """
+    Count strategies of the users list pagination
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        cache.clear()
+        user_model = get_user_model()
+        self.user = self.create_user("counter")
+        for i in range(6):
+            user_model.objects.create_user(username=f"count_{i}", email=f"count_{i}@example.com")
+        self.client = self.client_for(self.user)
+
+    @staticmethod
+    def _count_queries(ctx: CaptureQueriesContext) -> list[str]:
+        return [q["sql"] for q in ctx.captured_queries if "COUNT(*)" in q["sql"]]
+
+    def test_exact_is_the_default(self) -> None:
+        """
+        Without options the response is the usual DRF envelope
+        """
+        body = self.client.get("/api/v1/users/?page=2&page_size=3").json()
+        self.assertEqual(body["count"], 7)
+        self.assertNotIn("count_is_estimate", body)
+        self.assertEqual(len(body["results"]), 3)
+
+    def test_none_omits_count(self) -> None:
+        """
+        count=none runs no COUNT(*) and still knows whether there is a next page
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            body = self.client.get("/api/v1/users/?page=2&page_size=3&count=none").json()
+        self.assertEqual(self._count_queries(ctx), [])
+        self.assertNotIn("count", body)
+        self.assertEqual(len(body["results"]), 3)
+        self.assertIsNotNone(body["next"])
+        self.assertIsNotNone(body["previous"])
+
+        last = self.client.get("/api/v1/users/?page=3&page_size=3&count=none").json()
+        self.assertEqual(len(last["results"]), 1)
+        self.assertIsNone(last["next"])
+        self.assertEqual(self.client.get("/api/v1/users/?page=9&page_size=3&count=none").status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    @override_settings(PAGINATION_COUNT_STRATEGY="estimated")
+    def test_estimated_falls_back_to_exact_on_sqlite_and_is_cached(self) -> None:
+        """
+        SQLite has no planner estimate: the count is exact, then served from the cache
+        """
+        body = self.client.get("/api/v1/users/?page_size=3").json()
+        self.assertEqual(body["count"], 7)
+        self.assertFalse(body["count_is_estimate"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get("/api/v1/users/?page=2&page_size=3").json()
+        self.assertEqual(again["count"], 7)
+        self.assertEqual(self._count_queries(ctx), [])
+
+        filtered = self.client.get("/api/v1/users/?page_size=3&search=count_1").json()
+        self.assertEqual(filtered["count"], 1)
@@ -0,0 +1,272 @@
+"""
+Unit tests
+"""
+
+from io import BytesIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from openpyxl import load_workbook
+import pandas as pd
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from profiles.models.profile import Profile
+from profiles.user_io import CopyImporter, UserImporter, XlsxChunkReader, get_importer
+from tests.auth_client import AuthClientMixin
+
+
+def make_workbook(rows: list[dict]) -> BytesIO:
+    """
+    In-memory xlsx in the import template layout
+    """
+    buf = BytesIO()
+    pd.DataFrame(rows).to_excel(buf, index=False, sheet_name="users")
+    buf.seek(0)
+    buf.name = "users.xlsx"
+    return buf
+
+
+def template_rows(count: int, start: int = 0) -> list[dict]:
+    """
+    Rows like test_data/import_template_*.xlsx
+    """
+    return [{"email": f"Import.{i}@Example.com ", "username": f"import_{i}", "first_name": f"First{i}",
+             "last_name": f"Last{i}", "bio": f"Bio {i}"} for i in range(start, start + count)]
+
+
+class ExcelImportTests(AuthClientMixin, APITestCase):
+    """
+    Set-based Excel import
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.admin = self.create_user("importer", is_staff=True)
+        self.client = self.client_for(self.admin)
+
+    def _upload(self, rows: list[dict]):
+        return self.client.post("/api/v1/import-excel/", {"file": make_workbook(rows)}, format="multipart")
+
+    @staticmethod
+    def _counts(resp) -> tuple[int, int, int]:
+        body = resp.json()
+        return body["created"], body["updated"], body["processed"]
+
+    def test_create_then_update(self) -> None:
+        """
+        New emails create users with profiles; a second upload only counts real changes
+        """
+        resp = self._upload(template_rows(5))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual({k: v for k, v in resp.json().items() if k != "rows_per_second"},
+                         {"created": 5, "updated": 0, "processed": 5, "skipped": 0, "rejected": 0, "errors": []})
+        self.assertGreater(resp.json()["rows_per_second"], 0)
+        user = get_user_model().objects.get(email="import.3@example.com")
+        self.assertEqual((user.username, user.first_name, user.profile.bio), ("import_3", "First3", "Bio 3"))
+
+        rows = template_rows(6)
+        rows[1]["last_name"] = "Changed"
+        rows[2]["bio"] = "New bio"
+        rows[4]["first_name"] = None  # empty cell leaves the field untouched
+        resp = self._upload(rows)
+        self.assertEqual(self._counts(resp), (1, 2, 3))
+        self.assertEqual(resp.json()["skipped"], 3)
+        self.assertEqual(Profile.objects.get(user__email="import.2@example.com").bio, "New bio")
+        self.assertEqual(get_user_model().objects.get(email="import.4@example.com").first_name, "First4")
+
+    def test_rows_without_email_or_username_are_skipped(self) -> None:
+        """
+        Incomplete rows are ignored, as before
+        """
+        rows = template_rows(3)
+        rows[0]["email"] = None
+        rows[1]["username"] = None
+        self.assertEqual(self._counts(self._upload(rows)), (1, 0, 1))
+
+    def test_invalid_rows_are_rejected(self) -> None:
+        """
+        Invalid rows are reported with their sheet row number; the valid ones are imported
+        """
+        rows = template_rows(4)
+        rows[1]["username"] = "with space"
+        rows[2]["email"] = "incorrect.email"
+        rows[3]["last_name"] = "x" * 151
+        resp = self._upload(rows)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        body = resp.json()
+        self.assertEqual((body["created"], body["rejected"]), (1, 3))
+        self.assertEqual([error["row"] for error in body["errors"]], [3, 4, 5])
+        self.assertTrue(body["errors"][0]["msg"].startswith("username: "))
+        self.assertTrue(body["errors"][1]["msg"].startswith("email: "))
+        self.assertTrue(body["errors"][2]["msg"].startswith("last_name: "))
+        self.assertEqual(list(get_user_model().objects.filter(email__startswith="import.")
+                              .values_list("email", flat=True)), ["import.0@example.com"])
+
+    @override_settings(EXCEL_IMPORT_MAX_ERRORS=2)
+    def test_reported_errors_are_capped(self) -> None:
+        """
+        Only the first EXCEL_IMPORT_MAX_ERRORS rejected rows are listed, all are counted
+        """
+        rows = [dict(row, email="broken") for row in template_rows(5)]
+        body = self._upload(rows).json()
+        self.assertEqual((body["created"], body["rejected"], len(body["errors"])), (0, 5, 2))
+
+    def test_unchanged_rows_are_skipped_without_writes(self) -> None:
+        """
+        Re-importing the same rows reads the users once per chunk and writes nothing
+        """
+        rows = template_rows(20)
+        self._upload(rows)
+        with CaptureQueriesContext(connection) as ctx:
+            result = UserImporter(chunk_size=10).run([pd.DataFrame(rows)])
+        self.assertEqual((result.created, result.updated, result.skipped, result.rows), (0, 0, 20, 20))
+        statements = [q["sql"].split()[0].upper() for q in ctx.captured_queries]
+        user_reads = [q for q in ctx.captured_queries if q["sql"].startswith("SELECT") and '"auth_user"' in q["sql"]]
+        self.assertEqual(len(user_reads), 2)
+        self.assertFalse({"INSERT", "UPDATE", "DELETE"} & set(statements))
+
+    def test_rows_needing_work_are_not_skipped(self) -> None:
+        """
+        Missing profiles are created and repeated emails are applied in file order
+        """
+        rows = template_rows(3)
+        self._upload(rows)
+        Profile.objects.filter(user__email="import.0@example.com").delete()
+        rows.append(dict(rows[1], bio="Temporary"))
+        rows.append(dict(rows[1]))
+        resp = self._upload(rows)
+        self.assertEqual(resp.json()["skipped"], 1)
+        self.assertEqual(Profile.objects.get(user__email="import.0@example.com").bio, "Bio 0")
+        self.assertEqual(Profile.objects.get(user__email="import.1@example.com").bio, "Bio 1")
+
+    def test_query_count_does_not_grow_with_rows(self) -> None:
+        """
+        Round trips depend on the number of chunks, not on the number of rows
+        (kept below SQLite's bulk insert batch limit)
+        """
+        self._upload(template_rows(1, start=1000))  # warm up the per-process auth caches
+        with CaptureQueriesContext(connection) as small:
+            self._upload(template_rows(5))
+        with CaptureQueriesContext(connection) as large:
+            self._upload(template_rows(60, start=100))
+        # The activity middleware's throttled last_activity write and the revoked JTI filter's
+        # periodic sync may land in either request
+        def import_queries(ctx) -> list[str]:
+            return [q["sql"] for q in ctx.captured_queries
+                    if '"last_activity"' not in q["sql"] and '"token_blacklist_blacklistedtoken"' not in q["sql"]]
+        self.assertEqual(len(import_queries(large)), len(import_queries(small)))
+
+
+class XlsxChunkReaderTests(TestCase):
+    """
+    Streaming xlsx reader
+    """
+    def test_chunks_match_read_excel(self) -> None:
+        """
+        The chunks concatenate to what pandas reads, in bounded pieces
+        """
+        path = Path(settings.BASE_DIR).parent / "test_data" / "import_template_with_realistic_names_134_users.xlsx"
+        with open(path, "rb") as fh:
+            reader = XlsxChunkReader(fh, chunk_size=50)
+            chunks = list(reader)
+        self.assertEqual([len(chunk) for chunk in chunks], [50, 50, 34])
+        self.assertEqual(reader.rows, 134)
+        expected = pd.read_excel(path)
+        streamed = pd.concat(chunks, ignore_index=True)
+        self.assertEqual(list(streamed.columns), list(expected.columns))
+        self.assertEqual(streamed["email"].tolist(), expected["email"].tolist())
+
+
+class ExcelExportTests(AuthClientMixin, APITestCase):
+    """
+    Streaming xlsx export
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.admin = self.create_user("exporter", email="Exporter@Example.com", is_staff=True)
+        for i in range(4):
+            user = get_user_model().objects.create_user(username=f"export_{i}", email=f"export_{i}@example.com",
+                                                        first_name=f"First{i}", is_active=i != 3)
+            Profile.objects.update_or_create(user=user, defaults={"bio": f"Bio {i}"})
+        self.client = self.client_for(self.admin)
+
+    def _download(self, query: str = "") -> list[tuple]:
+        resp = self.client.get(f"/api/v1/import-excel/{query}")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+        self.assertIn("attachment;", resp["Content-Disposition"])
+        workbook = load_workbook(BytesIO(b"".join(resp.streaming_content)), read_only=True)
+        return list(workbook["users"].iter_rows(values_only=True))
+
+    def test_exports_template_layout(self) -> None:
+        """
+        Header plus one row per user, emails normalized, bios included
+        """
+        rows = self._download()
+        self.assertEqual(rows[0], ("email", "username", "first_name", "last_name", "bio", "is_active"))
+        self.assertEqual(rows[1][0], "exporter@example.com")
+        self.assertEqual(rows[2], ("export_0@example.com", "export_0", "First0", None, "Bio 0", True))
+        self.assertEqual(rows[5][5], False)
+        self.assertEqual(len(rows), 6)
+
+    def test_accepts_users_list_parameters(self) -> None:
+        """
+        Filter, search and ordering narrow down the export
+        """
+        rows = self._download("?search=export_&is_active=true&ordering=-username")
+        self.assertEqual([row[1] for row in rows[1:]], ["export_2", "export_1", "export_0"])
+
+
+class ImportBackendTests(TestCase):
+    """
+    EXCEL_IMPORT_BACKEND selection
+    """
+    def test_orm_is_the_default(self) -> None:
+        """
+        Without configuration the batched ORM importer is used
+        """
+        self.assertIs(type(get_importer()), UserImporter)
+
+    @override_settings(EXCEL_IMPORT_BACKEND="copy")
+    def test_copy_falls_back_to_orm_without_postgresql(self) -> None:
+        """
+        COPY needs PostgreSQL; other databases keep the ORM path (and still import)
+        """
+        with mock.patch.object(connection, "vendor", "sqlite"):
+            importer = get_importer()
+        self.assertIs(type(importer), UserImporter)
+        self.assertEqual(importer.run([pd.DataFrame(template_rows(3))]).created, 3)
+
+    @override_settings(EXCEL_IMPORT_BACKEND="copy")
+    def test_copy_is_selected_on_postgresql(self) -> None:
+        """
+        On PostgreSQL "copy" selects the staging importer, with the given options
+        """
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            importer = get_importer(chunk_size=5)
+        self.assertIsInstance(importer, CopyImporter)
+        self.assertEqual(importer.chunk_size, 5)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+    def test_copy_import(self) -> None:
+        """
+        The staging importer creates users with profiles at session epoch 0 and updates changed ones
+        """
+        result = CopyImporter().run([pd.DataFrame(template_rows(3))])
+        self.assertEqual((result.created, result.updated), (3, 0))
+        self.assertEqual(list(Profile.objects.filter(user__username__startswith="import_")
+                              .values_list("session_epoch", flat=True)), [0, 0, 0])
+        rows = template_rows(3)
+        rows[0]["bio"] = "Changed"
+        result = CopyImporter().run([pd.DataFrame(rows)])
+        self.assertEqual((result.created, result.updated, result.skipped), (0, 1, 2))
+        self.assertEqual(Profile.objects.get(user__username="import_0").bio, "Changed")
@@ -0,0 +1,151 @@
+"""
+Unit tests
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from profiles.models.data_version import DataVersion
+from profiles.models.profile import Profile
+from profiles.user_io.export_cache import ExportCache
+from profiles.users_version import USERS_VERSION_CACHE_KEY, bump_users_version, get_users_version
+from tests.auth_client import AuthClientMixin
+from tests.test_excel_import import make_workbook, template_rows
+
+
+class ExportCacheTests(SimpleTestCase):
+    """
+    On-disk export cache
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ExportCache(self.tmp.name, max_bytes=1000, max_age_seconds=60)
+
+    def _store(self, version: int, key: str, size: int = 10) -> Path:
+        return self.cache.store(version, key, ".csv", lambda target: target.write(b"x" * size))
+
+    def test_store_and_get(self) -> None:
+        """
+        A stored file is found under its version and key only
+        """
+        path = self._store(1, "a")
+        self.assertEqual(self.cache.get(1, "a", ".csv"), path)
+        self.assertIsNone(self.cache.get(2, "a", ".csv"))
+        self.assertIsNone(self.cache.get(1, "b", ".csv"))
+
+    def test_other_versions_are_evicted_on_store(self) -> None:
+        """
+        Files of older versions can never be served again
+        """
+        old = self._store(1, "a")
+        self._store(2, "b")
+        self.assertFalse(old.exists())
+
+    def test_eviction_by_age_and_size(self) -> None:
+        """
+        Expired files are not served and get deleted; beyond max_bytes the oldest go first
+        """
+        expired = self._store(1, "a")
+        os.utime(expired, (time.time() - 120, time.time() - 120))
+        self.assertIsNone(self.cache.get(1, "a", ".csv"))
+        first = self._store(1, "b", size=600)
+        self.assertFalse(expired.exists())
+        os.utime(first, (time.time() - 10, time.time() - 10))
+        second = self._store(1, "c", size=600)
+        self.assertFalse(first.exists())
+        self.assertTrue(second.exists())
+
+    def test_failed_writer_leaves_nothing(self) -> None:
+        """
+        A writer error removes the temporary file
+        """
+        def fail(target) -> None:
+            target.write(b"partial")
+            raise RuntimeError("boom")
+        with self.assertRaises(RuntimeError):
+            self.cache.store(1, "a", ".csv", fail)
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [])
+
+
+class ExportEndpointCacheTests(AuthClientMixin, APITestCase):
+    """
+    Export responses served from the cache, with ETags of the users-table version
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp.cleanup)
+        self.export_dir = Path(tmp.name)
+        overrides = override_settings(EXPORT_CACHE_ENABLED=True, EXPORT_CACHE_DIR=tmp.name)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        bump_users_version()  # no files of other tests' data under this version
+
+        self.admin = self.create_user("cached_export", email="cached@example.com", is_staff=True)
+        self.client = self.client_for(self.admin)
+
+    def _export(self, query: str = "?file_format=csv", etag: str = ""):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(f"/api/v1/import-excel/{query}", **headers)
+
+    def test_repeated_export_is_served_from_disk(self) -> None:
+        """
+        The second export reuses the file; If-None-Match with the ETag answers 304
+        """
+        first = self._export()
+        body = b"".join(first.streaming_content)
+        self.assertEqual(len(list(self.export_dir.iterdir())), 1)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self._export()
+            self.assertEqual(b"".join(second.streaming_content), body)
+        self.assertFalse([q for q in ctx.captured_queries if '"bio"' in q["sql"]])
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(self._export(etag=first["ETag"]).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self._export("?file_format=ndjson")["ETag"], first["ETag"])
+
+    def test_changes_invalidate_the_export(self) -> None:
+        """
+        User/profile saves and imports bump the version; last_login updates do not
+        """
+        etag = self._export()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.last_login = None
+            self.admin.save(update_fields=["last_login"])
+        self.assertEqual(self._export(etag=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Profile.objects.update_or_create(user=self.admin, defaults={"bio": "Changed"})
+        changed = self._export(etag=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertIn(b"Changed", b"".join(changed.streaming_content))
+
+        version = get_users_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/v1/import-excel/", {"file": make_workbook(template_rows(2))}, format="multipart")
+        self.assertGreater(get_users_version(), version)
+
+    def test_version_survives_cache_loss(self) -> None:
+        """
+        The version is stored in the database; losing the cached copy does not reset it
+        """
+        version = bump_users_version()
+        cache.delete(USERS_VERSION_CACHE_KEY)
+        self.assertEqual(get_users_version(), version)
+        cache.delete(USERS_VERSION_CACHE_KEY)
+        self.assertEqual(bump_users_version(), version + 1)
+        self.assertEqual(DataVersion.objects.get(name="users").version, version + 1)
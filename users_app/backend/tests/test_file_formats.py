@@ -0,0 +1,174 @@
+"""
+Unit tests
+"""
+
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+import pandas as pd
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from profiles.models.profile import Profile
+from profiles.user_io import CsvChunkReader, NdjsonChunkReader, encode_csv, encode_ndjson, get_file_format
+from tests.auth_client import AuthClientMixin
+from tests.test_excel_import import make_workbook, template_rows
+
+
+def make_csv(rows: list[dict], name: str = "users.csv") -> SimpleUploadedFile:
+    """
+    CSV upload with the columns of all rows
+    """
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=list(dict.fromkeys(key for row in rows for key in row)))
+    writer.writeheader()
+    writer.writerows(rows)
+    return SimpleUploadedFile(name, buf.getvalue().encode("utf-8"), content_type="text/csv")
+
+
+def make_ndjson(rows: list[dict], name: str = "users.ndjson") -> SimpleUploadedFile:
+    """
+    NDJSON upload, one object per row
+    """
+    body = "".join(json.dumps(row) + "\n" for row in rows)
+    return SimpleUploadedFile(name, body.encode("utf-8"), content_type="application/x-ndjson")
+
+
+class CodecTests(TestCase):
+    """
+    CSV / NDJSON readers and encoders
+    """
+    def test_csv_reader_matches_xlsx_reader(self) -> None:
+        """
+        Both readers yield the same cells for the same rows, empty cells as missing values
+        """
+        rows = template_rows(5)
+        rows[2]["bio"] = ""
+        reader = CsvChunkReader(io.BytesIO(b"\xef\xbb\xbf" + make_csv(rows).read()), chunk_size=2)
+        chunks = list(reader)
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(reader.rows, 5)
+        from_csv = pd.concat(chunks, ignore_index=True)
+        from_xlsx = pd.concat(get_file_format("xlsx").reader(make_workbook(rows)), ignore_index=True)
+        self.assertEqual(list(from_csv.columns), list(from_xlsx.columns))
+        self.assertEqual(from_csv["email"].tolist(), from_xlsx["email"].tolist())
+        self.assertTrue(pd.isna(from_csv.loc[2, "bio"]))
+
+    def test_ndjson_reader(self) -> None:
+        """
+        Keys are matched case-insensitively, missing keys are missing values, blank lines are skipped
+        """
+        body = b'{"Email": "a@example.com", "username": "a", "is_active": false}\n\n{"email": "b@example.com"}\n'
+        frame = pd.concat(NdjsonChunkReader(io.BytesIO(body)), ignore_index=True)
+        self.assertEqual(frame["email"].tolist(), ["a@example.com", "b@example.com"])
+        self.assertEqual(frame.loc[0, "is_active"], False)
+        self.assertTrue(pd.isna(frame.loc[1, "username"]))
+
+    def test_encoders_round_trip(self) -> None:
+        """
+        Encoded rows read back to the same values
+        """
+        rows = [("a@example.com", "a", "Ann", "Lee", 'Says "hi",\nthen leaves', True),
+                ("b@example.com", "b", "", "", "", False)]
+        text = b"".join(encode_csv(iter(rows))).decode("utf-8")
+        parsed = list(csv.reader(io.StringIO(text)))
+        self.assertEqual(parsed[0], ["email", "username", "first_name", "last_name", "bio", "is_active"])
+        self.assertEqual(parsed[1][4], 'Says "hi",\nthen leaves')
+        lines = b"".join(encode_ndjson(iter(rows))).decode("utf-8").splitlines()
+        self.assertEqual(json.loads(lines[1]), {"email": "b@example.com", "username": "b", "first_name": "",
+                                                "last_name": "", "bio": "", "is_active": False})
+
+    def test_format_resolution(self) -> None:
+        """
+        Explicit name wins over the extension; xlsx is the default
+        """
+        self.assertEqual(get_file_format(filename="users.CSV").name, "csv")
+        self.assertEqual(get_file_format(filename="users.jsonl").name, "ndjson")
+        self.assertEqual(get_file_format("ndjson", "users.csv").name, "ndjson")
+        self.assertEqual(get_file_format(filename="users").name, "xlsx")
+
+
+class FileFormatEndpointTests(AuthClientMixin, APITestCase):
+    """
+    ?file_format= on the import/export endpoint
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.admin = self.create_user("formats", is_staff=True)
+        self.client = self.client_for(self.admin)
+
+    def _upload(self, upload, query: str = ""):
+        return self.client.post(f"/api/v1/import-excel/{query}", {"file": upload}, format="multipart")
+
+    def test_csv_import_by_extension(self) -> None:
+        """
+        A .csv upload is imported like the xlsx template
+        """
+        rows = template_rows(4)
+        rows[1]["is_active"] = "false"
+        resp = self._upload(make_csv(rows))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["created"], 4)
+        user = get_user_model().objects.get(email="import.1@example.com")
+        self.assertEqual((user.username, user.is_active, user.profile.bio), ("import_1", False, "Bio 1"))
+
+    def test_ndjson_import_by_parameter(self) -> None:
+        """
+        ?file_format= overrides the extension
+        """
+        resp = self._upload(make_ndjson(template_rows(3), name="upload.txt"), "?file_format=ndjson")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["created"], 3)
+
+    def test_malformed_ndjson_is_rejected(self) -> None:
+        """
+        A line that is not JSON fails the upload with a file error
+        """
+        upload = SimpleUploadedFile("users.ndjson", b'{"email": "a@example.com"}\nnot json\n')
+        resp = self._upload(upload)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file_input", resp.json()["error"]["details"])
+        self.assertFalse(get_user_model().objects.filter(email="a@example.com").exists())
+
+    def test_unknown_format_is_rejected(self) -> None:
+        """
+        Unsupported ?file_format= values are a 400
+        """
+        resp = self.client.get("/api/v1/import-excel/?file_format=xml")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file_format", resp.json()["error"]["details"])
+
+    @override_settings(IMPORT_JOBS_EAGER=True)
+    def test_background_job_keeps_the_format(self) -> None:
+        """
+        A background job reads its stored file with the upload's format
+        """
+        resp = self._upload(make_csv(template_rows(2)), "?async=1")
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        job = self.client.get(f"/api/v1/import-jobs/{resp.json()['job_id']}/").json()
+        self.assertEqual((job["status"], job["created"]), ("succeeded", 2))
+
+    def test_exports_round_trip(self) -> None:
+        """
+        CSV and NDJSON exports stream every user and import back without changes
+        """
+        Profile.objects.update_or_create(user=self.admin, defaults={"bio": "Admin, of course"})
+        for file_format, extension in (("csv", ".csv"), ("ndjson", ".ndjson")):
+            resp = self.client.get(f"/api/v1/import-excel/?file_format={file_format}&ordering=id")
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertTrue(resp.streaming)
+            self.assertIn(extension, resp["Content-Disposition"])
+            body = b"".join(resp.streaming_content)
+            if file_format == "csv":
+                self.assertTrue(resp["Content-Type"].startswith("text/csv"))
+                self.assertEqual(body.decode("utf-8").splitlines()[1],
+                                 'formats@example.com,formats,,,"Admin, of course",True')
+            resubmitted = self._upload(SimpleUploadedFile(f"users{extension}", body))
+            self.assertEqual(resubmitted.status_code, status.HTTP_200_OK)
+            self.assertEqual((resubmitted.json()["created"], resubmitted.json()["updated"]), (0, 0))
@@ -0,0 +1,98 @@
+"""
+Unit tests
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+import pandas as pd
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.user_cache import get_user_cache
+from profiles.user_io import UserImporter
+from tests.auth_client import AuthClientMixin
+from tests.test_excel_import import make_workbook, template_rows
+
+
+@override_settings(IMPORT_JOBS_EAGER=True)
+class ImportJobTests(AuthClientMixin, APITestCase):
+    """
+    Background import jobs and their status endpoint
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.admin = self.create_user("jobs_admin", is_staff=True)
+        self.client = self.client_for(self.admin)
+
+    def _submit(self, rows: list[dict]) -> dict:
+        resp = self.client.post("/api/v1/import-excel/?async=1", {"file": make_workbook(rows)}, format="multipart")
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        return resp.json()
+
+    def test_async_upload_returns_job_and_status(self) -> None:
+        """
+        202 with a job id; the status endpoint reports the outcome
+        """
+        accepted = self._submit(template_rows(7))
+        self.assertIn(accepted["job_id"], accepted["status_url"])
+        job = self.client.get(f"/api/v1/import-jobs/{accepted['job_id']}/").json()
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual((job["rows_processed"], job["created"], job["updated"], job["processed"]), (7, 7, 0, 7))
+        self.assertEqual(job["errors"], [])
+        self.assertIsNotNone(job["finished_at"])
+
+    def test_failed_job_reports_errors(self) -> None:
+        """
+        Import errors end up on the job instead of the upload response
+        """
+        rows = template_rows(2)
+        rows[1]["username"] = self.admin.username  # taken by a user with another email
+        job = self.client.get(f"/api/v1/import-jobs/{self._submit(rows)['job_id']}/").json()
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["created"], 0)
+        self.assertEqual([error["row"] for error in job["errors"]], [None])
+
+    def test_rejected_rows_are_reported(self) -> None:
+        """
+        A job with invalid rows succeeds and lists them
+        """
+        rows = template_rows(3)
+        rows[1]["email"] = "incorrect.email"
+        job = self.client.get(f"/api/v1/import-jobs/{self._submit(rows)['job_id']}/").json()
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual((job["created"], job["rejected"]), (2, 1))
+        self.assertEqual([error["row"] for error in job["errors"]], [3])
+
+    def test_status_is_admin_only(self) -> None:
+        """
+        Regular users cannot read job status
+        """
+        job_id = self._submit(template_rows(1))["job_id"]
+        get_user_model().objects.filter(pk=self.admin.pk).update(is_staff=False)
+        get_user_cache().invalidate(self.admin.pk)
+        self.assertEqual(self.client.get(f"/api/v1/import-jobs/{job_id}/").status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_synchronous_upload_is_unchanged(self) -> None:
+        """
+        Without ?async the upload still answers with the counters
+        """
+        resp = self.client.post("/api/v1/import-excel/", {"file": make_workbook(template_rows(2))},
+                                format="multipart")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["created"], 2)
+
+
+class ImportProgressTests(APITestCase):
+    """
+    Progress reporting of the import engine
+    """
+    def test_progress_after_each_chunk(self) -> None:
+        """
+        The callback sees running totals once per chunk
+        """
+        seen: list[tuple[int, int]] = []
+        importer = UserImporter(chunk_size=4, progress=lambda r: seen.append((r.rows, r.created)))
+        importer.run([pd.DataFrame(template_rows(10))])
+        self.assertEqual(seen, [(4, 4), (8, 8), (10, 10)])
@@ -0,0 +1,60 @@
+"""
+Unit tests
+"""
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from profiles.user_io import ValidationStage, prepare_chunk
+from tests.test_excel_import import template_rows
+
+
+def raw_chunk(rows: list[dict], first_row: int = 2) -> pd.DataFrame:
+    """
+    Reader-like chunk indexed by source row number
+    """
+    return pd.DataFrame(rows, index=range(first_row, first_row + len(rows)))
+
+
+class PrepareChunkTests(SimpleTestCase):
+    """
+    Normalization and validation of one chunk
+    """
+    def test_splits_valid_rows_and_errors(self) -> None:
+        """
+        Invalid rows become (row, field, code) errors, the first error per row; incomplete rows are dropped
+        """
+        rows = template_rows(6)
+        rows[0]["email"] = "a@" + "x" * 260 + ".com"
+        rows[1]["email"] = "no-at-sign"
+        rows[2]["username"] = "no spaces"
+        rows[3]["first_name"] = "y" * 151
+        rows[3]["email"] = "also broken"
+        rows[4]["username"] = None
+        prepared = prepare_chunk(raw_chunk(rows))
+        self.assertEqual(prepared.rows, 6)
+        self.assertEqual(prepared.errors, [(2, "email", "max_length"), (3, "email", "invalid"),
+                                           (4, "username", "invalid"), (5, "email", "invalid")])
+        self.assertEqual(prepared.valid.index.tolist(), [7])
+        self.assertEqual(prepared.valid.loc[7, "email"], "import.5@example.com")
+
+
+class ValidationStageTests(SimpleTestCase):
+    """
+    Validation stage, inline and in the process pool
+    """
+    def test_pool_matches_inline_in_input_order(self) -> None:
+        """
+        Worker processes return the same results as inline validation, in input order
+        """
+        chunks = []
+        for number in range(6):
+            rows = template_rows(10, start=number * 10)
+            rows[number]["email"] = "broken"
+            chunks.append(raw_chunk(rows, first_row=2 + number * 10))
+        inline = list(ValidationStage(workers=0).run(chunks))
+        pooled = list(ValidationStage(workers=2).run(chunks))
+        self.assertEqual([chunk.errors for chunk in pooled], [chunk.errors for chunk in inline])
+        self.assertEqual([chunk.errors[0][0] for chunk in pooled], [2 + number * 11 for number in range(6)])
+        for expected, actual in zip(inline, pooled):
+            pd.testing.assert_frame_equal(actual.valid, expected.valid)
@@ -0,0 +1,52 @@
+"""
+Unit tests
+"""
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from profiles.activity_buffer import get_last_activity_buffer
+from profiles.models.profile import Profile
+from tests.auth_client import AuthClientMixin
+
+
+@override_settings(LAST_ACTIVITY_MODE="coalesce", LAST_ACTIVITY_FLUSH_IN_BACKGROUND=False)
+class CoalescedLastActivityTests(AuthClientMixin, APITestCase):
+    """
+    Last activity in "coalesce" mode
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.users = [self.create_user(f"act{i}") for i in range(3)]
+        for user in self.users:
+            Profile.objects.get_or_create(user=user)
+        get_last_activity_buffer().flush()
+
+    def test_requests_do_not_write_activity(self) -> None:
+        """
+        Authenticated requests only buffer the timestamp
+        """
+        client = self.client_for(self.users[0])
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(3):
+                client.get("/api/v1/users/")
+        writes = [q for q in ctx.captured_queries
+                  if q["sql"].startswith("UPDATE") and "last_activity" in q["sql"]]
+        self.assertEqual(writes, [])
+        self.assertIsNone(Profile.objects.get(user=self.users[0]).last_activity)
+
+    def test_flush_writes_all_users_in_one_update(self) -> None:
+        """
+        Pending timestamps are persisted with a single bulk UPDATE
+        """
+        for user in self.users:
+            self.client_for(user).get("/api/v1/users/")
+        with CaptureQueriesContext(connection) as ctx:
+            written = get_last_activity_buffer().flush()
+        self.assertEqual(written, len(self.users))
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertFalse(Profile.objects.filter(user__in=self.users, last_activity__isnull=True).exists())
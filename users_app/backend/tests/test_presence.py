@@ -0,0 +1,91 @@
+"""
+Unit tests
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from profiles.presence import PresenceStore, get_presence_store
+from tests.auth_client import AuthClientMixin
+
+
+class PresenceStoreTests(AuthClientMixin, APITestCase):
+    """
+    Online users served from the presence store
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        cache.clear()
+        get_presence_store().forget_throttle()
+        user_model = get_user_model()
+        self.admin = self.create_user("presence_admin", is_staff=True)
+        self.users = [user_model.objects.create_user(username=f"presence_{i}", email=f"presence_{i}@example.com")
+                      for i in range(3)]
+        self.client = self.client_for(self.admin)
+
+    def test_request_marks_user_online(self) -> None:
+        """
+        An authenticated request puts the caller into the online list
+        """
+        resp = self.client.get("/api/v1/stats/online-users/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["username"] for row in self.client.get("/api/v1/stats/online-users/").json()],
+                         [self.admin.username])
+
+    def test_most_recent_first_and_expiry(self) -> None:
+        """
+        Entries are ordered by last seen and fall out of the window on their own
+        """
+        store = get_presence_store()
+        now = 1_000_000.0
+        store.touch(self.users[0].pk, now=now - 400)
+        store.touch(self.users[1].pk, now=now - 100)
+        store.touch(self.users[2].pk, now=now - 10)
+        self.assertEqual([user_id for user_id, _ in store.online(now=now)], [self.users[2].pk, self.users[1].pk])
+
+    def test_touches_do_not_overwrite_other_users(self) -> None:
+        """
+        Workers marking different users in the same bucket keep every user; a repeat touch
+        only moves the user's last-seen time
+        """
+        now = 1_000_000.0
+        workers = [PresenceStore() for _ in self.users]
+        for worker, user in zip(workers, self.users):
+            worker.touch(user.pk, now=now)
+        workers[1].touch(self.users[0].pk, now=now + 10)
+        self.assertEqual(get_presence_store().online(now=now + 10),
+                         [(self.users[0].pk, now + 10), (self.users[1].pk, now), (self.users[2].pk, now)])
+
+    def test_count_only_does_not_query_database(self) -> None:
+        """
+        count_only answers from the cache alone
+        """
+        for user in self.users:
+            get_presence_store().touch(user.pk)
+        self.client.get("/api/v1/stats/online-users/")
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/v1/stats/online-users/?count_only=1")
+        self.assertEqual(resp.json(), {"count": 4})
+        user_loads = [q for q in ctx.captured_queries if q["sql"].startswith("SELECT")
+                                 and "auth_user" in q["sql"] and "IN (" in q["sql"]]
+        self.assertEqual(user_loads, [])
+
+    def test_paginated_output_hydrates_only_the_page(self) -> None:
+        """
+        With page_size the response is a page envelope and only that page is loaded
+        """
+        for user in self.users:
+            get_presence_store().touch(user.pk)
+        self.client.get("/api/v1/stats/online-users/")
+        resp = self.client.get("/api/v1/stats/online-users/?page=1&page_size=2")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        body = resp.json()
+        self.assertEqual(body["count"], 4)
+        self.assertEqual(len(body["results"]), 2)
+        self.assertIsNotNone(body["next"])
@@ -0,0 +1,122 @@
+"""
+Unit tests
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from profiles.models.profile import Profile
+from profiles.presence import get_presence_store
+from profiles.users_version import get_users_version
+from tests.auth_client import AuthClientMixin
+from tests.query_budget import QueryBudgetMixin
+from tests.test_excel_import import make_workbook, template_rows
+
+
+# Keep periodic background work (revoked JTI filter sync) out of the measured requests
+@override_settings(JTI_FILTER_SYNC_SECONDS=3600)
+class QueryBudgetTests(QueryBudgetMixin, AuthClientMixin, APITestCase):
+    """
+    SQL query budgets per endpoint; each scenario has enough rows that an N+1 would exceed it
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        cache.clear()
+        get_presence_store().forget_throttle()
+        self.admin = self.create_user("budget", is_staff=True)
+        for i in range(20):
+            user = get_user_model().objects.create_user(username=f"budget_{i}", email=f"budget_{i}@example.com")
+            Profile.objects.update_or_create(user=user, defaults={"bio": f"Bio {i}"})
+        self.tokens = self.login(self.admin)
+        self.client = self.bearer_client(self.tokens["access"])
+        self.client.get("/api/v1/me/profile/")  # warm the per-process auth caches
+
+    def test_users_list(self) -> None:
+        """
+        A full page of users
+        """
+        with self.assertMaxQueries(3):
+            resp = self.client.get("/api/v1/users/?page_size=20")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.json()["results"]), 20)
+
+    def test_users_detail(self) -> None:
+        """
+        One user
+        """
+        with self.assertMaxQueries(2):
+            resp = self.client.get(f"/api/v1/users/{self.admin.pk}/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["id"], self.admin.pk)
+
+    def test_me_profile(self) -> None:
+        """
+        Own profile
+        """
+        with self.assertMaxQueries(2):
+            resp = self.client.get("/api/v1/me/profile/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.json())
+
+    def test_online_users(self) -> None:
+        """
+        Online users hydrated in one query
+        """
+        for user in get_user_model().objects.all():
+            get_presence_store().touch(user.pk)
+        with self.assertMaxQueries(2):
+            resp = self.client.get("/api/v1/stats/online-users/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.json()), get_user_model().objects.count())
+
+    def test_export(self) -> None:
+        """
+        Users and their bios in one query
+        """
+        get_users_version()  # cached between exports; loaded from the database after a miss
+        with self.assertMaxQueries(2):
+            resp = self.client.get("/api/v1/import-excel/")
+            content = b"".join(resp.streaming_content)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(content)
+
+    def test_import(self) -> None:
+        """
+        One chunk of new users (on PostgreSQL one of the queries takes the import advisory lock)
+        """
+        workbook = make_workbook(template_rows(20))
+        with self.assertMaxQueries(7):
+            resp = self.client.post("/api/v1/import-excel/", {"file": workbook}, format="multipart")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["created"], 20)
+
+    def test_login(self) -> None:
+        """
+        Obtain a token pair
+        """
+        with self.assertMaxQueries(6):
+            resp = self.login_response(self.admin)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.json()["access"])
+
+    def test_refresh(self) -> None:
+        """
+        Refresh with rotation and blacklisting
+        """
+        with self.assertMaxQueries(15):
+            resp = APIClient().post("/api/v1/auth/jwt/refresh/", {"refresh": self.tokens["refresh"]}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.json()["access"])
+
+    def test_logout(self) -> None:
+        """
+        Logout blacklists the tokens
+        """
+        with self.assertMaxQueries(10):
+            resp = self.client.post("/api/v1/auth/jwt/logout/", {"refresh": self.tokens["refresh"]}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
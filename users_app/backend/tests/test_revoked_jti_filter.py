@@ -0,0 +1,92 @@
+"""
+Unit tests
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.revoked_jti_filter import BloomFilter, get_revoked_jti_filter
+from tests.auth_client import AuthClientMixin
+
+
+class BloomFilterTests(SimpleTestCase):
+    """
+    Bloom filter primitives
+    """
+    def test_no_false_negatives(self) -> None:
+        """
+        Every added item is reported as present
+        """
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [uuid4().hex for _ in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+    def test_false_positive_rate_is_bounded(self) -> None:
+        """
+        Unseen items are rarely reported as present
+        """
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for _ in range(1000):
+            bloom.add(uuid4().hex)
+        false_positives = sum(uuid4().hex in bloom for _ in range(5000))
+        self.assertLess(false_positives, 5000 * 0.03)
+
+
+@override_settings(JTI_FILTER_SYNC_SECONDS=3600)
+class RevokedJtiFilterTests(AuthClientMixin, APITestCase):
+    """
+    Denylist checks behind the in-process filter
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.user = self.create_user("bloom")
+        self.access = self.login(self.user)["access"]
+        self.client = self.bearer_client(self.access)
+        get_revoked_jti_filter().reset()
+
+    def test_not_revoked_token_skips_denylist_queries(self) -> None:
+        """
+        Once the filter is loaded, a valid token needs no denylist I/O
+        """
+        self.client.get("/api/v1/users/")  # loads the filter
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/v1/users/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        lookups = [q for q in ctx.captured_queries if "token_blacklist_blacklistedtoken" in q["sql"]]
+        self.assertEqual(lookups, [])
+        self.assertGreaterEqual(get_revoked_jti_filter().stats()["negatives"], 1)
+
+    def test_logged_out_token_is_rejected(self) -> None:
+        """
+        Logout feeds the filter, so the revoked token reaches the authoritative check
+        """
+        self.client.get("/api/v1/users/")
+        self.assertEqual(self.client.post("/api/v1/auth/jwt/logout/").status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_database_blacklist_rejects_without_cache_entry(self) -> None:
+        """
+        A worker without the cached denylist entry rejects the token by its BlacklistedToken row
+        """
+        self.client.get("/api/v1/users/")
+        token = AccessToken(self.access)
+        outstanding = OutstandingToken.objects.create(
+            user=self.user, jti=token["jti"], token=self.access,
+            expires_at=datetime.fromtimestamp(token["exp"], tz=timezone.utc))
+        BlacklistedToken.objects.create(token=outstanding)
+        cache.clear()
+        self.assertTrue(get_revoked_jti_filter().might_be_revoked(token["jti"]))
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,124 @@
+"""
+Unit tests
+"""
+
+from django.db.models import F
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from core.cache_backends import cache_settings
+from core.session_epochs import SESSION_EPOCH_CLAIM, forget_session_epoch, get_session_epoch
+from profiles.boot import get_boot_id
+from profiles.models.profile import Profile
+from tests.auth_client import AuthClientMixin
+
+
+class SessionEpochTests(AuthClientMixin, APITestCase):
+    """
+    Per-user session epoch carried in tokens
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.user = self.create_user("epoch")
+        self.admin = self.create_user("epoch_admin", is_staff=True)
+        self.tokens = self.login(self.user)
+        self.client = self.bearer_client(self.tokens["access"])
+
+    def _refresh(self, refresh: str) -> int:
+        return APIClient().post("/api/v1/auth/jwt/refresh/", {"refresh": refresh}, format="json").status_code
+
+    def test_login_stamps_stored_epoch(self) -> None:
+        """
+        Both tokens carry the epoch stored on the profile
+        """
+        epoch = Profile.objects.get(user=self.user).session_epoch
+        self.assertGreater(epoch, 0)
+        self.assertEqual(AccessToken(self.tokens["access"])[SESSION_EPOCH_CLAIM], epoch)
+        self.assertEqual(RefreshToken(self.tokens["refresh"])[SESSION_EPOCH_CLAIM], epoch)
+
+    def test_epoch_survives_cache_loss(self) -> None:
+        """
+        After a new login and the loss of the cached epoch, the older tokens stay revoked
+        """
+        self.login(self.user)
+        forget_session_epoch(self.user.pk)
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self._refresh(self.tokens["refresh"]), status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(CACHES=cache_settings("locmem"), SESSION_EPOCH_LOCAL_TTL=0)
+    def test_per_process_cache_rereads_the_database(self) -> None:
+        """
+        With a per-process cache, a bump stored by another worker is read from the database once
+        the local TTL has passed
+        """
+        client = self.client_for(self.user)
+        self.assertEqual(client.get("/api/v1/users/").status_code, status.HTTP_200_OK)
+        # Another worker's bump: the row changes, this process's caches are not told
+        Profile.objects.filter(user=self.user).update(session_epoch=F("session_epoch") + 1)
+        self.assertEqual(client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_own_password_change_starts_new_session(self) -> None:
+        """
+        The caller gets new tokens; the previous ones are revoked
+        """
+        other_session = self.tokens
+        resp = self.client.post(f"/api/v1/users/{self.user.pk}/set-password/",
+                                {"password": "N3w-Passw0rd!", "confirm_password": "N3w-Passw0rd!"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(resp.json()["access"])[SESSION_EPOCH_CLAIM], get_session_epoch(self.user.pk))
+        self.assertEqual(self.bearer_client(resp.json()["access"]).get("/api/v1/users/").status_code, status.HTTP_200_OK)
+        self.assertEqual(self.bearer_client(other_session["access"]).get("/api/v1/users/").status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+    def test_admin_password_change_revokes_user_tokens(self) -> None:
+        """
+        A password set by an admin ends the user's sessions and returns no tokens
+        """
+        admin_client = self.client_for(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = admin_client.post(f"/api/v1/users/{self.user.pk}/set-password/",
+                                     {"password": "N3w-Passw0rd!", "confirm_password": "N3w-Passw0rd!"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotIn("access", resp.json())
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_is_published_after_commit(self) -> None:
+        """
+        The profile row changes with the password; the cached epoch only once that commits
+        """
+        epoch = get_session_epoch(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.set_password("N3w-Passw0rd!")
+            self.user.save()
+        self.assertGreater(Profile.objects.get(user=self.user).session_epoch, epoch)
+        self.assertEqual(get_session_epoch(self.user.pk), epoch)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_session_epoch(self.user.pk), Profile.objects.get(user=self.user).session_epoch)
+
+    def test_logout_everywhere(self) -> None:
+        """
+        Admins can revoke every token of a user; other users cannot
+        """
+        url = f"/api/v1/users/{self.user.pk}/logout-everywhere/"
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_403_FORBIDDEN)
+        admin_client = self.client_for(self.admin)
+        self.assertEqual(admin_client.post(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self._refresh(self.tokens["refresh"]), status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(admin_client.get("/api/v1/users/").status_code, status.HTTP_200_OK)
+
+    def test_tokens_without_epoch(self) -> None:
+        """
+        Tokens issued before the claim existed count as epoch 0
+        """
+        user = self.create_user("legacy")
+        access = RefreshToken.for_user(user).access_token
+        access["boot_id"] = get_boot_id()
+        self.assertEqual(self.bearer_client(str(access)).get("/api/v1/users/").status_code, status.HTTP_200_OK)
+        self.login(user)
+        self.assertEqual(self.bearer_client(str(access)).get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
@@ -10,6 +10,15 @@ from core.settings import *
 # Testing if the Settings object can be initialized
 DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3","NAME": ":memory:"}}
 PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+# Per-process stand-in; tests of the shared tier override CACHES with their own location
+CACHES = cache_settings("locmem")
 
 if LANGUAGE_CODE != "en-us":
     raise AssertionError(f"Default language is not en-us; current value: {LANGUAGE_CODE}")
+
+# The users-table version is bumped on commit, which TestCase never reaches; tests that cover
+# the export cache enable it with their own directory
+EXPORT_CACHE_ENABLED = False
+
+# Validate import chunks inline; the process pool is covered by its own tests
+EXCEL_IMPORT_VALIDATION_WORKERS = 0
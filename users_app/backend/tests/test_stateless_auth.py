@@ -0,0 +1,113 @@
+"""
+Unit tests
+"""
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+import pandas as pd
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.session_epochs import SESSION_EPOCH_CLAIM, get_session_epoch
+from profiles.user_io import UserImporter, ValidationStage
+from tests.auth_client import AuthClientMixin
+
+
+@override_settings(JWT_STATELESS_AUTH=True, AUTH_USER_CACHE_ENABLED=False)
+class StatelessAuthTests(AuthClientMixin, APITestCase):
+    """
+    Access tokens carrying authorization claims skip the user query
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.user = self.create_user("stateless")
+        self.tokens = self.login(self.user)
+        self.client = self.bearer_client(self.tokens["access"])
+
+    def test_token_carries_claims(self) -> None:
+        """
+        Login issues the user's claims and current session epoch
+        """
+        token = AccessToken(self.tokens["access"])
+        self.assertIs(token["is_active"], True)
+        self.assertIs(token["is_staff"], False)
+        self.assertIs(token["is_superuser"], False)
+        self.assertEqual(token[SESSION_EPOCH_CLAIM], get_session_epoch(self.user.pk))
+
+    def test_no_user_query(self) -> None:
+        """
+        An authenticated request does not read the user table
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/v1/system/runtime-auth/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([q for q in ctx.captured_queries if '"auth_user"' in q["sql"]], [])
+
+    def test_new_login_revokes_older_tokens(self) -> None:
+        """
+        Logging in again ends the previous session
+        """
+        self.login(self.user)
+        self.assertEqual(self.client.get("/api/v1/system/runtime-auth/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_claim_change_revokes_tokens(self) -> None:
+        """
+        After is_staff changes, the old tokens are rejected and a new login carries the new claims
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_staff = True
+            self.user.save()
+        self.assertEqual(self.client.get("/api/v1/system/runtime-auth/").status_code, status.HTTP_401_UNAUTHORIZED)
+        resp = self.client.post("/api/v1/auth/jwt/refresh/", {"refresh": self.tokens["refresh"]}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        access = self.login(self.user)["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertIs(AccessToken(access)["is_staff"], True)
+        self.assertEqual(self.client.get("/api/v1/system/cache-stats/").status_code, status.HTTP_200_OK)
+
+    def test_unrelated_save_keeps_tokens(self) -> None:
+        """
+        Saving other fields does not revoke anything
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Renamed"
+            self.user.save()
+        self.assertEqual(self.client.get("/api/v1/system/runtime-auth/").status_code, status.HTTP_200_OK)
+
+    def test_import_revokes_only_claim_changes(self) -> None:
+        """
+        An import bumps the epochs of the users whose is_active it changed, not of the others
+        """
+        other = self.create_user("stateless_other")
+        other_client = self.bearer_client(self.login(other)["access"])
+        rows = pd.DataFrame([
+            {"email": self.user.email, "username": self.user.username, "is_active": False},
+            {"email": other.email, "username": other.username, "first_name": "Renamed", "is_active": True},
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            result = UserImporter(validation=ValidationStage(workers=0)).run([rows])
+        self.assertEqual(result.updated, 2)
+        self.assertEqual(self.client.get("/api/v1/system/runtime-auth/").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(other_client.get("/api/v1/system/runtime-auth/").status_code, status.HTTP_200_OK)
+
+    def test_refresh_carries_claims(self) -> None:
+        """
+        A refreshed access token carries the claims and the session epoch
+        """
+        resp = self.client.post("/api/v1/auth/jwt/refresh/", {"refresh": self.tokens["refresh"]}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        token = AccessToken(resp.json()["access"])
+        self.assertIs(token["is_active"], True)
+        self.assertEqual(token[SESSION_EPOCH_CLAIM], get_session_epoch(self.user.pk))
+
+    def test_default_mode_unchanged(self) -> None:
+        """
+        Without JWT_STATELESS_AUTH tokens carry no authorization claims
+        """
+        with override_settings(JWT_STATELESS_AUTH=False):
+            token = AccessToken(self.login(self.user)["access"])
+        self.assertNotIn("is_staff", token.payload)
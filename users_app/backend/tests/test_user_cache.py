@@ -0,0 +1,100 @@
+"""
+Unit tests
+"""
+
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.cache_backends import cache_settings
+from core.user_cache import UserResolutionCache, get_user_cache
+from tests.auth_client import AuthClientMixin
+
+
+class UserCacheTests(AuthClientMixin, APITestCase):
+    """
+    Authenticated user resolution cache
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        self.user = self.create_user("cached")
+        self.client = self.client_for(self.user)
+        get_user_cache().clear()
+
+    def test_second_request_is_served_from_cache(self) -> None:
+        """
+        The first request loads the user row, the next one does not
+        """
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_200_OK)
+        self.assertEqual(get_user_cache().stats()["misses"], 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_200_OK)
+        stats = get_user_cache().stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["local_hits"], 1)
+        user_table = get_user_model()._meta.db_table  # pylint: disable=protected-access
+        lookups = [q for q in ctx.captured_queries
+                   if f'FROM "{user_table}" WHERE "{user_table}"."id" = ' in q["sql"]]
+        self.assertEqual(lookups, [])
+
+    def test_save_invalidates_cached_user(self) -> None:
+        """
+        Saving the user drops the cached copy, so the next request sees fresh values
+        """
+        self.client.get("/api/v1/me/profile/")
+        self.user.first_name = "Fresh"
+        self.user.save()
+        self.assertGreaterEqual(get_user_cache().stats()["invalidations"], 1)
+
+        resp = self.client.get("/api/v1/me/profile/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["user"]["first_name"], "Fresh")
+
+    def test_refill_before_commit_is_dropped(self) -> None:
+        """
+        A row cached between the save and the commit is invalidated again after commit
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Fresh"
+            self.user.save()
+            get_user_cache().get_user(self.user.pk)  # a concurrent request refilling the cache
+        misses = get_user_cache().stats()["misses"]
+        get_user_cache().get_user(self.user.pk)
+        self.assertEqual(get_user_cache().stats()["misses"], misses + 1)
+
+    @override_settings(CACHES=cache_settings("locmem"))
+    def test_per_process_cache_is_bounded_by_local_ttl(self) -> None:
+        """
+        With a per-process cache, a change saved by another worker is read once the local TTL
+        has passed, whatever the shared TTL
+        """
+        user_cache = UserResolutionCache(max_size=10, local_ttl=0, shared_ttl=300)
+        self.assertTrue(user_cache.get_user(self.user.pk).is_active)
+        # Another worker's save: the row changes, this process's caches are not told
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertFalse(user_cache.get_user(self.user.pk).is_active)
+
+    def test_relogin_rejects_older_token(self) -> None:
+        """
+        A new login bumps the session epoch and must not be hidden by the cache
+        """
+        self.client.get("/api/v1/users/")
+        self.login(self.user)
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stats_endpoint_requires_admin(self) -> None:
+        """
+        Counters are only exposed to admins
+        """
+        self.assertEqual(self.client.get("/api/v1/system/cache-stats/").status_code, status.HTTP_403_FORBIDDEN)
+        get_user_model().objects.filter(pk=self.user.pk).update(is_staff=True)
+        get_user_cache().invalidate(self.user.pk)
+        resp = self.client.get("/api/v1/system/cache-stats/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn("auth_user", resp.json())
@@ -0,0 +1,76 @@
+"""
+Unit tests
+"""
+
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from tests.auth_client import AuthClientMixin
+
+
+class UserSearchTests(AuthClientMixin, APITestCase):
+    """
+    Indexed search of /api/v1/users/ (FTS5 trigram table on SQLite, pg_trgm on PostgreSQL)
+    """
+    def setUp(self) -> None:
+        """
+        Setup method
+        """
+        user_model = get_user_model()
+        self.user = self.create_user("searcher")
+        user_model.objects.create_user(username="aaron", email="aaron@example.com",
+                                       first_name="Aaron", last_name="Littlejohnnyson")
+        user_model.objects.create_user(username="jdoe", email="john.doe@example.com",
+                                       first_name="John", last_name="Doe")
+        user_model.objects.create_user(username="johnny", email="johnny@example.org",
+                                       first_name="Johnathan", last_name="Smith")
+        user_model.objects.create_user(username="mary", email="mary@example.org",
+                                       first_name="Mary", last_name="Johnson")
+        self.client = self.client_for(self.user)
+
+    def _usernames(self, query: str) -> list[str]:
+        body = self.client.get(f"/api/v1/users/?page_size=50&{query}").json()
+        return [row["username"] for row in body["results"]]
+
+    def test_matches_like_icontains(self) -> None:
+        """
+        Substring, case-insensitive, across all search columns
+        """
+        self.assertEqual(sorted(self._usernames("search=JOHN")), ["aaron", "jdoe", "johnny", "mary"])
+        self.assertEqual(self._usernames("search=example.org&ordering=username"), ["johnny", "mary"])
+
+    def test_every_term_must_match(self) -> None:
+        """
+        Multiple terms are ANDed, each may match any column
+        """
+        self.assertEqual(self._usernames("search=john smith"), ["johnny"])
+
+    @skipUnless(connection.vendor == "sqlite", "the FTS5 search table exists on SQLite only")
+    def test_uses_fts_table_and_follows_updates(self) -> None:
+        """
+        The FTS5 table is queried and kept in sync by triggers
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            self._usernames("search=johnson")
+        self.assertTrue(any("profiles_user_search" in q["sql"] for q in ctx.captured_queries))
+
+        get_user_model().objects.filter(username="mary").update(last_name="Brown")
+        self.assertEqual(self._usernames("search=johnson"), [])
+        self.assertEqual(self._usernames("search=brown"), ["mary"])
+
+    def test_short_terms_fall_back_to_icontains(self) -> None:
+        """
+        Terms below trigram length still work
+        """
+        self.assertEqual(sorted(self._usernames("search=jo")), ["aaron", "jdoe", "johnny", "mary"])
+
+    def test_relevance_ordering_without_explicit_ordering(self) -> None:
+        """
+        Without ?ordering= the best match comes first
+        """
+        self.assertEqual(self._usernames("search=johnny"), ["johnny", "aaron"])
+        self.assertEqual(self._usernames("search=johnny&ordering=id"), ["aaron", "johnny"])
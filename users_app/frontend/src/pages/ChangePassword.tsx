@@ -31,7 +31,9 @@ export default function ChangePassword() {
 
     try {
       setSaving(true);
-      await api.post(`/users/${id}/set-password/`, { password, "confirm_password": confirmPassword });
+      const { data } = await api.post(`/users/${id}/set-password/`, { password, "confirm_password": confirmPassword });
+      // Changing your own password ends all sessions; the response carries a new one
+      if (data?.access) useAuthStore.getState().applyRefreshedTokens(data.access, data.refresh);
       navigate("/users", { replace: true });
     } catch (err) {
       const parsed = extractApiError(err as unknown);
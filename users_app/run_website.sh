@@ -90,12 +90,19 @@ case "$clear_cache" in
     docker compose build frontend
 esac
 
+# A new deployment id per start: tokens of the previous run are invalidated, as on a restart
+export DEPLOYMENT_ID="${DEPLOYMENT_ID:-$(date +%s)}"
+echo "Deployment id: $DEPLOYMENT_ID"
+
 echo "Making migrations (one-off container)..."
 docker compose run --rm backend python manage.py makemigrations profiles
 
 echo "Applying migrations..."
 docker compose run --rm backend python manage.py migrate --noinput
 
+echo "Creating the cache table (used when CACHE_BACKEND=db)..."
+docker compose run --rm backend python manage.py createcachetable
+
 echo "Ensuring superuser exists…"
 docker compose run --rm \
   -e DJANGO_SUPERUSER_USERNAME="$SUPERUSER_USERNAME" \